@@ -0,0 +1,63 @@
+"""Benchmarks the memory retained per task by the different task representations.
+
+Usage:
+    python benchmarks/memory_benchmark.py [number_of_tasks]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+
+from payloads import generate_raw_tasks
+
+from tickthon import Task, TaskTable, dict_to_task
+from tickthon._task_utils import get_focus_time, get_task_date
+
+
+def uninterned_dict_to_task(raw_task: dict) -> Task:
+    """Reference implementation that keeps the decoded strings and tags of every raw task."""
+    return Task(ticktick_id=raw_task["id"],
+                ticktick_etag=raw_task["etag"],
+                created_date=get_task_date(raw_task.get("timeZone", ""), raw_task.get("createdTime")),
+                status=raw_task["status"],
+                title=raw_task["title"].strip(),
+                focus_time=get_focus_time(raw_task),
+                deleted=raw_task.get("deleted", 0),
+                tags=tuple(raw_task.get("tags", ())),
+                project_id=raw_task["projectId"],
+                timezone=raw_task["timeZone"],
+                due_date=get_task_date(raw_task["timeZone"], raw_task.get("startDate")),
+                column_id=raw_task.get("columnId", ""),
+                parent_id=raw_task.get("parentId", ""))
+
+
+def retained_bytes(payload: str, build) -> int:
+    """Returns the bytes still allocated after building the tasks of a payload and discarding the raw tasks."""
+    gc.collect()
+    tracemalloc.start()
+    raw_tasks = json.loads(payload)
+    tasks = build(raw_tasks)
+    del raw_tasks
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return current
+
+
+def main(number_of_tasks: int):
+    payload = json.dumps(generate_raw_tasks(number_of_tasks))
+
+    representations = {
+        "Task list (before)": lambda raw_tasks: [uninterned_dict_to_task(raw_task) for raw_task in raw_tasks],
+        "Task list (interned)": lambda raw_tasks: [dict_to_task(raw_task) for raw_task in raw_tasks],
+        "TaskTable": lambda raw_tasks: TaskTable(dict_to_task(raw_task) for raw_task in raw_tasks),
+    }
+
+    print(f"Tasks: {number_of_tasks}")
+    for name, build in representations.items():
+        print(f"{name}: {retained_bytes(payload, build) / number_of_tasks:.0f} bytes/task")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
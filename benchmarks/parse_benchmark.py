@@ -0,0 +1,48 @@
+"""Benchmarks the parsing of raw Ticktick tasks into Task objects.
+
+Usage:
+    python benchmarks/parse_benchmark.py [number_of_tasks]
+"""
+import sys
+import timeit
+
+from dateutil import parser, tz
+from payloads import generate_raw_tasks
+from suite import measure_peak_memory
+
+from tickthon import dict_to_task
+from tickthon._task_utils import get_task_date, parse_ticktick_tasks
+from tickthon.lazy_task import parse_lazy_ticktick_tasks
+
+
+def dateutil_get_task_date(raw_task_timezone: str, task_date: str | None) -> str:
+    """Reference implementation that parses every date with dateutil."""
+    if not task_date:
+        return ""
+    return parser.parse(task_date).astimezone(tz.gettz(raw_task_timezone)).isoformat()
+
+
+def main(number_of_tasks: int):
+    raw_tasks = generate_raw_tasks(number_of_tasks)
+    dates = [(raw_task["timeZone"], raw_task["startDate"]) for raw_task in raw_tasks]
+
+    dateutil_time = min(timeit.repeat(lambda: [dateutil_get_task_date(*date) for date in dates], number=1, repeat=3))
+    fast_path_time = min(timeit.repeat(lambda: [get_task_date(*date) for date in dates], number=1, repeat=3))
+    dict_to_task_time = min(timeit.repeat(lambda: [dict_to_task(raw_task) for raw_task in raw_tasks],
+                                          number=1, repeat=3))
+
+    print(f"Dates parsed: {number_of_tasks}")
+    print(f"dateutil: {dateutil_time:.3f}s")
+    print(f"fast path: {fast_path_time:.3f}s ({dateutil_time / fast_path_time:.1f}x)")
+    print(f"dict_to_task: {dict_to_task_time:.3f}s ({number_of_tasks / dict_to_task_time:,.0f} tasks/s)")
+
+    eager_time = min(timeit.repeat(lambda: parse_ticktick_tasks(raw_tasks), number=1, repeat=3))
+    lazy_time = min(timeit.repeat(lambda: parse_lazy_ticktick_tasks(raw_tasks), number=1, repeat=3))
+    eager_memory = measure_peak_memory(parse_ticktick_tasks, lambda: raw_tasks)
+    lazy_memory = measure_peak_memory(parse_lazy_ticktick_tasks, lambda: raw_tasks)
+    print(f"eager parse: {eager_time:.3f}s, peak {eager_memory / 2 ** 20:.1f} MiB")
+    print(f"lazy parse: {lazy_time:.3f}s, peak {lazy_memory / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,88 @@
+"""Synthetic Ticktick payloads for the benchmarks, modelled on tests/data/dict_task.json."""
+import json
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from tickthon import TicktickListIds
+
+DICT_TASK_PATH = Path(__file__).parents[1] / "tests" / "data" / "dict_task.json"
+TIMEZONES = ("America/Bogota", "Europe/Madrid", "Asia/Tokyo", "UTC")
+TAGS = (("work",), ("home", "errand"), ("work", "deep"), (), ("health",))
+TICKTICK_LIST_IDS = TicktickListIds(INBOX="inbox114478622",
+                                    TODAY_BACKLOG="6616e1af8f08b66b69c7a5c5",
+                                    WEEK_BACKLOG="61c62f198f08c92d0584f678",
+                                    MONTH_BACKLOG="61c634f58f08c92d058540ba",
+                                    WEIGHT_MEASUREMENTS="640c03cd8f08d5a6c4bb32e7")
+OTHER_PROJECT_IDS = ("5f30772022d478db3ad1a9c2", "5f30772022d478db3ad1a9c3")
+TICKTICK_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.000+0000"
+
+
+def generate_raw_tasks(number_of_tasks: int, project_ids: tuple[str, ...] | None = None,
+                       status: int = 0) -> list[dict]:
+    """Generates raw tasks with different ids, dates, timezones, tags and parents based on the test task.
+
+    Args:
+        number_of_tasks: Number of tasks to generate.
+        project_ids: Projects the tasks are spread over. If it is None, all the tasks keep the project of the test task.
+        status: Ticktick status of the tasks.
+
+    Returns:
+        The raw tasks.
+    """
+    base_task = json.loads(DICT_TASK_PATH.read_text())
+    base_date = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+    raw_tasks = []
+    for task_number in range(number_of_tasks):
+        task_date = (base_date + timedelta(minutes=17 * task_number)).strftime(TICKTICK_DATE_FORMAT)
+        raw_task = {**base_task,
+                    "id": f"{task_number:024x}",
+                    "title": f"{base_task['title']} {task_number}",
+                    "status": status,
+                    "tags": list(TAGS[task_number % len(TAGS)]),
+                    "timeZone": TIMEZONES[task_number % len(TIMEZONES)],
+                    "parentId": f"{task_number - task_number % 10:024x}" if task_number % 10 else "",
+                    "startDate": task_date,
+                    "createdTime": task_date}
+        if project_ids:
+            raw_task["projectId"] = project_ids[task_number % len(project_ids)]
+        raw_tasks.append(raw_task)
+    return raw_tasks
+
+
+def generate_sync_state(number_of_tasks: int, checkpoint: int = 1) -> dict:
+    """Generates a /batch/check/0 response with active tasks spread over the backlogs and other projects."""
+    project_ids = tuple(TICKTICK_LIST_IDS.get_ids()) + OTHER_PROJECT_IDS
+    return {"checkPoint": checkpoint,
+            "syncTaskBean": {"update": generate_raw_tasks(number_of_tasks, project_ids), "delete": [], "add": [],
+                             "empty": False},
+            "projectProfiles": [{"id": project_id, "name": f"Project {project_id[-4:]}"} for project_id in project_ids],
+            "projectGroups": [],
+            "tags": [{"name": tag} for tag in sorted({tag for tags in TAGS for tag in tags})]}
+
+
+def generate_closed_tasks(number_of_tasks: int, closed_at: datetime) -> list[dict]:
+    """Generates completed tasks closed one minute apart before a date, most recently closed first."""
+    raw_tasks = generate_raw_tasks(number_of_tasks, tuple(TICKTICK_LIST_IDS.get_ids()), status=2)
+    for task_number, raw_task in enumerate(raw_tasks):
+        raw_task["completedTime"] = (closed_at - timedelta(minutes=task_number)).strftime(TICKTICK_DATE_FORMAT)
+    return raw_tasks
+
+
+def generate_deleted_tasks(number_of_tasks: int) -> list[dict]:
+    """Generates deleted tasks."""
+    raw_tasks = generate_raw_tasks(number_of_tasks, tuple(TICKTICK_LIST_IDS.get_ids()))
+    for raw_task in raw_tasks:
+        raw_task["deleted"] = 1
+    return raw_tasks
+
+
+def generate_focus_heatmap(first_day: date, number_of_days: int) -> list[dict]:
+    """Generates a focus heatmap with one entry per day."""
+    return [{"day": (first_day + timedelta(days=day_number)).strftime("%Y%m%d"), "duration": 30 + day_number % 240}
+            for day_number in range(number_of_days)]
+
+
+def generate_focus_distribution(day_number: int) -> dict:
+    """Generates the focus distribution of a day."""
+    return {"tagDurations": {"work": 60 + day_number % 120, "deep": day_number % 90, "health": 15}}
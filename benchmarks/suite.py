@@ -0,0 +1,243 @@
+"""Benchmarks the sync, parse, filter, history, batch write and focus time throughput of the client offline.
+
+The synthetic payloads of benchmarks/payloads.py are served by the stub Ticktick server of the tests, so the results
+do not depend on the network or on a Ticktick account. The results are written to a JSON file to track regressions.
+
+Usage:
+    python benchmarks/suite.py [--sizes 1000 10000 100000] [--repeat 3] [--output benchmark_results.json]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qs, urlparse
+
+from payloads import (TICKTICK_LIST_IDS, generate_closed_tasks, generate_deleted_tasks, generate_focus_distribution,
+                      generate_focus_heatmap, generate_raw_tasks, generate_sync_state)
+
+from tickthon import TicktickClient
+from tickthon._task_utils import parse_ticktick_tasks
+from tickthon._ticktick_api import TicktickAPI
+from tickthon.lazy_task import parse_lazy_ticktick_tasks
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "tests"))
+from stub_server import TICKTICK_HOST, StubTicktickServer  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+CLOSED_AT = datetime(2024, 6, 1, tzinfo=timezone.utc)
+FOCUS_DAYS = 365
+BATCH_SIZE = 500
+
+
+def measure(function: Callable, repeat: int, setup: Callable | None = None) -> float:
+    """Returns the best time in seconds of a function, the setup result is its argument and is not timed."""
+    best_time = float("inf")
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        started_at = time.perf_counter()
+        function(argument)
+        best_time = min(best_time, time.perf_counter() - started_at)
+    return best_time
+
+
+def measure_peak_memory(function: Callable, setup: Callable | None = None) -> int:
+    """Returns the peak memory in bytes allocated by a function, the setup is not traced."""
+    argument = setup() if setup is not None else None
+    tracemalloc.start()
+    function(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def point_clients_to(stub_server: StubTicktickServer):
+    """Replaces the Ticktick host of the client URLs with the stub server."""
+    for client_class in (TicktickAPI, TicktickClient):
+        for attribute, value in list(vars(client_class).items()):
+            if attribute.endswith("_URL") and isinstance(value, str):
+                setattr(client_class, attribute, value.replace(TICKTICK_HOST, stub_server.url))
+
+
+def route_closed_tasks(stub_server: StubTicktickServer, closed_tasks: list[dict]):
+    """Serves the closed tasks like Ticktick, most recently closed first and filtered by the query window."""
+    ascending_closed_times = [raw_task["completedTime"][:19] for raw_task in reversed(closed_tasks)]
+
+    def closed_tasks_page(request: dict) -> bytes:
+        query = parse_qs(urlparse(request["path"]).query)
+        from_time, to_time = (query[key][0].replace(" ", "T") for key in ("from", "to"))
+        first_task = len(closed_tasks) - bisect_right(ascending_closed_times, to_time)
+        last_task = len(closed_tasks) - bisect_left(ascending_closed_times, from_time)
+        limit = int(query["limit"][0])
+        return json.dumps(closed_tasks[first_task:min(last_task, first_task + limit)]).encode()
+
+    stub_server.route("GET", "/api/v2/project/all/closed", closed_tasks_page)
+
+
+def route_deleted_tasks(stub_server: StubTicktickServer, deleted_tasks: list[dict]):
+    def trash_page(request: dict) -> bytes:
+        query = parse_qs(urlparse(request["path"]).query)
+        start, limit = int(query["start"][0]), int(query["limit"][0])
+        return json.dumps({"tasks": deleted_tasks[start:start + limit], "next": start + limit}).encode()
+
+    stub_server.route("GET", "/api/v2/project/all/trash/pagination", trash_page)
+
+
+def route_batch_writes(stub_server: StubTicktickServer):
+    def batch_task(request: dict) -> dict:
+        updated_ids = [item["id"] for item in request["json"]["update"]]
+        return {"id2etag": {task_id: "etag" for task_id in updated_ids}, "id2error": {}}
+
+    stub_server.route("POST", "/api/v2/batch/task", batch_task)
+
+
+def new_client(lazy_parsing: bool = False) -> TicktickClient:
+    return TicktickClient("user", "password", TICKTICK_LIST_IDS, api_token="token", cookies={"t": "cookie"},
+                          lazy_parsing=lazy_parsing, defer_initial_sync=True)
+
+
+def synced_client(lazy_parsing: bool = False) -> TicktickClient:
+    client = new_client(lazy_parsing)
+    client._get_all_tasks()
+    return client
+
+
+def result(benchmark: str, number_of_tasks: int, seconds: float, **extra) -> dict:
+    return {"benchmark": benchmark, "tasks": number_of_tasks, "seconds": round(seconds, 6),
+            "tasks_per_second": round(number_of_tasks / seconds) if seconds else None, **extra}
+
+
+def benchmark_sync(stub_server: StubTicktickServer, number_of_tasks: int, repeat: int) -> list[dict]:
+    sync_state = generate_sync_state(number_of_tasks, checkpoint=1)
+    stub_server.route("GET", "/api/v2/batch/check/0", json.dumps(sync_state).encode())
+    changed_tasks = generate_raw_tasks(max(1, number_of_tasks // 100), tuple(TICKTICK_LIST_IDS.get_ids()))
+    stub_server.route("GET", "/api/v2/batch/check/1",
+                      json.dumps({"checkPoint": 2, "syncTaskBean": {"update": changed_tasks, "delete": []}}).encode())
+
+    def sync(client: TicktickClient):
+        client._get_all_tasks()
+
+    results = []
+    for lazy_parsing in (False, True):
+        def setup() -> TicktickClient:
+            return new_client(lazy_parsing)
+
+        results.append(result("full_sync", number_of_tasks, measure(sync, repeat, setup),
+                              mode="lazy" if lazy_parsing else "eager",
+                              peak_memory_bytes=measure_peak_memory(sync, setup)))
+
+    def incremental_setup() -> TicktickClient:
+        client = synced_client()
+        client.incremental_sync = True
+        return client
+
+    results.append(result("incremental_sync", number_of_tasks, measure(sync, repeat, incremental_setup),
+                          changed_tasks=len(changed_tasks)))
+
+    raw_tasks = sync_state["syncTaskBean"]["update"]
+    valid_ids = TICKTICK_LIST_IDS.get_ids()
+    results.append(result("parse", number_of_tasks,
+                          measure(lambda _: parse_ticktick_tasks(raw_tasks, valid_ids), repeat), mode="eager",
+                          peak_memory_bytes=measure_peak_memory(lambda _: parse_ticktick_tasks(raw_tasks, valid_ids))))
+    results.append(result("parse", number_of_tasks,
+                          measure(lambda _: parse_lazy_ticktick_tasks(raw_tasks, valid_ids), repeat), mode="lazy",
+                          peak_memory_bytes=measure_peak_memory(
+                              lambda _: parse_lazy_ticktick_tasks(raw_tasks, valid_ids))))
+
+    client = synced_client()
+    results.append(result("filter_active_tasks", number_of_tasks,
+                          measure(lambda _: client._rebuild_active_tasks(), repeat)))
+    # The getters sync before reading, the selections are measured on the synced store so no request is timed
+    by_list_query = client.query().in_lists(TICKTICK_LIST_IDS.TODAY_BACKLOG, TICKTICK_LIST_IDS.WEEK_BACKLOG)
+    results.append(result("filter_by_list", number_of_tasks,
+                          measure(lambda _: by_list_query.select_active_tasks(client._task_store), repeat)))
+    by_tag_query = client.query().with_tags("work")
+    results.append(result("filter_by_tag", number_of_tasks,
+                          measure(lambda _: by_tag_query.select_active_tasks(client._task_store), repeat)))
+
+    batched_tasks = client.active_tasks
+    route_batch_writes(stub_server)
+
+    def batch_write(_):
+        with client.batch(max_size=BATCH_SIZE) as batch:
+            for task in batched_tasks:
+                batch.complete_task(task)
+
+    results.append(result("batch_write", len(batched_tasks), measure(batch_write, repeat), batch_size=BATCH_SIZE))
+    return results
+
+
+def benchmark_history(stub_server: StubTicktickServer, number_of_tasks: int, repeat: int) -> list[dict]:
+    route_closed_tasks(stub_server, generate_closed_tasks(number_of_tasks, CLOSED_AT))
+    route_deleted_tasks(stub_server, generate_deleted_tasks(number_of_tasks))
+    client = new_client()
+    from_date = CLOSED_AT - timedelta(minutes=number_of_tasks, days=1)
+    to_date = CLOSED_AT + timedelta(minutes=1)
+
+    def iter_completed_tasks(_):
+        assert sum(1 for _ in client.iter_completed_tasks(from_date, to_date)) == number_of_tasks
+
+    def iter_deleted_tasks(_):
+        assert sum(1 for _ in client.iter_deleted_tasks()) == number_of_tasks
+
+    return [result("iter_completed_tasks", number_of_tasks, measure(iter_completed_tasks, repeat),
+                   page_size=client.HISTORY_PAGE_SIZE),
+            result("iter_deleted_tasks", number_of_tasks, measure(iter_deleted_tasks, repeat),
+                   page_size=client.HISTORY_PAGE_SIZE)]
+
+
+def benchmark_focus_time(stub_server: StubTicktickServer, repeat: int) -> list[dict]:
+    first_day = date(2023, 1, 1)
+    last_day = first_day + timedelta(days=FOCUS_DAYS - 1)
+    stub_server.route("GET", f"/api/v2/pomodoros/statistics/heatmap/{first_day:%Y%m%d}/{last_day:%Y%m%d}",
+                      generate_focus_heatmap(first_day, FOCUS_DAYS))
+    for day_number in range(FOCUS_DAYS):
+        day = f"{first_day + timedelta(days=day_number):%Y%m%d}"
+        stub_server.route("GET", f"/api/v2/pomodoros/statistics/dist/{day}/{day}",
+                          generate_focus_distribution(day_number))
+    client = new_client()
+
+    overall_time = measure(lambda _: client.get_overall_focus_time_range(str(first_day), str(last_day)), repeat)
+    active_time = measure(lambda _: client.get_active_focus_time_range(str(first_day), str(last_day), ["work"]),
+                          repeat)
+    return [{"benchmark": "overall_focus_time_range", "days": FOCUS_DAYS, "seconds": round(overall_time, 6)},
+            {"benchmark": "active_focus_time_range", "days": FOCUS_DAYS, "seconds": round(active_time, 6)}]
+
+
+def main(sizes: list[int], repeat: int, output: Path):
+    results = []
+    with StubTicktickServer() as stub_server:
+        point_clients_to(stub_server)
+
+        for number_of_tasks in sizes:
+            for size_result in (benchmark_sync(stub_server, number_of_tasks, repeat)
+                                + benchmark_history(stub_server, number_of_tasks, repeat)):
+                results.append(size_result)
+                print(json.dumps(size_result))
+
+        for focus_result in benchmark_focus_time(stub_server, repeat):
+            results.append(focus_result)
+            print(json.dumps(focus_result))
+
+    output.write_text(json.dumps({"python": platform.python_version(),
+                                  "platform": platform.platform(),
+                                  "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                                  "repeat": repeat,
+                                  "results": results}, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                                 help="Number of tasks of the payloads.")
+    argument_parser.add_argument("--repeat", type=int, default=3, help="Runs of each benchmark, the best is kept.")
+    argument_parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"),
+                                 help="Path of the JSON results file.")
+    arguments = argument_parser.parse_args()
+    main(arguments.sizes, arguments.repeat, arguments.output)
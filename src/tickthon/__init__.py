@@ -1,5 +1,26 @@
 from .task_model import Task as Task
+from .lazy_task import LazyTask as LazyTask
+from .task_table import TaskTable as TaskTable
 from .ticktick_client import TicktickClient as TicktickClient
+from .async_ticktick_client import AsyncTicktickClient as AsyncTicktickClient
 from ._task_utils import dict_to_task as dict_to_task
 from .data.ticktick_ids import TicktickListIds as TicktickListIds
 from .data.task_types import TaskType as TaskType
+from ._response_cache import ResponseCache as ResponseCache
+from ._request_scheduler import RequestScheduler as RequestScheduler
+from .metrics import MetricsSink as MetricsSink
+from .metrics import LoggingMetricsSink as LoggingMetricsSink
+from .metrics import PrometheusFileSink as PrometheusFileSink
+from .sync_diff import SyncDiff as SyncDiff
+from .task_snapshot import TaskSnapshot as TaskSnapshot
+from .task_query import TaskQuery as TaskQuery
+from .project_model import Project as Project
+from .project_model import ProjectGroup as ProjectGroup
+from .project_model import Tag as Tag
+from .project_registry import ProjectRegistry as ProjectRegistry
+from .habit_model import Habit as Habit
+from .habit_model import HabitCheckin as HabitCheckin
+from .habit_checkin_store import HabitCheckinStore as HabitCheckinStore
+from .focus_analytics import FocusSessions as FocusSessions
+from .weight_series import WeightMeasurement as WeightMeasurement
+from .weight_series import WeightSeries as WeightSeries
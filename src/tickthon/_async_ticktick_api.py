@@ -0,0 +1,77 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, TypeVar
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+
+from ._ticktick_api import TicktickAPI
+
+T = TypeVar("T")
+
+
+class AsyncTicktickAPI:
+    """Asyncio layer over the Ticktick API client.
+
+    Requests are sent from a pool of worker threads that share the connection pool of the TicktickAPI session, so
+    independent requests awaited together run concurrently instead of one after another.
+    """
+
+    def __init__(self, ticktick_api: TicktickAPI, max_connections: int = 10):
+        """Initializes the async layer.
+
+        Args:
+            ticktick_api: Ticktick API client whose session sends the requests.
+            max_connections: Maximum number of concurrent requests, it is also the size of the connection pool.
+        """
+        self.ticktick_api = ticktick_api
+        self.max_connections = max_connections
+
+        pooled_adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.ticktick_api.session.mount("https://", pooled_adapter)
+        self.ticktick_api.session.mount("http://", pooled_adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="tickthon")
+
+    async def run(self, function: Callable[..., T], *args, **kwargs) -> T:
+        """Runs a blocking function in the worker threads and waits for its result.
+
+        Args:
+            function: Function to run.
+            *args: Positional arguments of the function.
+            **kwargs: Keyword arguments of the function.
+
+        Returns:
+            The result of the function.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(function, *args, **kwargs))
+
+    async def post(self, url: str, data: dict | list | None = None) -> Response:
+        """Sends a POST request to the Ticktick API.
+
+        Args:
+            url: URL to send the request to
+            data: Data to send in the request. Defaults to None.
+
+        Returns:
+            Response from the Ticktick API
+        """
+        return await self.run(self.ticktick_api.post, url, data)
+
+    async def get(self, url: str, data: dict | list | None = None) -> Response:
+        """Sends a GET request to the Ticktick API.
+
+        Args:
+            url: URL to send the request to
+            data: Data to send in the request. Defaults to None.
+
+        Returns:
+            Response from the Ticktick API
+        """
+        return await self.run(self.ticktick_api.get, url, data)
+
+    def close(self):
+        """Waits for the pending requests and releases the worker threads and the connections."""
+        self._executor.shutdown(wait=True)
+        self.ticktick_api.session.close()
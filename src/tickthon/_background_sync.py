@@ -0,0 +1,62 @@
+import logging
+import threading
+import time
+from typing import Callable
+
+
+class BackgroundSync:
+    """Daemon thread that calls a sync function at a fixed interval until it is stopped.
+
+    Errors of a sync are logged and kept in `last_error`, the next sync is attempted after the interval.
+    """
+
+    def __init__(self, sync: Callable[[], object], interval: float):
+        """Initializes a stopped background sync.
+
+        Args:
+            sync: Function that syncs the client.
+            interval: Seconds between the end of a sync and the start of the next one.
+        """
+        self.sync = sync
+        self.interval = interval
+        self.last_error: Exception | None = None
+        self.last_success: float | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Starts the sync thread, the first sync runs immediately."""
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="tickthon-background-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        """Stops the sync thread, waiting for the sync in progress to finish.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread. If it is None, it waits until the thread ends.
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sync()
+            except Exception as error:
+                self.last_error = error
+                logging.exception("Background sync failed")
+            else:
+                self.last_error = None
+                self.last_success = time.monotonic()
+
+            self._stop_event.wait(self.interval)
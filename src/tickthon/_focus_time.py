@@ -0,0 +1,78 @@
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+from . import _json
+
+
+class FocusTimeCache:
+    """On-disk JSON cache of the raw focus time statistics of closed days.
+
+    Only days before yesterday are stored, their statistics can no longer change, so they never have to be requested
+    to Ticktick again.
+    """
+
+    def __init__(self, cache_path: str | Path):
+        """Loads the cache file, it is created on the first write if it does not exist.
+
+        Args:
+            cache_path: Path of the JSON cache file.
+        """
+        self.cache_path = Path(cache_path)
+        self._lock = threading.Lock()
+        self._statistics: dict[str, dict[str, object]] = {}
+        if self.cache_path.exists():
+            self._statistics = _json.loads(self.cache_path.read_bytes())
+
+    def get(self, statistic: str, day: str) -> object | None:
+        """Returns the cached statistic of a day, None if it is not cached."""
+        return self._statistics.get(statistic, {}).get(day)
+
+    def update(self, statistic: str, statistics_by_day: dict[str, object]):
+        """Stores the statistics of the closed days and writes the cache file if any of them was new.
+
+        Args:
+            statistic: Name of the statistic.
+            statistics_by_day: Statistic by day in format YYYY-MM-DD, days that are not closed are ignored.
+        """
+        last_closed_day = (date.today() - timedelta(days=2)).isoformat()
+        closed_days = {day: value for day, value in statistics_by_day.items() if day <= last_closed_day}
+
+        with self._lock:
+            cached_statistics = self._statistics.setdefault(statistic, {})
+            if closed_days.keys() <= cached_statistics.keys():
+                return
+
+            cached_statistics.update(closed_days)
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_path.write_bytes(_json.dumps(self._statistics))
+
+
+def iter_days(start_date: str, end_date: str) -> Iterator[str]:
+    """Iterates over the days between two dates in format YYYY-MM-DD, both included."""
+    day = datetime.strptime(start_date, "%Y-%m-%d").date()
+    last_day = datetime.strptime(end_date, "%Y-%m-%d").date()
+    while day <= last_day:
+        yield day.isoformat()
+        day += timedelta(days=1)
+
+
+def get_durations_by_day(raw_heatmap: list[dict], days: list[str]) -> dict[str, float]:
+    """Maps the entries of a focus heatmap to the days of the requested range.
+
+    Args:
+        raw_heatmap: Heatmap entries returned by Ticktick, one per day of the range.
+        days: Days of the requested range in format YYYY-MM-DD.
+
+    Returns:
+        Focus duration in minutes by day, days without an entry have no focus time.
+    """
+    durations = {day: 0.0 for day in days}
+    for day, raw_day in zip(days, raw_heatmap):
+        raw_day_date = raw_day.get("day")
+        if raw_day_date:
+            day = f"{raw_day_date[:4]}-{raw_day_date[4:6]}-{raw_day_date[6:8]}"
+        if day in durations:
+            durations[day] = float(raw_day.get("duration", 0))
+    return durations
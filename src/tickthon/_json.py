@@ -0,0 +1,57 @@
+"""JSON backend of tickthon, it uses the fastest available library among orjson, msgspec and the standard library.
+
+All the functions decode from and encode to bytes, so response bodies are decoded straight from the buffer that
+requests downloaded, without building an intermediate str of the whole body.
+"""
+import json
+from typing import Any, Callable
+
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _load_backend(backend: str) -> tuple[Callable[[bytes | str], Any], Callable[[Any], bytes]]:
+    """Returns the loads and dumps functions of a backend, raises ImportError if its library is not installed."""
+    if backend == "orjson":
+        import orjson  # type: ignore[import-not-found]
+        return orjson.loads, orjson.dumps
+
+    if backend == "msgspec":
+        import msgspec  # type: ignore[import-not-found]
+        return msgspec.json.decode, msgspec.json.encode
+
+    if backend == "json":
+        return json.loads, lambda obj: json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    raise ValueError(f"Unknown JSON backend {backend}, the available backends are {', '.join(JSON_BACKENDS)}")
+
+
+JSON_BACKEND = ""
+loads: Callable[[bytes | str], Any]
+"""Decodes a JSON document from bytes or str."""
+dumps: Callable[[Any], bytes]
+"""Encodes an object as a compact UTF-8 JSON document."""
+
+
+def set_backend(*backends: str) -> str:
+    """Selects the first installed JSON backend.
+
+    Args:
+        *backends: Backends in order of preference. If none is given, all the backends are tried from the fastest.
+
+    Returns:
+        The name of the selected backend.
+    """
+    global JSON_BACKEND, loads, dumps
+
+    for backend in backends or JSON_BACKENDS:
+        try:
+            loads, dumps = _load_backend(backend)
+        except ImportError:
+            continue
+        JSON_BACKEND = backend
+        return backend
+
+    raise ImportError(f"None of the JSON backends {', '.join(backends)} is installed")
+
+
+set_backend()
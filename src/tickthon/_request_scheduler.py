@@ -0,0 +1,206 @@
+import random
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable
+
+from attrs import define
+from requests import Response, exceptions
+from urllib3.exceptions import NewConnectionError
+
+from .metrics import REQUEST_QUEUE_WAIT_SECONDS, REQUEST_RETRIES, MetricsSink
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+@define
+class SchedulerMetrics:
+    """ Counters of the requests sent by a RequestScheduler.
+
+    Attributes:
+        requests: Number of requests sent, retries included.
+        retries: Number of retried requests.
+        queue_wait_time: Total seconds requests waited for a concurrency slot or a rate limit token.
+        max_queue_wait_time: Longest wait in seconds of a single request.
+    """
+    requests: int = 0
+    retries: int = 0
+    queue_wait_time: float = 0.0
+    max_queue_wait_time: float = 0.0
+
+
+class TokenBucket:
+    """Token bucket rate limiter, it allows bursts of `capacity` requests and `rate` requests per second on average."""
+
+    def __init__(self, rate: float, capacity: int | None = None):
+        """Initializes a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum number of tokens. If it is None, the capacity is the rate rounded up.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, int(rate + 0.999))
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Takes a token, waiting until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class RequestScheduler:
+    """Sends requests with a rate limit, a concurrency cap and retries with exponential backoff.
+
+    Requests that fail with 429 or fail to connect are retried, since the server did not process them. 5xx responses,
+    read timeouts and connections dropped after the request was sent are only retried for idempotent methods, so that
+    a write is not applied twice. The wait before a retry is the Retry-After of the response if it has one, otherwise
+    an exponential backoff with full jitter. A response whose Retry-After is longer than `max_retry_after` is returned
+    instead of retried, since the server is still throttling when a shorter wait ends.
+    """
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 30.0,
+                 rate_limit: float | None = None,
+                 burst: int | None = None,
+                 max_concurrency: int | None = None,
+                 max_retry_after: float = 60.0,
+                 metrics_sink: MetricsSink | None = None):
+        """Initializes the scheduler.
+
+        Args:
+            max_retries: Maximum number of retries of a request.
+            backoff_base: Seconds of the first backoff, each retry doubles it.
+            backoff_max: Maximum seconds of a backoff.
+            rate_limit: Maximum average requests per second. If it is None, requests are not rate limited.
+            burst: Maximum requests sent at once when there is no rate limit backlog. Defaults to the rate limit.
+            max_concurrency: Maximum requests in flight. If it is None, concurrency is not capped.
+            max_retry_after: Maximum seconds of a Retry-After the scheduler waits for before retrying.
+            metrics_sink: Sink of the retries and queue wait times, besides the counters of `metrics`. If it is None,
+                          the TicktickAPI that uses the scheduler sets its own sink.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self.metrics = SchedulerMetrics()
+        self.metrics_sink = metrics_sink
+        self._token_bucket = TokenBucket(rate_limit, burst) if rate_limit else None
+        self._concurrency_slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._metrics_lock = threading.Lock()
+
+    def send(self, method: str, send_request: Callable[[], Response]) -> Response:
+        """Sends a request, retrying it while it fails with a retryable error.
+
+        Args:
+            method: HTTP method of the request.
+            send_request: Function that sends the request and returns its response.
+
+        Returns:
+            The response of the last attempt, retryable errors of the last attempt are returned, not raised.
+        """
+        attempt = 0
+        while True:
+            try:
+                response = self._send_attempt(send_request)
+            except (exceptions.ConnectionError, exceptions.Timeout) as error:
+                if attempt >= self.max_retries or not self._is_retryable(method, error):
+                    raise
+                retry_delay = self._get_backoff(attempt)
+                retry_reason = type(error).__name__
+            else:
+                if attempt >= self.max_retries or not self._is_retryable(method, response):
+                    return response
+                retry_after = self._get_retry_after(response)
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    return response
+                retry_delay = retry_after or self._get_backoff(attempt)
+                retry_reason = str(response.status_code)
+
+            attempt += 1
+            self._record_retry(method, retry_reason)
+            time.sleep(retry_delay)
+
+    def _send_attempt(self, send_request: Callable[[], Response]) -> Response:
+        queued_at = time.monotonic()
+        with self._concurrency_slots if self._concurrency_slots is not None else nullcontext():
+            if self._token_bucket is not None:
+                self._token_bucket.acquire()
+            self._record_queue_wait(time.monotonic() - queued_at)
+            return send_request()
+
+    def _record_queue_wait(self, queue_wait_time: float):
+        with self._metrics_lock:
+            self.metrics.requests += 1
+            self.metrics.queue_wait_time += queue_wait_time
+            self.metrics.max_queue_wait_time = max(self.metrics.max_queue_wait_time, queue_wait_time)
+        if self.metrics_sink is not None:
+            self.metrics_sink.observe(REQUEST_QUEUE_WAIT_SECONDS, queue_wait_time)
+
+    def _record_retry(self, method: str, reason: str):
+        """Counts a retry, the reason is the status code or the exception name of the failed attempt."""
+        with self._metrics_lock:
+            self.metrics.retries += 1
+        if self.metrics_sink is not None:
+            self.metrics_sink.increment(REQUEST_RETRIES, labels={"method": method.upper(), "reason": reason})
+
+    @staticmethod
+    def _is_retryable(method: str, outcome: Response | exceptions.RequestException) -> bool:
+        """Checks if the response or error of an attempt can be retried without applying a write twice."""
+        if isinstance(outcome, Response):
+            if outcome.status_code == 429:
+                return True
+            is_server_error = outcome.status_code in RETRYABLE_STATUS_CODES
+            return is_server_error and method.upper() in IDEMPOTENT_METHODS
+
+        return _is_connect_error(outcome) or method.upper() in IDEMPOTENT_METHODS
+
+    def _get_backoff(self, attempt: int) -> float:
+        """Returns an exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def _get_retry_after(response: Response) -> float | None:
+        """Returns the seconds to wait from the Retry-After header of a response, None if it has no valid header."""
+        retry_after = response.headers.get("Retry-After")
+        if not retry_after:
+            return None
+
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+        try:
+            retry_date = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_date.tzinfo is None:
+            retry_date = retry_date.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+
+
+def _is_connect_error(error: exceptions.RequestException) -> bool:
+    """Checks if an error happened while connecting, before the request was sent."""
+    if isinstance(error, exceptions.ConnectTimeout):
+        return True
+
+    reason = error.args[0] if error.args else None
+    return isinstance(getattr(reason, "reason", reason), NewConnectionError)
@@ -0,0 +1,112 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from attrs import define
+from requests import Response
+
+
+@define
+class CachedValidators:
+    """ Validators of the last response of an URL.
+
+    Attributes:
+        etag: Value of the ETag header of the response, empty if it had none.
+        last_modified: Value of the Last-Modified header of the response, empty if it had none.
+        content_hash: SHA-1 hash of the response body.
+        stored_at: Monotonic time when the validators were stored.
+    """
+    etag: str
+    last_modified: str
+    content_hash: str
+    stored_at: float
+
+
+class ResponseCache:
+    """LRU cache of the validators of the responses of the Ticktick API, used to send conditional requests.
+
+    Only the validators are stored, not the bodies: a response is known to be unchanged when the server answers
+    304 Not Modified or when the hash of its body matches the stored one.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float | None = None):
+        """Initializes an empty cache.
+
+        Args:
+            max_entries: Maximum number of URLs in the cache, the least recently used URL is evicted when it is full.
+            ttl: Seconds an entry is valid, expired entries are ignored. If it is None, entries do not expire.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedValidators] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, url: str) -> CachedValidators | None:
+        """Returns the validators of an URL, None if the URL is not cached or its entry expired."""
+        with self._lock:
+            validators = self._entries.get(url)
+            if validators is None:
+                return None
+
+            if self.ttl is not None and time.monotonic() - validators.stored_at > self.ttl:
+                del self._entries[url]
+                return None
+
+            self._entries.move_to_end(url)
+            return validators
+
+    def get_conditional_headers(self, url: str) -> dict[str, str]:
+        """Returns the conditional request headers for the cached validators of an URL."""
+        validators = self.get(url)
+        if validators is None:
+            return {}
+
+        headers = {}
+        if validators.etag:
+            headers["If-None-Match"] = validators.etag
+        if validators.last_modified:
+            headers["If-Modified-Since"] = validators.last_modified
+        return headers
+
+    def is_unchanged(self, url: str, response: Response) -> bool:
+        """Checks if a response is unchanged since the last one of the URL and stores its validators.
+
+        Args:
+            url: Requested URL.
+            response: Response of a conditional request to the URL.
+
+        Returns:
+            True if the server answered 304 Not Modified or the body did not change, False otherwise.
+        """
+        if response.status_code == 304:
+            self._count(is_hit=True)
+            return True
+
+        content_hash = hashlib.sha1(response.content).hexdigest()
+        validators = self.get(url)
+        is_hit = validators is not None and validators.content_hash == content_hash
+        self._count(is_hit)
+
+        with self._lock:
+            self._entries[url] = CachedValidators(etag=response.headers.get("ETag", ""),
+                                                  last_modified=response.headers.get("Last-Modified", ""),
+                                                  content_hash=content_hash,
+                                                  stored_at=time.monotonic())
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return is_hit
+
+    def _count(self, is_hit: bool):
+        with self._lock:
+            if is_hit:
+                self.hits += 1
+            else:
+                self.misses += 1
@@ -0,0 +1,110 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Iterable
+
+from . import _json
+
+
+class SyncCache:
+    """SQLite snapshot of the last sync of the active tasks, the project registry and the habit check-ins.
+
+    A new client loads the snapshot to serve reads without downloading the whole account state, and then only requests
+    the changes after the saved checkpoint. Every sync only writes the raw tasks that changed in it.
+    """
+
+    def __init__(self, cache_path: str | Path):
+        """Opens the cache database, it is created if it does not exist.
+
+        Args:
+            cache_path: Path of the SQLite database file.
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            connection.execute("CREATE TABLE IF NOT EXISTS raw_tasks (id TEXT PRIMARY KEY, raw_task TEXT NOT NULL)")
+            connection.execute("CREATE TABLE IF NOT EXISTS habit_checkins "
+                               "(habit_id TEXT NOT NULL, stamp INTEGER NOT NULL, raw_checkin TEXT NOT NULL, "
+                               "PRIMARY KEY (habit_id, stamp))")
+            connection.execute("CREATE TABLE IF NOT EXISTS habit_after_stamps "
+                               "(habit_id TEXT PRIMARY KEY, after_stamp INTEGER NOT NULL)")
+
+    def _connect(self) -> closing[sqlite3.Connection]:
+        """Opens a connection, each operation uses its own connection so the cache can be used from any thread."""
+        return closing(sqlite3.connect(self.cache_path))
+
+    def load(self) -> tuple[int, list[dict]]:
+        """Loads the snapshot.
+
+        Returns:
+            A tuple with the checkpoint and the raw active tasks of the last sync, in the order they were first saved.
+            (0, []) if nothing was saved.
+        """
+        with self._connect() as connection:
+            checkpoint_row = connection.execute("SELECT value FROM sync_state WHERE key = 'checkpoint'").fetchone()
+            raw_task_rows = connection.execute("SELECT raw_task FROM raw_tasks ORDER BY rowid").fetchall()
+
+        if checkpoint_row is None:
+            return 0, []
+
+        return int(checkpoint_row[0]), [_json.loads(raw_task) for raw_task, in raw_task_rows]
+
+    def load_registry(self) -> dict[str, list[dict]]:
+        """Loads the projects, groups and tags of the last sync, in the format of the sync state. Empty if none."""
+        with self._connect() as connection:
+            registry_row = connection.execute("SELECT value FROM sync_state WHERE key = 'registry'").fetchone()
+
+        return _json.loads(registry_row[0]) if registry_row is not None else {}
+
+    def save_registry(self, raw_registry: dict[str, list[dict]]):
+        """Saves the projects, groups and tags of a sync that changed them."""
+        with self._connect() as connection, connection:
+            connection.execute("INSERT OR REPLACE INTO sync_state VALUES ('registry', ?)",
+                               (_json.dumps(raw_registry).decode(),))
+
+    def load_habit_checkins(self) -> tuple[dict[str, int], list[dict]]:
+        """Loads the synced habit check-ins.
+
+        Returns:
+            A tuple with the afterStamp of every synced habit and the raw check-ins, ({}, []) if nothing was saved.
+        """
+        with self._connect() as connection:
+            after_stamp_rows = connection.execute("SELECT habit_id, after_stamp FROM habit_after_stamps").fetchall()
+            checkin_rows = connection.execute("SELECT raw_checkin FROM habit_checkins").fetchall()
+
+        return dict(after_stamp_rows), [_json.loads(raw_checkin) for raw_checkin, in checkin_rows]
+
+    def save_habit_checkins(self, after_stamps: dict[str, int], raw_checkins: list[dict]):
+        """Saves the afterStamps of a habit check-ins sync and the check-ins that changed in it.
+
+        Args:
+            after_stamps: AfterStamp of the next sync of every synced habit.
+            raw_checkins: Raw check-ins that were new or changed.
+        """
+        rows = ((raw_checkin["habitId"], int(raw_checkin["checkinStamp"]), _json.dumps(raw_checkin).decode())
+                for raw_checkin in raw_checkins)
+        with self._connect() as connection, connection:
+            connection.executemany("INSERT OR REPLACE INTO habit_checkins VALUES (?, ?, ?)", rows)
+            connection.executemany("INSERT OR REPLACE INTO habit_after_stamps VALUES (?, ?)", after_stamps.items())
+
+    def save_checkpoint(self, checkpoint: int):
+        """Saves the checkpoint of a sync that did not change the active tasks."""
+        with self._connect() as connection, connection:
+            connection.execute("INSERT OR REPLACE INTO sync_state VALUES ('checkpoint', ?)", (str(checkpoint),))
+
+    def save(self, checkpoint: int, changed_raw_tasks: list[dict], removed_task_ids: Iterable[str] = ()):
+        """Saves the changes of the active tasks of a sync.
+
+        Args:
+            checkpoint: Checkpoint of the sync.
+            changed_raw_tasks: Raw active tasks that were added or changed in the sync.
+            removed_task_ids: Ids of the tasks that are no longer active after the sync.
+        """
+        rows = ((raw_task["id"], _json.dumps(raw_task).decode()) for raw_task in changed_raw_tasks)
+        with self._connect() as connection, connection:
+            connection.executemany("DELETE FROM raw_tasks WHERE id = ?", ((task_id,) for task_id in removed_task_ids))
+            connection.executemany("INSERT INTO raw_tasks VALUES (?, ?) "
+                                   "ON CONFLICT (id) DO UPDATE SET raw_task = excluded.raw_task", rows)
+            connection.execute("INSERT OR REPLACE INTO sync_state VALUES ('checkpoint', ?)", (str(checkpoint),))
@@ -0,0 +1,138 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+from urllib.parse import quote, urlencode
+
+from ._ticktick_api import TicktickAPI
+from ._task_utils import _parse_date
+from .data.ticktick_task_parameters import TicktickTaskParameters as ttp
+
+TICKTICK_QUERY_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def iter_closed_raw_tasks(ticktick_api: TicktickAPI,
+                          closed_tasks_url: str,
+                          status: str,
+                          from_date: datetime,
+                          to_date: datetime,
+                          page_size: int) -> Iterator[list[dict]]:
+    """Iterates over the pages of closed (completed or abandoned) raw tasks between two dates.
+
+    The closed tasks endpoint returns the most recently closed tasks first, so after each full page the end of the
+    window is moved to the closed time of the oldest task of the page. Tasks closed in that same second are requested
+    again, they are skipped when they were already returned.
+
+    When a whole page was closed in the same second, like after a batch completion, the window can not be narrowed
+    past that second. The second is then requested alone with a doubled limit until all its tasks are returned, and
+    the window continues from the second before it. If the endpoint does not return all the tasks of that second, a
+    warning with the second and the number of returned tasks is logged.
+
+    Args:
+        ticktick_api: Ticktick API client.
+        closed_tasks_url: URL of the closed tasks endpoint.
+        status: Status of the closed tasks, "Completed" or "Abandoned".
+        from_date: Start of the window, naive dates are considered UTC.
+        to_date: End of the window, naive dates are considered UTC.
+        page_size: Maximum number of tasks per request.
+
+    Yields:
+        Pages of raw tasks, a page can be empty when all its tasks were already returned.
+    """
+    window_start = _to_utc(from_date).replace(microsecond=0)
+    window_end = _to_utc(to_date)
+    boundary_task_ids: set[str] = set()
+
+    while True:
+        raw_tasks = _get_closed_raw_tasks(ticktick_api, closed_tasks_url, status, window_start, window_end, page_size)
+        yield [raw_task for raw_task in raw_tasks if raw_task[ttp.ID.value] not in boundary_task_ids]
+
+        if len(raw_tasks) < page_size:
+            return
+
+        oldest_closed_time = min(_get_closed_time(raw_task) for raw_task in raw_tasks)
+        if oldest_closed_time != window_end:
+            boundary_task_ids = set()
+        boundary_task_ids.update(raw_task[ttp.ID.value] for raw_task in raw_tasks
+                                 if _get_closed_time(raw_task) == oldest_closed_time)
+
+        if oldest_closed_time == window_end:
+            yield from _iter_closed_second(ticktick_api, closed_tasks_url, status, window_start, window_end,
+                                           page_size, boundary_task_ids)
+            boundary_task_ids = set()
+            oldest_closed_time = window_end - timedelta(seconds=1)
+            if oldest_closed_time < window_start:
+                return
+        window_end = oldest_closed_time
+
+
+def _iter_closed_second(ticktick_api: TicktickAPI, closed_tasks_url: str, status: str, window_start: datetime,
+                        second: datetime, page_size: int, returned_task_ids: set[str]) -> Iterator[list[dict]]:
+    """Iterates over the pages of the tasks closed in one second that were not returned yet.
+
+    The second is requested with a doubled limit until a response is not full. A response that is not full can also
+    mean that the endpoint caps the tasks per request, so the window up to that second is requested with the same
+    limit: if it does not return more tasks either, the tasks of the second were truncated and a warning is logged.
+    """
+    limit = page_size
+    while True:
+        limit *= 2
+        raw_tasks = _get_closed_raw_tasks(ticktick_api, closed_tasks_url, status, second, second, limit)
+        new_raw_tasks = [raw_task for raw_task in raw_tasks if raw_task[ttp.ID.value] not in returned_task_ids]
+        yield new_raw_tasks
+
+        returned_task_ids.update(raw_task[ttp.ID.value] for raw_task in new_raw_tasks)
+        if len(raw_tasks) == limit and new_raw_tasks:
+            continue
+
+        window_raw_tasks = _get_closed_raw_tasks(ticktick_api, closed_tasks_url, status, window_start, second, limit)
+        if len(raw_tasks) < limit and len(window_raw_tasks) > len(raw_tasks):
+            return
+
+        logging.warning(f"Only {len(returned_task_ids)} tasks closed at {second} with status {status} were returned, "
+                        f"the closed tasks endpoint does not return more tasks per request")
+        return
+
+
+def _get_closed_raw_tasks(ticktick_api: TicktickAPI, closed_tasks_url: str, status: str, from_date: datetime,
+                          to_date: datetime, limit: int) -> list[dict]:
+    query = {"from": _format_query_date(from_date), "to": _format_query_date(to_date), "status": status,
+             "limit": limit}
+    return ticktick_api.get_json(f"{closed_tasks_url}?{urlencode(query, quote_via=quote)}")
+
+
+def iter_trash_raw_tasks(ticktick_api: TicktickAPI, trash_tasks_url: str, page_size: int) -> Iterator[list[dict]]:
+    """Iterates over the pages of deleted raw tasks.
+
+    Args:
+        ticktick_api: Ticktick API client.
+        trash_tasks_url: URL of the paginated trash endpoint.
+        page_size: Maximum number of tasks per request.
+
+    Yields:
+        Pages of raw tasks.
+    """
+    start = 0
+    while True:
+        response = ticktick_api.get_json(f"{trash_tasks_url}?start={start}&limit={page_size}")
+        raw_tasks = response.get("tasks", [])
+        yield raw_tasks
+
+        if len(raw_tasks) < page_size:
+            return
+        start = response.get("next") or start + len(raw_tasks)
+
+
+def _get_closed_time(raw_task: dict) -> datetime:
+    """Returns the time a raw task was closed in UTC, truncated to seconds as the closed endpoint filters by it."""
+    closed_time = raw_task.get(ttp.COMPLETED_TIME.value) or raw_task[ttp.MODIFIED_TIME.value]
+    return _to_utc(_parse_date(closed_time)).replace(microsecond=0)
+
+
+def _to_utc(date: datetime) -> datetime:
+    if date.tzinfo is None:
+        return date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc)
+
+
+def _format_query_date(date: datetime) -> str:
+    return _to_utc(date).strftime(TICKTICK_QUERY_DATE_FORMAT)
@@ -0,0 +1,326 @@
+from bisect import bisect_left, bisect_right, insort
+from types import MappingProxyType
+from typing import Iterator, Mapping
+
+from .data.ticktick_sync_parameters import TicktickSyncParameters as tsp
+from .lazy_task import AnyTask, LazyTask
+from .sync_diff import SyncDiff
+from ._task_utils import DELETED_KEY, ETAG_KEY, ID_KEY, PROJECT_ID_KEY, STATUS_KEY, dict_to_task
+
+
+class TaskStore:
+    """In-memory store of the active Ticktick tasks, keyed by task id.
+
+    The store keeps the raw task of every active task, so it can be sent back to Ticktick, and the parsed Task of
+    the tasks that belong to the valid lists. Parsed tasks are indexed by project id, tag, parent id and due date, the
+    indexes are updated in place when tasks are added, updated or removed. The parent index is the subtask hierarchy,
+    subtrees and ancestor chains are walked through it without scanning the store.
+
+    The due date index is built on the first due date query, so tasks whose due date is never queried are not
+    decoded when the store parses lazily.
+
+    Syncs return a SyncDiff of the parsed tasks, tasks whose raw task did not change are not parsed again. The
+    revision counter increases whenever a raw task changes, and the ids of the changed raw tasks are kept until they
+    are popped with `pop_raw_changes`, so the raw changes can be persisted without rewriting every task.
+    """
+
+    def __init__(self, lazy_parsing: bool = False):
+        """Initializes an empty store.
+
+        Args:
+            lazy_parsing: If True, raw tasks are wrapped into LazyTask views instead of being parsed into Task objects.
+        """
+        self.lazy_parsing = lazy_parsing
+        self.revision = 0
+        self._changed_raw_ids: set[str] = set()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._raw_tasks: dict[str, dict] = {}
+        self._tasks: dict[str, AnyTask] = {}
+        self._tasks_by_project: dict[str, dict[str, AnyTask]] = {}
+        self._tasks_by_tag: dict[str, dict[str, AnyTask]] = {}
+        self._tasks_by_parent: dict[str, dict[str, AnyTask]] = {}
+        self._tasks_by_due_day: dict[str, dict[str, AnyTask]] | None = None
+        self._due_days: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._tasks
+
+    @property
+    def raw_tasks(self) -> list[dict]:
+        """Raw tasks in the store."""
+        return list(self._raw_tasks.values())
+
+    @property
+    def tasks(self) -> list[AnyTask]:
+        """Parsed tasks in the store."""
+        return list(self._tasks.values())
+
+    def pop_raw_changes(self) -> tuple[list[dict], list[str]]:
+        """Returns the raw tasks that changed since the last call and the ids of the ones that were removed."""
+        changed_raw_ids, self._changed_raw_ids = self._changed_raw_ids, set()
+        changed_raw_tasks = [self._raw_tasks[task_id] for task_id in changed_raw_ids if task_id in self._raw_tasks]
+        removed_task_ids = [task_id for task_id in changed_raw_ids if task_id not in self._raw_tasks]
+        return changed_raw_tasks, removed_task_ids
+
+    def get_raw_task(self, task_id: str) -> dict | None:
+        """Returns the raw task with the given id, None if the task is not in the store."""
+        return self._raw_tasks.get(task_id)
+
+    def get_task(self, task_id: str) -> AnyTask | None:
+        """Returns the parsed task with the given id, None if the task is not in the store."""
+        return self._tasks.get(task_id)
+
+    def get_tasks_by_projects(self, project_ids: list[str]) -> list[AnyTask]:
+        """Returns the parsed tasks that belong to any of the given projects (lists)."""
+        return [task for project_id in dict.fromkeys(project_ids)
+                for task in self._tasks_by_project.get(project_id, {}).values()]
+
+    def get_tasks_by_tag(self, tag: str) -> list[AnyTask]:
+        """Returns the parsed tasks that have the given tag."""
+        return list(self._tasks_by_tag.get(tag, {}).values())
+
+    def get_frozen_indexes(self) -> tuple[Mapping[str, tuple[AnyTask, ...]], Mapping[str, tuple[AnyTask, ...]]]:
+        """Returns read-only copies of the project and tag indexes, that do not change with the store."""
+        return (MappingProxyType({project_id: tuple(tasks.values())
+                                  for project_id, tasks in self._tasks_by_project.items()}),
+                MappingProxyType({tag: tuple(tasks.values()) for tag, tasks in self._tasks_by_tag.items()}))
+
+    def get_subtasks(self, parent_id: str) -> list[AnyTask]:
+        """Returns the parsed tasks whose parent is the given task."""
+        return list(self._tasks_by_parent.get(parent_id, {}).values())
+
+    def iter_subtree(self, task_id: str) -> Iterator[AnyTask]:
+        """Iterates over the descendants of a task depth first, every task is followed by its own subtasks."""
+        visited_ids = {task_id}
+        pending_tasks = list(reversed(self._tasks_by_parent.get(task_id, {}).values()))
+        while pending_tasks:
+            task = pending_tasks.pop()
+            if task.ticktick_id in visited_ids:
+                continue
+
+            visited_ids.add(task.ticktick_id)
+            yield task
+            pending_tasks.extend(reversed(self._tasks_by_parent.get(task.ticktick_id, {}).values()))
+
+    def get_ancestors(self, task_id: str) -> list[AnyTask]:
+        """Returns the parent of a task, the parent of its parent and so on, up to the first one not in the store."""
+        ancestors: list[AnyTask] = []
+        visited_ids = {task_id}
+        task = self._tasks.get(task_id)
+        while task is not None and task.parent_id and task.parent_id not in visited_ids:
+            visited_ids.add(task.parent_id)
+            task = self._tasks.get(task.parent_id)
+            if task is not None:
+                ancestors.append(task)
+        return ancestors
+
+    def get_tasks_due_between(self, start_date: str, end_date: str) -> list[AnyTask]:
+        """Returns the parsed tasks due between two dates, both included.
+
+        Args:
+            start_date: Start date in format YYYY-MM-DD.
+            end_date: End date in format YYYY-MM-DD.
+
+        Returns:
+            The tasks due in the range, sorted by due day.
+        """
+        tasks_by_due_day = self._get_due_date_index()
+        start = bisect_left(self._due_days, start_date)
+        end = bisect_right(self._due_days, end_date)
+        return [task for due_day in self._due_days[start:end] for task in tasks_by_due_day[due_day].values()]
+
+    def replace_all(self, raw_tasks: list[dict], valid_ticktick_lists_ids: list[str]) -> SyncDiff:
+        """Replaces the content of the store with a full sync of the active tasks.
+
+        The store keeps the order of the raw tasks, tasks whose raw task did not change keep their parsed task.
+
+        Args:
+            raw_tasks: All the raw active tasks from Ticktick.
+            valid_ticktick_lists_ids: Ticktick lists ids whose tasks are parsed into Task objects. If it is empty, all
+                                      tasks are parsed.
+
+        Returns:
+            The changes of the parsed tasks.
+        """
+        previous_raw_tasks, previous_tasks = self._raw_tasks, self._tasks
+        self._clear()
+
+        sync_diff = SyncDiff()
+        has_raw_changed = len(raw_tasks) != len(previous_raw_tasks)
+        for raw_task in raw_tasks:
+            task_id = raw_task[ID_KEY]
+            self._raw_tasks[task_id] = raw_task
+            is_same_raw_task = _is_same_raw_task(previous_raw_tasks.get(task_id), raw_task)
+            if not is_same_raw_task:
+                has_raw_changed = True
+                self._changed_raw_ids.add(task_id)
+
+            if valid_ticktick_lists_ids and raw_task[PROJECT_ID_KEY] not in valid_ticktick_lists_ids:
+                continue
+
+            previous_task = previous_tasks.get(task_id)
+            if previous_task is not None and is_same_raw_task:
+                task = previous_task
+            else:
+                task = self._parse(raw_task)
+                (sync_diff.updated if previous_task is not None else sync_diff.added).append(task)
+
+            self._tasks[task_id] = task
+            self._index(task)
+
+        sync_diff.removed.extend(task for task_id, task in previous_tasks.items() if task_id not in self._tasks)
+        self._changed_raw_ids.update(task_id for task_id in previous_raw_tasks if task_id not in self._raw_tasks)
+        if has_raw_changed:
+            self.revision += 1
+        return sync_diff
+
+    def apply_changes(self, sync_task_bean: dict, valid_ticktick_lists_ids: list[str]) -> SyncDiff:
+        """Merges the changes of an incremental sync into the store.
+
+        Updated tasks that are no longer open (completed, abandoned or deleted) are removed from the store, because a
+        full sync only returns open tasks.
+
+        Args:
+            sync_task_bean: The "syncTaskBean" of an incremental sync response.
+            valid_ticktick_lists_ids: Ticktick lists ids whose tasks are parsed into Task objects.
+
+        Returns:
+            The changes of the parsed tasks.
+        """
+        updated_raw_tasks = sync_task_bean.get(tsp.UPDATE) or []
+        deleted_tasks = sync_task_bean.get(tsp.DELETE) or []
+
+        sync_diff = SyncDiff()
+        for raw_task in updated_raw_tasks:
+            if _is_raw_task_open(raw_task):
+                self._upsert(raw_task, valid_ticktick_lists_ids, sync_diff)
+            else:
+                self._remove(raw_task[ID_KEY], sync_diff)
+
+        for deleted_task in deleted_tasks:
+            self._remove(_get_deleted_task_id(deleted_task), sync_diff)
+
+        if updated_raw_tasks or deleted_tasks:
+            self.revision += 1
+        return sync_diff
+
+    def _parse(self, raw_task: dict) -> AnyTask:
+        return LazyTask(raw_task) if self.lazy_parsing else dict_to_task(raw_task)
+
+    def _upsert(self, raw_task: dict, valid_ticktick_lists_ids: list[str], sync_diff: SyncDiff):
+        task_id = raw_task[ID_KEY]
+        previous_raw_task = self._raw_tasks.get(task_id)
+        self._raw_tasks[task_id] = raw_task
+        is_same_raw_task = _is_same_raw_task(previous_raw_task, raw_task)
+        if not is_same_raw_task:
+            self._changed_raw_ids.add(task_id)
+
+        previous_task = self._tasks.get(task_id)
+        is_valid = not valid_ticktick_lists_ids or raw_task[PROJECT_ID_KEY] in valid_ticktick_lists_ids
+        if previous_task is not None and is_valid and is_same_raw_task:
+            return
+
+        if previous_task is not None:
+            self._unindex(previous_task)
+
+        if not is_valid:
+            if previous_task is not None:
+                del self._tasks[task_id]
+                sync_diff.removed.append(previous_task)
+            return
+
+        task = self._parse(raw_task)
+        self._tasks[task_id] = task
+        self._index(task)
+        (sync_diff.updated if previous_task is not None else sync_diff.added).append(task)
+
+    def _remove(self, task_id: str, sync_diff: SyncDiff):
+        if self._raw_tasks.pop(task_id, None) is not None:
+            self._changed_raw_ids.add(task_id)
+
+        task = self._tasks.pop(task_id, None)
+        if task is not None:
+            self._unindex(task)
+            sync_diff.removed.append(task)
+
+    def _index(self, task: AnyTask):
+        task_id = task.ticktick_id
+        self._tasks_by_project.setdefault(task.project_id, {})[task_id] = task
+        for tag in task.tags:
+            self._tasks_by_tag.setdefault(tag, {})[task_id] = task
+        if task.parent_id:
+            self._tasks_by_parent.setdefault(task.parent_id, {})[task_id] = task
+        if self._tasks_by_due_day is not None:
+            self._index_due_date(self._tasks_by_due_day, task)
+
+    def _unindex(self, task: AnyTask):
+        task_id = task.ticktick_id
+        _remove_from_index(self._tasks_by_project, task.project_id, task_id)
+        for tag in task.tags:
+            _remove_from_index(self._tasks_by_tag, tag, task_id)
+        if task.parent_id:
+            _remove_from_index(self._tasks_by_parent, task.parent_id, task_id)
+        if self._tasks_by_due_day is not None and task.due_date:
+            due_day = _get_due_day(task)
+            _remove_from_index(self._tasks_by_due_day, due_day, task_id)
+            if due_day not in self._tasks_by_due_day:
+                self._due_days.pop(bisect_left(self._due_days, due_day))
+
+    def _get_due_date_index(self) -> dict[str, dict[str, AnyTask]]:
+        """Returns the due date index, building it if it has not been built yet."""
+        if self._tasks_by_due_day is None:
+            self._tasks_by_due_day = {}
+            for task in self._tasks.values():
+                self._index_due_date(self._tasks_by_due_day, task)
+        return self._tasks_by_due_day
+
+    def _index_due_date(self, tasks_by_due_day: dict[str, dict[str, AnyTask]], task: AnyTask):
+        if not task.due_date:
+            return
+
+        due_day = _get_due_day(task)
+        if due_day not in tasks_by_due_day:
+            insort(self._due_days, due_day)
+        tasks_by_due_day.setdefault(due_day, {})[task.ticktick_id] = task
+
+
+def _remove_from_index(index: dict[str, dict[str, AnyTask]], key: str, task_id: str):
+    """Removes a task from an index entry, the entry is dropped when it becomes empty."""
+    indexed_tasks = index.get(key)
+    if indexed_tasks is None:
+        return
+
+    indexed_tasks.pop(task_id, None)
+    if not indexed_tasks:
+        del index[key]
+
+
+def _get_due_day(task: AnyTask) -> str:
+    """Returns the due day of a task in format YYYY-MM-DD, in the timezone of the task."""
+    return task.due_date[:10]
+
+
+def _is_same_raw_task(previous_raw_task: dict | None, raw_task: dict) -> bool:
+    """Checks if a raw task did not change, a different etag means it changed without comparing the whole task."""
+    if previous_raw_task is None:
+        return False
+    if previous_raw_task.get(ETAG_KEY) != raw_task.get(ETAG_KEY):
+        return False
+    return previous_raw_task == raw_task
+
+
+def _is_raw_task_open(raw_task: dict) -> bool:
+    """Checks if a raw task is open and not deleted."""
+    return raw_task.get(STATUS_KEY, 0) == 0 and raw_task.get(DELETED_KEY, 0) == 0
+
+
+def _get_deleted_task_id(deleted_task: dict | str) -> str:
+    """Returns the task id of an entry of the deleted tasks of a sync, which can be an id or a dict with the id."""
+    if isinstance(deleted_task, dict):
+        return deleted_task[tsp.TASK_ID]
+    return deleted_task
@@ -1,4 +1,11 @@
-from functools import reduce
+import re
+import sys
+from sys import intern
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
 from dateutil import parser, tz
 
 from tickthon.data.ticktick_ids import TicktickListIds
@@ -6,6 +13,29 @@ from tickthon.data.ticktick_ids import TicktickListIds
 from .data.ticktick_task_parameters import TicktickTaskParameters as ttp
 from .task_model import Task
 
+if TYPE_CHECKING:
+    from .lazy_task import AnyTask
+
+TICKTICK_DATE_PATTERN = re.compile(r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})"
+                                   r"(?:\.(\d{1,6}))?([+-])(\d{2}):?(\d{2})")
+FROMISOFORMAT_PARSES_TICKTICK_DATES = sys.version_info >= (3, 11)
+
+# Raw task keys read by dict_to_task, resolved once because enum attribute lookups are slow in the parse loop.
+ID_KEY = ttp.ID.value
+ETAG_KEY = ttp.ETAG.value
+CREATED_TIME_KEY = ttp.CREATED_TIME.value
+STATUS_KEY = ttp.STATUS.value
+TITLE_KEY = ttp.TITLE.value
+DELETED_KEY = ttp.DELETED.value
+TAGS_KEY = ttp.TAGS.value
+PROJECT_ID_KEY = ttp.PROJECT_ID.value
+TIMEZONE_KEY = ttp.TIMEZONE.value
+START_DATE_KEY = ttp.START_DATE.value
+COLUMN_ID_KEY = ttp.COLUMN_ID.value
+PARENT_ID_KEY = ttp.PARENT_ID.value
+FOCUS_SUMMARIES_KEY = ttp.FOCUS_SUMMARIES.value
+FOCUS_TIME_KEY = ttp.FOCUS_TIME.value
+
 
 def parse_ticktick_tasks(raw_tasks: list[dict] | dict, valid_ticktick_lists_ids: list | None = None) \
         -> list[Task]:
@@ -18,46 +48,69 @@ def parse_ticktick_tasks(raw_tasks: list[dict] | dict, valid_ticktick_lists_ids:
     Returns:
         Parsed tasks.
     """
-    ticktick_tasks = []
-    valid_ticktick_lists = valid_ticktick_lists_ids if valid_ticktick_lists_ids else []
+    valid_ticktick_lists = set(valid_ticktick_lists_ids) if valid_ticktick_lists_ids else set()
 
     if not isinstance(raw_tasks, list):
         raw_tasks = [raw_tasks]
 
-    for raw_task in raw_tasks:
-        if valid_ticktick_lists and raw_task[ttp.PROJECT_ID.value] not in valid_ticktick_lists:
-            continue
-
-        ticktick_tasks.append(dict_to_task(raw_task))
-    return ticktick_tasks
+    if not valid_ticktick_lists:
+        return [dict_to_task(raw_task) for raw_task in raw_tasks]
+    return [dict_to_task(raw_task) for raw_task in raw_tasks if raw_task[PROJECT_ID_KEY] in valid_ticktick_lists]
 
 
 def dict_to_task(raw_task: dict) -> Task:
     """Converts a raw task to a Task object.
 
+    The raw task is read in a single pass, each field is looked up once and the strings shared between tasks are
+    interned.
+
     Args:
         raw_task: The raw task as dictionary.
 
     Returns:
         A Task object.
     """
-    return Task(ticktick_id=raw_task[ttp.ID.value],
-                ticktick_etag=raw_task[ttp.ETAG.value],
-                created_date=get_task_date(raw_task.get(ttp.TIMEZONE.value, ""),
-                                           raw_task.get(ttp.CREATED_TIME.value, None)),
-                status=raw_task[ttp.STATUS.value],
-                title=raw_task[ttp.TITLE.value].strip(),
+    raw_task_timezone = raw_task[TIMEZONE_KEY]
+    tags = raw_task.get(TAGS_KEY)
+
+    return Task(ticktick_id=_intern(raw_task[ID_KEY]),
+                ticktick_etag=raw_task[ETAG_KEY],
+                created_date=get_task_date(raw_task_timezone, raw_task.get(CREATED_TIME_KEY)),
+                status=raw_task[STATUS_KEY],
+                title=raw_task[TITLE_KEY].strip(),
                 focus_time=get_focus_time(raw_task),
-                deleted=raw_task.get(ttp.DELETED.value, 0),
-                tags=tuple(raw_task.get(ttp.TAGS.value, ())),
-                project_id=raw_task[ttp.PROJECT_ID.value],
-                timezone=raw_task[ttp.TIMEZONE.value],
-                due_date=get_task_date(raw_task[ttp.TIMEZONE.value], raw_task.get(ttp.START_DATE.value, None)),
-                column_id=raw_task.get(ttp.COLUMN_ID.value, ""),
-                parent_id=raw_task.get(ttp.PARENT_ID.value, "")
+                deleted=raw_task.get(DELETED_KEY, 0),
+                tags=_intern_tags_tuple(tuple(tags)) if tags else (),
+                project_id=_intern(raw_task[PROJECT_ID_KEY]),
+                timezone=_intern(raw_task_timezone),
+                due_date=get_task_date(raw_task_timezone, raw_task.get(START_DATE_KEY)),
+                column_id=_intern(raw_task.get(COLUMN_ID_KEY, "")),
+                parent_id=_intern(raw_task.get(PARENT_ID_KEY, ""))
                 )
 
 
+def intern_tags(tags: Iterable[str]) -> Tuple[str, ...]:
+    """Returns the tags as a tuple shared by all the tasks with the same tags, tag names are interned.
+
+    Args:
+        tags: Tags of a task.
+
+    Returns:
+        The interned tuple of tags.
+    """
+    return _intern_tags_tuple(tuple(tags))
+
+
+def _intern(value: str) -> str:
+    """Interns a string value of a raw task, so tasks share repeated ids and timezones. Null values are kept."""
+    return intern(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=4096)
+def _intern_tags_tuple(tags: Tuple[str, ...]) -> Tuple[str, ...]:
+    return tuple(intern(tag) for tag in tags)
+
+
 def get_focus_time(raw_task: dict) -> float:
     """Returns the focus time of a task.
 
@@ -67,16 +120,15 @@ def get_focus_time(raw_task: dict) -> float:
     Returns:
         The focus time of the task.
     """
-    focus_time = 0.0
-    if ttp.FOCUS_SUMMARIES.value in raw_task:
-        for focus_summary in raw_task[ttp.FOCUS_SUMMARIES.value]:
-            raw_focus_time = reduce(lambda acc, summary: acc + summary[2], focus_summary.get("focuses", []), 0)
-            focus_time += raw_focus_time
-        focus_time = round(focus_time / 3600, 2)
-    elif ttp.FOCUS_TIME.value in raw_task:
-        focus_time = float(raw_task[ttp.FOCUS_TIME.value])
+    focus_summaries = raw_task.get(FOCUS_SUMMARIES_KEY)
+    if focus_summaries is not None:
+        focus_seconds = sum(focus[2] for focus_summary in focus_summaries for focus in focus_summary.get("focuses", ()))
+        return round(focus_seconds / 3600, 2)
+
+    if FOCUS_TIME_KEY in raw_task:
+        return float(raw_task[FOCUS_TIME_KEY])
 
-    return focus_time
+    return 0.0
 
 
 def get_task_date(raw_task_timezone: str, task_date: str | None) -> str:
@@ -92,8 +144,8 @@ def get_task_date(raw_task_timezone: str, task_date: str | None) -> str:
     if not task_date:
         return ""
 
-    task_timezone = tz.gettz(raw_task_timezone)
-    task_raw_date = parser.parse(task_date)
+    task_timezone = _get_timezone(raw_task_timezone)
+    task_raw_date = _parse_date(task_date)
 
     localized_task_date = task_raw_date.astimezone(task_timezone)
     task_date = localized_task_date.isoformat()
@@ -101,7 +153,49 @@ def get_task_date(raw_task_timezone: str, task_date: str | None) -> str:
     return task_date
 
 
-def _is_task_a_weight_measurement(task: Task, ticktick_ids: TicktickListIds) -> bool:
+def _parse_date(raw_date: str) -> datetime:
+    """Parses a date, dates in Ticktick's format YYYY-MM-DDTHH:MM:SS.000+0000 skip dateutil's generic parser."""
+    if FROMISOFORMAT_PARSES_TICKTICK_DATES:
+        try:
+            return datetime.fromisoformat(raw_date)
+        except ValueError:
+            pass
+
+    date_match = TICKTICK_DATE_PATTERN.fullmatch(raw_date)
+    if date_match is None:
+        return parser.parse(raw_date)
+
+    year, month, day, hour, minute, second, fraction, offset_sign, offset_hours, offset_minutes = date_match.groups()
+    microsecond = int(fraction.ljust(6, "0")) if fraction else 0
+    date_timezone = _get_utc_offset(offset_sign, offset_hours, offset_minutes)
+
+    return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second), microsecond, date_timezone)
+
+
+@lru_cache(maxsize=None)
+def _get_timezone(timezone_name: str) -> tzinfo | None:
+    """Returns the tzinfo of a timezone name, resolved timezones are cached.
+
+    zoneinfo is used when it knows the timezone because converting dates with it is much faster than with dateutil,
+    other names (including the empty name, which is the local timezone) are resolved by dateutil.
+    """
+    try:
+        return ZoneInfo(timezone_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return tz.gettz(timezone_name)
+
+
+@lru_cache(maxsize=None)
+def _get_utc_offset(offset_sign: str, offset_hours: str, offset_minutes: str) -> timezone:
+    """Returns the fixed timezone of an UTC offset, resolved offsets are cached."""
+    offset = timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+    if not offset:
+        return timezone.utc
+
+    return timezone(-offset if offset_sign == "-" else offset)
+
+
+def _is_task_a_weight_measurement(task: "AnyTask", ticktick_ids: TicktickListIds) -> bool:
     """Checks if a task is a weight measurement."""
     weight_measurements_list_id = ticktick_ids.WEIGHT_MEASUREMENTS
 
@@ -111,6 +205,6 @@ def _is_task_a_weight_measurement(task: Task, ticktick_ids: TicktickListIds) ->
     return task.project_id == weight_measurements_list_id
 
 
-def _is_task_active(task: Task) -> bool:
+def _is_task_active(task: "AnyTask") -> bool:
     """Checks if a task is active."""
     return task.status == 0 and task.deleted == 0
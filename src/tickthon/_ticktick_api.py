@@ -1,7 +1,16 @@
+import threading
+import time
 from enum import Enum
+from typing import Callable
 
 from requests import Session, Response
 
+from . import _json
+from ._request_scheduler import RequestScheduler
+from ._response_cache import ResponseCache
+from .metrics import CACHE_REQUESTS, JSON_DECODE_SECONDS, REQUEST_BYTES, REQUEST_SECONDS, RESPONSE_BYTES, \
+    MetricsSink, get_endpoint, timed
+
 
 class RequestTypes(Enum):
     """Types of requests that can be sent to the Ticktick API."""
@@ -24,14 +33,102 @@ class TicktickAPI:
     def __init__(self, username: str,
                  password: str,
                  api_token: str | None = None,
-                 cookies: dict[str, str] | None = None):
+                 cookies: dict[str, str] | None = None,
+                 response_cache: ResponseCache | None = None,
+                 request_scheduler: RequestScheduler | None = None,
+                 on_token_refresh: Callable[[str, dict[str, str]], None] | None = None,
+                 metrics_sink: MetricsSink | None = None):
+        """Initializes the client.
+
+        The api token and cookies are trusted without validating them, the client logs in only if no token is given
+        or when a request is rejected with 401 Unauthorized.
+
+        Args:
+            username: Ticktick username.
+            password: Ticktick password.
+            api_token: Ticktick api token. If it is None, the client logs in at initialization.
+            cookies: Ticktick cookies.
+            response_cache: Cache of the validators of the responses. If it is None, a default ResponseCache is used.
+            request_scheduler: Scheduler that rate limits and retries the requests. If it is None, a default
+                               RequestScheduler is used.
+            on_token_refresh: Function called with the new token and cookies after the client logs in again, so they
+                              can be persisted.
+            metrics_sink: Sink of the request latency, transferred bytes, retries, queue wait, JSON decode time and
+                          cache metrics. It is also set on the request scheduler if it has no sink. If it is None,
+                          nothing is measured.
+        """
         self.session = Session()
+        self.response_cache = response_cache if response_cache is not None else ResponseCache()
+        self.request_scheduler = request_scheduler if request_scheduler is not None else RequestScheduler()
+        self.on_token_refresh = on_token_refresh
+        self.metrics_sink = metrics_sink
+        if self.request_scheduler.metrics_sink is None:
+            self.request_scheduler.metrics_sink = metrics_sink
         self.session.headers.update({"Content-Type": "application/json",
                                      "User-Agent": self.USER_AGENT,
                                      "x-device": self.X_DEVICE_
                                      })
 
-        self.auth_token, self.cookies = self.validate_token(username, password, api_token, cookies)
+        self._username = username
+        self._password = password
+        self._auth_lock = threading.Lock()
+        self.auth_token = ""
+        self.cookies: dict[str, str] = {}
+
+        if api_token:
+            self._set_credentials(api_token, cookies or {})
+        else:
+            self._set_credentials(*self._login(username, password))
+
+    def _set_credentials(self, api_token: str, cookies: dict[str, str]):
+        self.auth_token, self.cookies = api_token, cookies
+        self.session.headers.update({"Authorization": f"Bearer {api_token}"})
+        if cookies:
+            self.session.cookies.update(cookies)
+
+    def _send(self, request_type: RequestTypes, url: str, refresh_token: bool = True, **kwargs) -> Response:
+        """Sends a request through the request scheduler, which rate limits and retries it.
+
+        If the request is rejected with 401 Unauthorized, the client logs in again and replays it once.
+        """
+        sent_token = self.auth_token
+        response = self._send_scheduled(request_type, url, **kwargs)
+        if response.status_code != 401 or not refresh_token:
+            return response
+
+        self._refresh_token(sent_token)
+        return self._send_scheduled(request_type, url, **kwargs)
+
+    def _send_scheduled(self, request_type: RequestTypes, url: str, **kwargs) -> Response:
+        started_at = time.perf_counter()
+        response = self.request_scheduler.send(request_type.value,
+                                               lambda: self.session.request(request_type.value, url, **kwargs))
+        if self.metrics_sink is not None:
+            self._record_request(self.metrics_sink, request_type, url, response, time.perf_counter() - started_at)
+        return response
+
+    @staticmethod
+    def _record_request(metrics_sink: MetricsSink, request_type: RequestTypes, url: str, response: Response,
+                        seconds: float):
+        """Records the latency and transferred bytes of a request, retries included."""
+        endpoint = get_endpoint(url)
+        metrics_sink.observe(REQUEST_SECONDS, seconds, {"method": request_type.value, "endpoint": endpoint,
+                                                        "status": str(response.status_code)})
+        metrics_sink.increment(RESPONSE_BYTES, len(response.content), {"endpoint": endpoint})
+        request_body = response.request.body if response.request is not None else None
+        if isinstance(request_body, (bytes, str)) and request_body:
+            metrics_sink.increment(REQUEST_BYTES, len(request_body), {"endpoint": endpoint})
+
+    def _refresh_token(self, expired_token: str):
+        """Logs in again, unless another request already replaced the expired token."""
+        with self._auth_lock:
+            if self.auth_token != expired_token:
+                return
+
+            self._set_credentials(*self._login(self._username, self._password))
+
+        if self.on_token_refresh is not None:
+            self.on_token_refresh(self.auth_token, self.cookies)
 
     def _login(self, user: str, password: str) -> tuple[str, dict[str, str]]:
         """Logs into Ticktick and returns the authentication token.
@@ -44,7 +141,8 @@ class TicktickAPI:
             A tuple with the token and the cookie.
         """
         payload = {"username": user, "password": password}
-        response = self.session.post(self.SIGNIN_URL, headers=self.SIGNIN_HEADERS, json=payload)
+        response = self._send(RequestTypes.POST, self.SIGNIN_URL, refresh_token=False, headers=self.SIGNIN_HEADERS,
+                              json=payload)
         response.raise_for_status()
 
         cookies = {name: value for name, value in self.session.cookies.items()}
@@ -58,6 +156,9 @@ class TicktickAPI:
                        cookies: dict[str, str] | None) -> tuple[str, dict[str, str]]:
         """Validate the token. If the token is invalid, login again.
 
+        The client does not need it, invalid tokens are refreshed when a request is rejected, but it can be used to
+        check a token eagerly.
+
         Args:
             username: The username to login with.
             password: The password to login with.
@@ -72,7 +173,7 @@ class TicktickAPI:
         if cookies:
             self.session.cookies.update(cookies)
 
-        current_token_response = self.session.get(self.BASE_URL + "/batch/check/0")
+        current_token_response = self._send(RequestTypes.GET, self.BASE_URL + "/batch/check/0", refresh_token=False)
 
         if current_token_response.ok and cookies and api_token:
             return api_token, cookies
@@ -90,7 +191,7 @@ class TicktickAPI:
             Response from the Ticktick API
         """
 
-        response = self.session.post(url, json=data)
+        response = self._send(RequestTypes.POST, url, data=_json.dumps(data) if data is not None else None)
         response.raise_for_status()
 
         return response
@@ -106,7 +207,66 @@ class TicktickAPI:
             Response from the Ticktick API
         """
 
-        response = self.session.get(url, json=data)
+        response = self._send(RequestTypes.GET, url, json=data)
         response.raise_for_status()
 
         return response
+
+    def post_json(self, url: str, data: dict | list | None = None):
+        """Sends a POST request to the Ticktick API and decodes the JSON body of the response.
+
+        Args:
+            url: URL to send the request to
+            data: Data to send in the request. Defaults to None.
+
+        Returns:
+            The decoded body of the response from the Ticktick API
+        """
+        return self.decode_json(self.post(url, data))
+
+    def get_json(self, url: str, data: dict | list | None = None):
+        """Sends a GET request to the Ticktick API and decodes the JSON body of the response.
+
+        Args:
+            url: URL to send the request to
+            data: Data to send in the request. Defaults to None.
+
+        Returns:
+            The decoded body of the response from the Ticktick API
+        """
+        return self.decode_json(self.get(url, data))
+
+    def get_if_changed(self, url: str) -> Response | None:
+        """Sends a conditional GET request to the Ticktick API.
+
+        Args:
+            url: URL to send the request to
+
+        Returns:
+            Response from the Ticktick API, None if it did not change since the last request to the same URL.
+        """
+        response = self._send(RequestTypes.GET, url, headers=self.response_cache.get_conditional_headers(url))
+        if response.status_code != 304:
+            response.raise_for_status()
+
+        is_unchanged = self.response_cache.is_unchanged(url, response)
+        if self.metrics_sink is not None:
+            self.metrics_sink.increment(CACHE_REQUESTS, labels={"cache": "response",
+                                                                "result": "hit" if is_unchanged else "miss"})
+
+        return None if is_unchanged else response
+
+    def decode_json(self, response: Response):
+        """Decodes the JSON body of a response from the Ticktick API.
+
+        Args:
+            response: Response from the Ticktick API
+
+        Returns:
+            The decoded body.
+        """
+        if self.metrics_sink is None:
+            return _json.loads(response.content)
+
+        with timed(self.metrics_sink, JSON_DECODE_SECONDS, {"endpoint": get_endpoint(response.url)}):
+            return _json.loads(response.content)
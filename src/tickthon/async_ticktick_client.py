@@ -0,0 +1,242 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Iterator
+
+from ._async_ticktick_api import AsyncTicktickAPI
+from .data.task_types import TaskType
+from .data.ticktick_ids import TicktickListIds
+from .focus_analytics import FocusSessions
+from .habit_model import Habit, HabitCheckin
+from .lazy_task import AnyTask
+from .sync_diff import SyncDiff
+from .task_model import Task
+from .task_query import TaskQuery
+from .task_snapshot import TaskSnapshot
+from .task_write_batcher import TaskWriteBatcher, TaskWriteResult
+from .ticktick_client import TicktickClient
+from .weight_series import WeightSeries
+
+
+class AsyncTicktickClient:
+    """Asyncio Ticktick client.
+
+    It has the same methods as TicktickClient as coroutines, independent calls awaited together, for example with
+    asyncio.gather, run concurrently over a shared connection pool.
+    """
+
+    def __init__(self, ticktick_client: TicktickClient, max_connections: int = 10):
+        """Wraps a Ticktick client.
+
+        Args:
+            ticktick_client: Ticktick client that runs the calls.
+            max_connections: Maximum number of concurrent requests.
+        """
+        self.ticktick_client = ticktick_client
+        self.ticktick_api = AsyncTicktickAPI(ticktick_client.ticktick_api, max_connections)
+
+    @classmethod
+    async def create(cls,
+                     username: str,
+                     password: str,
+                     ticktick_list_ids: TicktickListIds,
+                     api_token: str | None = None,
+                     cookies: dict[str, str] | None = None,
+                     max_connections: int = 10,
+                     **client_options) -> "AsyncTicktickClient":
+        """Creates and syncs a client without blocking the event loop.
+
+        Args:
+            username: Ticktick username.
+            password: Ticktick password.
+            ticktick_list_ids: Ticktick lists ids whose tasks are parsed.
+            api_token: Ticktick api token, if it is invalid the client logs in again.
+            cookies: Ticktick cookies.
+            max_connections: Maximum number of concurrent requests.
+            **client_options: Other TicktickClient options, for example incremental_sync.
+
+        Returns:
+            The async client.
+        """
+        ticktick_client = await asyncio.to_thread(TicktickClient, username, password, ticktick_list_ids, api_token,
+                                                  cookies, **client_options)
+        return cls(ticktick_client, max_connections)
+
+    async def __aenter__(self) -> "AsyncTicktickClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Stops the background sync, waits for the pending requests and releases the connections."""
+        await asyncio.to_thread(self.ticktick_client.close)
+        await asyncio.to_thread(self.ticktick_api.close)
+
+    @property
+    def snapshot(self) -> TaskSnapshot | None:
+        """Immutable view of the active tasks of the last sync, see TicktickClient.snapshot."""
+        return self.ticktick_client.snapshot
+
+    async def _iterate(self, tasks: Iterator[AnyTask]) -> AsyncIterator[AnyTask]:
+        """Consumes a blocking iterator in the worker threads."""
+        sentinel = object()
+        while (task := await self.ticktick_api.run(next, tasks, sentinel)) is not sentinel:
+            yield task  # type: ignore[misc]
+
+    async def move_task_to_project(self, task: AnyTask, project_id: str):
+        """Moves a task from one project (list) to another in Ticktick, see TicktickClient.move_task_to_project."""
+        await self.ticktick_api.run(self.ticktick_client.move_task_to_project, task, project_id)
+
+    async def replace_task_tags(self, task: AnyTask, tags: tuple[str, ...]) -> bool:
+        """Replaces the tags of a task in Ticktick, see TicktickClient.replace_task_tags."""
+        return await self.ticktick_api.run(self.ticktick_client.replace_task_tags, task, tags)
+
+    async def sync(self) -> SyncDiff:
+        """Syncs the active tasks with Ticktick, see TicktickClient.sync."""
+        return await self.ticktick_api.run(self.ticktick_client.sync)
+
+    def subscribe(self, callback: Callable[[SyncDiff], None]) -> Callable[[], None]:
+        """Subscribes a function to the changes of the active tasks, see TicktickClient.subscribe.
+
+        The callback runs in the worker thread that made the sync.
+        """
+        return self.ticktick_client.subscribe(callback)
+
+    async def get_active_tasks(self) -> list[AnyTask]:
+        """Gets all active tasks from Ticktick, see TicktickClient.get_active_tasks."""
+        return await self.ticktick_api.run(self.ticktick_client.get_active_tasks)
+
+    async def get_weight_series(self) -> WeightSeries:
+        """Gets the time series of the weight measurements, see TicktickClient.get_weight_series."""
+        return await self.ticktick_api.run(self.ticktick_client.get_weight_series)
+
+    async def get_completed_tasks(self) -> list[AnyTask]:
+        """Gets all completed tasks from Ticktick, see TicktickClient.get_completed_tasks."""
+        return await self.ticktick_api.run(self.ticktick_client.get_completed_tasks)
+
+    async def get_deleted_tasks(self) -> list[AnyTask]:
+        """Gets all deleted tasks from Ticktick, see TicktickClient.get_deleted_tasks."""
+        return await self.ticktick_api.run(self.ticktick_client.get_deleted_tasks)
+
+    async def get_abandoned_tasks(self) -> list[AnyTask]:
+        """Gets all abandoned tasks from Ticktick, see TicktickClient.get_abandoned_tasks."""
+        return await self.ticktick_api.run(self.ticktick_client.get_abandoned_tasks)
+
+    def iter_completed_tasks(self, from_date: datetime, to_date: datetime) -> AsyncIterator[AnyTask]:
+        """Iterates over the tasks completed between two dates, see TicktickClient.iter_completed_tasks."""
+        return self._iterate(self.ticktick_client.iter_completed_tasks(from_date, to_date))
+
+    def iter_abandoned_tasks(self, from_date: datetime, to_date: datetime) -> AsyncIterator[AnyTask]:
+        """Iterates over the tasks abandoned between two dates, see TicktickClient.iter_abandoned_tasks."""
+        return self._iterate(self.ticktick_client.iter_abandoned_tasks(from_date, to_date))
+
+    def iter_deleted_tasks(self) -> AsyncIterator[AnyTask]:
+        """Iterates over the tasks in the trash, see TicktickClient.iter_deleted_tasks."""
+        return self._iterate(self.ticktick_client.iter_deleted_tasks())
+
+    async def get_task(self, task_id: str) -> Task:
+        """Gets task information from Ticktick, see TicktickClient.get_task."""
+        return await self.ticktick_api.run(self.ticktick_client.get_task, task_id)
+
+    async def complete_task(self, task: AnyTask):
+        """Completes a task in Ticktick, see TicktickClient.complete_task."""
+        await self.ticktick_api.run(self.ticktick_client.complete_task, task)
+
+    async def create_task(self, task: Task, column_id: str | None = None) -> str:
+        """Creates a task in Ticktick, see TicktickClient.create_task."""
+        return await self.ticktick_api.run(self.ticktick_client.create_task, task, column_id)
+
+    @asynccontextmanager
+    async def batch(self, max_size: int | None = None,
+                    max_delay: float | None = None) -> AsyncIterator[TaskWriteBatcher]:
+        """Creates a write batcher that is flushed in a worker thread when the `async with` block exits.
+
+        See TicktickClient.batch. `max_delay` flushes run in a timer thread. `max_size` is not supported, because its
+        flushes run in the code that queues the mutation, which would block the event loop.
+
+        Raises:
+            ValueError: If `max_size` is set.
+        """
+        if max_size is not None:
+            raise ValueError("max_size would flush in the event loop, use max_delay with AsyncTicktickClient.batch")
+
+        batcher = self.ticktick_client.batch(max_delay=max_delay)
+        try:
+            yield batcher
+        except BaseException as error:
+            batcher.__exit__(type(error), error, error.__traceback__)
+            raise
+        await self.ticktick_api.run(batcher.flush)
+
+    async def get_overall_focus_time(self, date: str) -> float:
+        """Gets the overall focus time of a day, see TicktickClient.get_overall_focus_time."""
+        return await self.ticktick_api.run(self.ticktick_client.get_overall_focus_time, date)
+
+    async def get_active_focus_time(self, date: str, active_focus_tags: list[str]) -> float:
+        """Gets the active focus time of a day, see TicktickClient.get_active_focus_time."""
+        return await self.ticktick_api.run(self.ticktick_client.get_active_focus_time, date, active_focus_tags)
+
+    async def get_overall_focus_time_range(self, start_date: str, end_date: str) -> dict[str, float]:
+        """Gets the overall focus time of every day of a period, see TicktickClient.get_overall_focus_time_range."""
+        return await self.ticktick_api.run(self.ticktick_client.get_overall_focus_time_range, start_date, end_date)
+
+    async def get_active_focus_time_range(self, start_date: str, end_date: str,
+                                          active_focus_tags: list[str]) -> dict[str, float]:
+        """Gets the active focus time of every day of a period, see TicktickClient.get_active_focus_time_range."""
+        return await self.ticktick_api.run(self.ticktick_client.get_active_focus_time_range, start_date, end_date,
+                                           active_focus_tags)
+
+    async def get_focus_sessions(self, from_date: datetime, to_date: datetime,
+                                 utc_offset: timedelta = timedelta(0)) -> FocusSessions:
+        """Gets the focus sessions that started between two dates, see TicktickClient.get_focus_sessions."""
+        return await self.ticktick_api.run(self.ticktick_client.get_focus_sessions, from_date, to_date, utc_offset)
+
+    async def get_tasks_by_list(self, list_ids: list[str], task_type: TaskType = TaskType.ACTIVE) -> list[AnyTask]:
+        """Gets all tasks from Ticktick by list ids, see TicktickClient.get_tasks_by_list."""
+        return await self.ticktick_api.run(self.ticktick_client.get_tasks_by_list, list_ids, task_type)
+
+    async def get_tasks_by_list_names(self, list_names: list[str],
+                                      task_type: TaskType = TaskType.ACTIVE) -> list[AnyTask]:
+        """Gets all tasks from Ticktick by list names, see TicktickClient.get_tasks_by_list_names."""
+        return await self.ticktick_api.run(self.ticktick_client.get_tasks_by_list_names, list_names, task_type)
+
+    def query(self) -> TaskQuery:
+        """Starts a query of the tasks, run it with `await client.get_tasks(query)`, see TicktickClient.query."""
+        return self.ticktick_client.query()
+
+    async def get_tasks(self, query: TaskQuery) -> list[AnyTask]:
+        """Gets the tasks that match a query, see TicktickClient.get_tasks."""
+        return await self.ticktick_api.run(self.ticktick_client.get_tasks, query)
+
+    async def get_tasks_by_tag(self, tag: str) -> list[AnyTask]:
+        """Gets the active tasks that have a tag, see TicktickClient.get_tasks_by_tag."""
+        return await self.ticktick_api.run(self.ticktick_client.get_tasks_by_tag, tag)
+
+    async def get_subtasks(self, task: AnyTask) -> list[AnyTask]:
+        """Gets the active subtasks of a task, see TicktickClient.get_subtasks."""
+        return await self.ticktick_api.run(self.ticktick_client.get_subtasks, task)
+
+    async def get_subtree(self, task: AnyTask) -> list[AnyTask]:
+        """Gets the active descendants of a task, see TicktickClient.get_subtree."""
+        return await self.ticktick_api.run(self.ticktick_client.get_subtree, task)
+
+    async def get_ancestors(self, task: AnyTask) -> list[AnyTask]:
+        """Gets the active ancestors of a task, see TicktickClient.get_ancestors."""
+        return await self.ticktick_api.run(self.ticktick_client.get_ancestors, task)
+
+    async def get_subtree_focus_time(self, task: AnyTask) -> float:
+        """Gets the focus time of a task and its descendants, see TicktickClient.get_subtree_focus_time."""
+        return await self.ticktick_api.run(self.ticktick_client.get_subtree_focus_time, task)
+
+    async def complete_subtree(self, task: AnyTask) -> list[TaskWriteResult]:
+        """Completes a task and its descendants in one batch, see TicktickClient.complete_subtree."""
+        return await self.ticktick_api.run(self.ticktick_client.complete_subtree, task)
+
+    async def get_habits(self) -> list[Habit]:
+        """Gets all habits from Ticktick, see TicktickClient.get_habits."""
+        return await self.ticktick_api.run(self.ticktick_client.get_habits)
+
+    async def sync_habit_checkins(self, habit_ids: list[str] | None = None) -> list[HabitCheckin]:
+        """Syncs the check-ins of habits, see TicktickClient.sync_habit_checkins."""
+        return await self.ticktick_api.run(self.ticktick_client.sync_habit_checkins, habit_ids)
@@ -0,0 +1,11 @@
+
+class TicktickGroupParameters:
+
+    ID = "id"
+    NAME = "name"
+    ETAG = "etag"
+    SORT_ORDER = "sortOrder"
+    SORT_TYPE = "sortType"
+    SHOW_ALL = "showAll"
+    VIEW_MODE = "viewMode"
+    TEAM_ID = "teamId"
@@ -0,0 +1,32 @@
+
+class TicktickHabitParameters:
+
+    ID = "id"
+    NAME = "name"
+    STATUS = "status"
+    TYPE = "type"
+    GOAL = "goal"
+    STEP = "step"
+    UNIT = "unit"
+    COLOR = "color"
+    ETAG = "etag"
+    SORT_ORDER = "sortOrder"
+    REPEAT_RULE = "repeatRule"
+    TOTAL_CHECK_INS = "totalCheckIns"
+    CREATED_TIME = "createdTime"
+    MODIFIED_TIME = "modifiedTime"
+    SECTION_ID = "sectionId"
+    TARGET_DAYS = "targetDays"
+
+
+class TicktickHabitCheckinParameters:
+
+    CHECKINS = "checkins"
+    ID = "id"
+    HABIT_ID = "habitId"
+    CHECKIN_STAMP = "checkinStamp"
+    CHECKIN_TIME = "checkinTime"
+    OP_TIME = "opTime"
+    VALUE = "value"
+    GOAL = "goal"
+    STATUS = "status"
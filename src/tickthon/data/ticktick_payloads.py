@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, Collection
 
-from ..task_model import Task
+from ..lazy_task import AnyTask
 
 
 class TicktickPayloads:
@@ -14,63 +14,96 @@ class TicktickPayloads:
         }
 
     @staticmethod
-    def _update_task(task_id: str, project_id: str, status: int | None = None, completed_time: str | None = None,
-                     tags: Collection[str] | None = None) -> dict:
-        payload = {
-            "update": [
-                {
-                    "completedUserId": 114478622,
-                    "projectId": project_id,
-                    "id": task_id
-                }
-            ]
+    def _update_task_item(task_id: str, project_id: str, status: int | None = None, completed_time: str | None = None,
+                          tags: Collection[str] | None = None) -> dict:
+        item: dict = {
+            "completedUserId": 114478622,
+            "projectId": project_id,
+            "id": task_id
         }
 
         if status:
-            payload["update"][0]["status"] = status
+            item["status"] = status
 
         if completed_time:
-            payload["update"][0]["completedTime"] = completed_time
+            item["completedTime"] = completed_time
 
         if tags is not None:
-            payload["update"][0]["tags"] = tags
+            item["tags"] = tags
 
-        return payload
+        return item
 
     @classmethod
-    def complete_task(cls, task: Task) -> dict:
-        return cls._update_task(task.ticktick_id, task.project_id, status=2, completed_time=f"{datetime.utcnow()}+0000")
+    def _update_task(cls, task_id: str, project_id: str, status: int | None = None, completed_time: str | None = None,
+                     tags: Collection[str] | None = None) -> dict:
+        return {
+            "update": [cls._update_task_item(task_id, project_id, status, completed_time, tags)]
+        }
 
     @classmethod
-    def update_task_tags(cls, task: Task, tags: Collection[str]) -> dict:
-        return cls._update_task(task.ticktick_id, task.project_id, tags=tags)
+    def complete_task_item(cls, task: AnyTask) -> dict:
+        return cls._update_task_item(task.ticktick_id, task.project_id, status=2,
+                                     completed_time=f"{datetime.utcnow()}+0000")
 
     @classmethod
-    def move_task_to_project(cls, task: Task, project_id: str) -> list[dict]:
-        return [
-            {
-                "fromProjectId": task.project_id,
-                "toProjectId": project_id,
-                "taskId": task.ticktick_id,
-            }
-        ]
+    def complete_task(cls, task: AnyTask) -> dict:
+        return {"update": [cls.complete_task_item(task)]}
 
     @classmethod
-    def create_task(cls, task: Task, column_id: Optional[str] = None) -> dict:
+    def update_task_tags_item(cls, task: AnyTask, tags: Collection[str]) -> dict:
+        return cls._update_task_item(task.ticktick_id, task.project_id, tags=tags)
+
+    @classmethod
+    def update_task_tags(cls, task: AnyTask, tags: Collection[str]) -> dict:
+        return {"update": [cls.update_task_tags_item(task, tags)]}
+
+    @staticmethod
+    def delete_task_item(task: AnyTask) -> dict:
+        return {
+            "taskId": task.ticktick_id,
+            "projectId": task.project_id
+        }
+
+    @staticmethod
+    def move_task_to_project_item(task: AnyTask, project_id: str) -> dict:
         return {
-            "add": [
-                {
-                    "startDate": task.due_date if task.due_date else None,
-                    "columnId": column_id,
-                    "projectId": task.project_id if task.project_id else None,
-                    "title": task.title,
-                    "tags": task.tags if task.tags else None,
-                    "timeZone": task.timezone if task.timezone else None,
-                }
-            ],
-            "update": [],
-            "delete": [],
+            "fromProjectId": task.project_id,
+            "toProjectId": project_id,
+            "taskId": task.ticktick_id,
+        }
+
+    @classmethod
+    def move_task_to_project(cls, task: AnyTask, project_id: str) -> list[dict]:
+        return [cls.move_task_to_project_item(task, project_id)]
+
+    @staticmethod
+    def create_task_item(task: AnyTask, column_id: Optional[str] = None, task_id: Optional[str] = None) -> dict:
+        item = {
+            "startDate": task.due_date if task.due_date else None,
+            "columnId": column_id,
+            "projectId": task.project_id if task.project_id else None,
+            "title": task.title,
+            "tags": task.tags if task.tags else None,
+            "timeZone": task.timezone if task.timezone else None,
+        }
+
+        if task_id:
+            item["id"] = task_id
+
+        return item
+
+    @staticmethod
+    def batch_tasks(add: list[dict] | None = None, update: list[dict] | None = None,
+                    delete: list[dict] | None = None) -> dict:
+        return {
+            "add": add or [],
+            "update": update or [],
+            "delete": delete or [],
             "addAttachments": [],
             "updateAttachments": [],
             "deleteAttachments": []
         }
+
+    @classmethod
+    def create_task(cls, task: AnyTask, column_id: Optional[str] = None) -> dict:
+        return cls.batch_tasks(add=[cls.create_task_item(task, column_id)])
@@ -0,0 +1,11 @@
+
+class TicktickSyncParameters:
+
+    CHECKPOINT = "checkPoint"
+    SYNC_TASK_BEAN = "syncTaskBean"
+    UPDATE = "update"
+    DELETE = "delete"
+    TASK_ID = "taskId"
+    PROJECT_PROFILES = "projectProfiles"
+    PROJECT_GROUPS = "projectGroups"
+    TAGS = "tags"
@@ -0,0 +1,11 @@
+
+class TicktickTagParameters:
+
+    NAME = "name"
+    LABEL = "label"
+    SORT_ORDER = "sortOrder"
+    SORT_TYPE = "sortType"
+    COLOR = "color"
+    ETAG = "etag"
+    PARENT = "parent"
+    TYPE = "type"
@@ -0,0 +1,198 @@
+"""Focus time analytics over the focus sessions of raw tasks, computed with NumPy.
+
+The focus sessions of the tasks are extracted once into columnar arrays, and every group-by is a vectorized bincount
+over them. NumPy is an optional dependency, install it with `pip install tickthon[analytics]`.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from ._task_utils import FOCUS_SUMMARIES_KEY, ID_KEY, PROJECT_ID_KEY, TAGS_KEY
+
+try:
+    import numpy as np  # type: ignore[import-not-found]
+except ImportError:
+    np = None
+
+SECONDS_PER_DAY = 86400
+FOCUSES_KEY = "focuses"
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Focus analytics require NumPy, install it with `pip install tickthon[analytics]`")
+
+
+class FocusSessions:
+    """Columnar table of focus sessions, one row per session of a task.
+
+    A session split over several tasks is listed in the focus summaries of each of them with the share of that task,
+    so it has one row per task.
+
+    Task ids, project ids and tags are stored as integer codes of their label lists. A task can have several tags, so
+    the tags are stored as (session, tag) pairs and a session counts once for each of its tags.
+
+    The start of a session is the timestamp of its id, an ObjectId, and its day is the day of that timestamp shifted
+    by `utc_offset`.
+
+    Attributes:
+        task_labels: Ids of the tasks, indexed by task code.
+        project_labels: Ids of the projects, indexed by project code.
+        tag_labels: Tags, indexed by tag code.
+        task_codes: Task code of every session.
+        project_codes: Project code of every session.
+        starts: Unix time of the start of every session, in seconds.
+        durations: Duration of every session, in seconds.
+        tag_session_codes: Session of every (session, tag) pair.
+        tag_codes: Tag code of every (session, tag) pair.
+        utc_offset: Offset from UTC of the days the sessions are grouped by.
+    """
+
+    def __init__(self, task_labels: list[str], project_labels: list[str], tag_labels: list[str],
+                 task_codes: Any, project_codes: Any, starts: Any, durations: Any, tag_session_codes: Any,
+                 tag_codes: Any, utc_offset: timedelta = timedelta(0)):
+        _require_numpy()
+        self.task_labels = task_labels
+        self.project_labels = project_labels
+        self.tag_labels = tag_labels
+        self.task_codes = np.asarray(task_codes, dtype=np.int64)
+        self.project_codes = np.asarray(project_codes, dtype=np.int64)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.durations = np.asarray(durations, dtype=np.float64)
+        self.tag_session_codes = np.asarray(tag_session_codes, dtype=np.int64)
+        self.tag_codes = np.asarray(tag_codes, dtype=np.int64)
+        self.utc_offset = utc_offset
+        self.days = (self.starts + int(utc_offset.total_seconds())) // SECONDS_PER_DAY
+
+    @classmethod
+    def from_raw_tasks(cls, raw_tasks: Iterable[dict], utc_offset: timedelta = timedelta(0)) -> "FocusSessions":
+        """Extracts the focus sessions of raw tasks.
+
+        A task found several times, like an active task that is also in the closed tasks, counts its sessions once.
+
+        Args:
+            raw_tasks: Raw tasks from Ticktick, active or closed.
+            utc_offset: Offset from UTC of the days the sessions are grouped by.
+
+        Returns:
+            The focus sessions of the tasks.
+        """
+        _require_numpy()
+        task_codes_by_id: dict[str, int] = {}
+        project_codes_by_id: dict[str, int] = {}
+        tag_codes_by_tag: dict[str, int] = {}
+        task_codes: list[int] = []
+        project_codes: list[int] = []
+        starts: list[int] = []
+        durations: list[float] = []
+        tag_session_codes: list[int] = []
+        tag_codes: list[int] = []
+        seen_sessions: set[tuple[str, str]] = set()
+
+        for raw_task in raw_tasks:
+            focus_summaries = raw_task.get(FOCUS_SUMMARIES_KEY)
+            if not focus_summaries:
+                continue
+
+            task_code = task_codes_by_id.setdefault(raw_task[ID_KEY], len(task_codes_by_id))
+            project_code = project_codes_by_id.setdefault(raw_task.get(PROJECT_ID_KEY) or "", len(project_codes_by_id))
+            task_tag_codes = [tag_codes_by_tag.setdefault(tag, len(tag_codes_by_tag))
+                              for tag in raw_task.get(TAGS_KEY) or ()]
+            for focus_summary in focus_summaries:
+                for session_id, _, duration in focus_summary.get(FOCUSES_KEY) or ():
+                    if (raw_task[ID_KEY], session_id) in seen_sessions:
+                        continue
+
+                    seen_sessions.add((raw_task[ID_KEY], session_id))
+                    session_code = len(starts)
+                    task_codes.append(task_code)
+                    project_codes.append(project_code)
+                    starts.append(int(session_id[:8], 16))
+                    durations.append(duration)
+                    tag_session_codes.extend([session_code] * len(task_tag_codes))
+                    tag_codes.extend(task_tag_codes)
+
+        return cls(list(task_codes_by_id), list(project_codes_by_id), list(tag_codes_by_tag), task_codes,
+                   project_codes, starts, durations, tag_session_codes, tag_codes, utc_offset)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def total_hours(self) -> float:
+        """Focus time of all the sessions in hours."""
+        return round(float(self.durations.sum()) / 3600, 2)
+
+    def between(self, from_date: datetime, to_date: datetime) -> "FocusSessions":
+        """Returns the sessions that started between two dates, both included.
+
+        Args:
+            from_date: Start of the period, naive dates are considered UTC.
+            to_date: End of the period, naive dates are considered UTC.
+        """
+        mask = (self.starts >= _to_timestamp(from_date)) & (self.starts <= _to_timestamp(to_date))
+        new_session_codes = np.cumsum(mask) - 1
+        tag_mask = mask[self.tag_session_codes]
+        return FocusSessions(self.task_labels, self.project_labels, self.tag_labels, self.task_codes[mask],
+                             self.project_codes[mask], self.starts[mask], self.durations[mask],
+                             new_session_codes[self.tag_session_codes[tag_mask]], self.tag_codes[tag_mask],
+                             self.utc_offset)
+
+    def focus_by_day(self) -> dict[str, float]:
+        """Returns the focus time in hours of every day with sessions, by day in format YYYY-MM-DD."""
+        days, day_codes = np.unique(self.days, return_inverse=True)
+        return _sum_by(day_codes, self.durations, _format_days(days))
+
+    def focus_by_week(self) -> dict[str, float]:
+        """Returns the focus time in hours of every week with sessions, by its Monday in format YYYY-MM-DD."""
+        weeks = self.days - (self.days + 3) % 7
+        week_starts, week_codes = np.unique(weeks, return_inverse=True)
+        return _sum_by(week_codes, self.durations, _format_days(week_starts))
+
+    def focus_by_task(self) -> dict[str, float]:
+        """Returns the focus time in hours of every task with sessions, by task id."""
+        return _sum_by(self.task_codes, self.durations, self.task_labels)
+
+    def focus_by_project(self) -> dict[str, float]:
+        """Returns the focus time in hours of every project with sessions, by project id."""
+        return _sum_by(self.project_codes, self.durations, self.project_labels)
+
+    def focus_by_tag(self) -> dict[str, float]:
+        """Returns the focus time in hours of every tag with sessions, sessions of untagged tasks are not counted."""
+        return _sum_by(self.tag_codes, self.durations[self.tag_session_codes], self.tag_labels)
+
+    def rolling_average(self, window_days: int = 7) -> dict[str, float]:
+        """Returns the average daily focus time in hours over the last days, for every day from the first session.
+
+        Args:
+            window_days: Number of days of the average, days without sessions count as 0 hours.
+
+        Returns:
+            The average of the window that ends on every day, by day in format YYYY-MM-DD.
+        """
+        if not len(self):
+            return {}
+
+        first_day = int(self.days.min())
+        daily_seconds = np.bincount(self.days - first_day, weights=self.durations)
+        cumulative_seconds = np.concatenate(([0.0], np.cumsum(daily_seconds)))
+        window_ends = np.arange(1, len(daily_seconds) + 1)
+        window_seconds = cumulative_seconds[window_ends] - cumulative_seconds[np.maximum(window_ends - window_days, 0)]
+        days = _format_days(np.arange(first_day, first_day + len(daily_seconds)))
+        return {day: round(float(seconds) / window_days / 3600, 2) for day, seconds in zip(days, window_seconds)}
+
+
+def _sum_by(codes: Any, durations: Any, labels: list[str]) -> dict[str, float]:
+    """Sums the durations by code, and returns the non zero sums in hours by label."""
+    totals = np.bincount(codes, weights=durations, minlength=len(labels))
+    return {label: round(float(total) / 3600, 2) for label, total in zip(labels, totals) if total}
+
+
+def _format_days(days: Any) -> list[str]:
+    """Formats days since the Unix epoch as YYYY-MM-DD."""
+    return np.datetime_as_string(np.asarray(days, dtype="datetime64[D]")).tolist()
+
+
+def _to_timestamp(date: datetime) -> int:
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return int(date.timestamp())
@@ -0,0 +1,151 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from .data.ticktick_habit_parameters import TicktickHabitCheckinParameters as thcp
+from .habit_model import HABIT_CHECKIN_COMPLETED, HabitCheckin, dict_to_habit_checkin
+
+
+class HabitCheckinStore:
+    """In-memory store of the habit check-ins, indexed by habit and day.
+
+    Every habit keeps its raw check-ins by date stamp (YYYYMMDD), a habit has at most one check-in per day, and a
+    sorted array with the ordinals of the days it was completed. Streaks and completion rates are computed with binary
+    searches over that array, without parsing the check-ins.
+
+    The store also keeps the afterStamp of every habit, the date stamp the next sync requests the check-ins after.
+    """
+
+    def __init__(self) -> None:
+        self.after_stamps: dict[str, int] = {}
+        self._raw_checkins: dict[str, dict[int, dict]] = {}
+        self._completed_days: dict[str, array] = {}
+
+    @property
+    def raw_checkins(self) -> list[dict]:
+        """Raw check-ins in the store."""
+        return [raw_checkin for raw_checkins in self._raw_checkins.values() for raw_checkin in raw_checkins.values()]
+
+    @property
+    def habit_ids(self) -> list[str]:
+        """Ids of the habits with check-ins in the store."""
+        return list(self._raw_checkins)
+
+    def update(self, raw_checkins: list[dict]) -> list[dict]:
+        """Adds or replaces check-ins, a check-in replaces the one of the same habit and day.
+
+        Args:
+            raw_checkins: Raw check-ins of the habit check-ins endpoint.
+
+        Returns:
+            The raw check-ins that were new or changed.
+        """
+        changed_checkins = []
+        for raw_checkin in raw_checkins:
+            habit_id = raw_checkin[thcp.HABIT_ID]
+            stamp = int(raw_checkin[thcp.CHECKIN_STAMP])
+            habit_checkins = self._raw_checkins.setdefault(habit_id, {})
+            previous_checkin = habit_checkins.get(stamp)
+            if previous_checkin == raw_checkin:
+                continue
+
+            habit_checkins[stamp] = raw_checkin
+            self._index_completion(habit_id, stamp, _is_completed(raw_checkin))
+            changed_checkins.append(raw_checkin)
+        return changed_checkins
+
+    def get_checkins(self, habit_id: str, start_date: str | None = None,
+                     end_date: str | None = None) -> list[HabitCheckin]:
+        """Returns the check-ins of a habit, sorted by day.
+
+        Args:
+            habit_id: Id of the habit.
+            start_date: First day in format YYYY-MM-DD. If it is None, the check-ins are not limited.
+            end_date: Last day in format YYYY-MM-DD. If it is None, the check-ins are not limited.
+        """
+        start_stamp = to_stamp(start_date) if start_date else 0
+        end_stamp = to_stamp(end_date) if end_date else 99999999
+        habit_checkins = self._raw_checkins.get(habit_id, {})
+        return [dict_to_habit_checkin(habit_checkins[stamp]) for stamp in sorted(habit_checkins)
+                if start_stamp <= stamp <= end_stamp]
+
+    def is_completed(self, habit_id: str, day: str) -> bool:
+        """Checks if a habit was completed in a day in format YYYY-MM-DD."""
+        completed_days = self._completed_days.get(habit_id, array("l"))
+        ordinal = date.fromisoformat(day).toordinal()
+        position = bisect_left(completed_days, ordinal)
+        return position < len(completed_days) and completed_days[position] == ordinal
+
+    def get_streak(self, habit_id: str, on_date: str | None = None) -> int:
+        """Returns the number of consecutive days a habit was completed up to a day.
+
+        A day that is not completed yet does not break the streak, the streak of the day before is returned.
+
+        Args:
+            habit_id: Id of the habit.
+            on_date: Day of the streak in format YYYY-MM-DD. If it is None, today is used.
+        """
+        completed_days = self._completed_days.get(habit_id, array("l"))
+        ordinal = date.fromisoformat(on_date).toordinal() if on_date else date.today().toordinal()
+        position = bisect_right(completed_days, ordinal) - 1
+        if position < 0 or completed_days[position] < ordinal - 1:
+            return 0
+
+        streak = 1
+        while position > 0 and completed_days[position - 1] == completed_days[position] - 1:
+            streak += 1
+            position -= 1
+        return streak
+
+    def get_longest_streak(self, habit_id: str) -> int:
+        """Returns the longest number of consecutive days a habit was completed."""
+        longest_streak = streak = 0
+        previous_ordinal = None
+        for ordinal in self._completed_days.get(habit_id, array("l")):
+            streak = streak + 1 if previous_ordinal == ordinal - 1 else 1
+            longest_streak = max(longest_streak, streak)
+            previous_ordinal = ordinal
+        return longest_streak
+
+    def get_completion_rate(self, habit_id: str, start_date: str, end_date: str) -> float:
+        """Returns the fraction of the days of a period a habit was completed.
+
+        Args:
+            habit_id: Id of the habit.
+            start_date: First day of the period in format YYYY-MM-DD.
+            end_date: Last day of the period in format YYYY-MM-DD.
+        """
+        start_ordinal = date.fromisoformat(start_date).toordinal()
+        end_ordinal = date.fromisoformat(end_date).toordinal()
+        if end_ordinal < start_ordinal:
+            return 0.0
+
+        completed_days = self._completed_days.get(habit_id, array("l"))
+        completed_count = bisect_right(completed_days, end_ordinal) - bisect_left(completed_days, start_ordinal)
+        return completed_count / (end_ordinal - start_ordinal + 1)
+
+    def _index_completion(self, habit_id: str, stamp: int, is_completed: bool):
+        """Adds or removes a day of the completed days of a habit."""
+        completed_days = self._completed_days.setdefault(habit_id, array("l"))
+        ordinal = _stamp_to_date(stamp).toordinal()
+        position = bisect_left(completed_days, ordinal)
+        is_indexed = position < len(completed_days) and completed_days[position] == ordinal
+        if is_completed and not is_indexed:
+            completed_days.insert(position, ordinal)
+        elif not is_completed and is_indexed:
+            del completed_days[position]
+
+
+def to_stamp(day: str | date) -> int:
+    """Converts a day, a date or a string in format YYYY-MM-DD, into a Ticktick date stamp YYYYMMDD."""
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def _is_completed(raw_checkin: dict) -> bool:
+    return raw_checkin.get(thcp.STATUS, HABIT_CHECKIN_COMPLETED) == HABIT_CHECKIN_COMPLETED
+
+
+def _stamp_to_date(stamp: int) -> date:
+    return date(stamp // 10000, stamp // 100 % 100, stamp % 100)
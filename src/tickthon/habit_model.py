@@ -0,0 +1,76 @@
+from attrs import define
+
+from .data.ticktick_habit_parameters import TicktickHabitCheckinParameters as thcp
+from .data.ticktick_habit_parameters import TicktickHabitParameters as thp
+
+HABIT_CHECKIN_COMPLETED = 2
+
+
+@define
+class Habit:
+    """ Represents a Ticktick habit.
+
+    Attributes:
+        ticktick_id: The ID of the habit. For example: 6f8a2b3c4d5e1f09a7b6c8d9e0f2
+        name: The name of the habit.
+        status: The status of the habit. 0: active, 1: archived.
+        habit_type: "Boolean" if the habit is checked in once a day, "Real" if an amount is recorded.
+        goal: Amount to record in a day to complete the habit.
+        unit: Unit of the recorded amount, for example "Pages".
+        repeat_rule: Days the habit is due, as an iCalendar recurrence rule.
+        total_checkins: Number of days the habit was completed.
+        ticktick_etag: The unique identifier of the version of the habit.
+    """
+    ticktick_id: str
+    name: str
+    status: int = 0
+    habit_type: str = "Boolean"
+    goal: float = 1.0
+    unit: str = ""
+    repeat_rule: str = ""
+    total_checkins: int = 0
+    ticktick_etag: str = ""
+
+
+@define
+class HabitCheckin:
+    """ Represents the check-in of a habit in a day.
+
+    Attributes:
+        ticktick_id: The ID of the check-in.
+        habit_id: The ID of the habit.
+        date: The day of the check-in in format YYYY-MM-DD.
+        status: The status of the check-in. 0: not checked, 1: failed, 2: completed.
+        value: Amount recorded in the day.
+        goal: Amount to record in the day to complete the habit.
+    """
+    ticktick_id: str
+    habit_id: str
+    date: str
+    status: int = HABIT_CHECKIN_COMPLETED
+    value: float = 0
+    goal: float = 0
+
+
+def dict_to_habit(raw_habit: dict) -> Habit:
+    """Converts a raw habit of the habits endpoint into a Habit."""
+    return Habit(ticktick_id=raw_habit[thp.ID],
+                 name=raw_habit.get(thp.NAME) or "",
+                 status=raw_habit.get(thp.STATUS) or 0,
+                 habit_type=raw_habit.get(thp.TYPE) or "Boolean",
+                 goal=raw_habit.get(thp.GOAL) or 1.0,
+                 unit=raw_habit.get(thp.UNIT) or "",
+                 repeat_rule=raw_habit.get(thp.REPEAT_RULE) or "",
+                 total_checkins=raw_habit.get(thp.TOTAL_CHECK_INS) or 0,
+                 ticktick_etag=raw_habit.get(thp.ETAG) or "")
+
+
+def dict_to_habit_checkin(raw_checkin: dict) -> HabitCheckin:
+    """Converts a raw check-in of the habit check-ins endpoint into a HabitCheckin."""
+    stamp = str(raw_checkin[thcp.CHECKIN_STAMP])
+    return HabitCheckin(ticktick_id=raw_checkin.get(thcp.ID) or "",
+                        habit_id=raw_checkin[thcp.HABIT_ID],
+                        date=f"{stamp[:4]}-{stamp[4:6]}-{stamp[6:8]}",
+                        status=raw_checkin.get(thcp.STATUS, HABIT_CHECKIN_COMPLETED),
+                        value=raw_checkin.get(thcp.VALUE) or 0,
+                        goal=raw_checkin.get(thcp.GOAL) or 0)
@@ -0,0 +1,141 @@
+from typing import Tuple, TypeAlias
+
+from .task_model import Task
+from ._task_utils import COLUMN_ID_KEY, CREATED_TIME_KEY, DELETED_KEY, ETAG_KEY, ID_KEY, PARENT_ID_KEY, \
+    PROJECT_ID_KEY, START_DATE_KEY, STATUS_KEY, TAGS_KEY, TIMEZONE_KEY, TITLE_KEY, get_focus_time, get_task_date
+
+
+class LazyTask:
+    """ Read-only view of a raw Ticktick task that decodes its fields on first access.
+
+    It exposes the same attributes as Task, but dates, focus time, title and tags are only decoded when they are
+    read, and then memoized. Use `to_task` to materialize it into a Task.
+    """
+    __slots__ = ("_raw_task", "_title", "_created_date", "_due_date", "_focus_time", "_tags")
+
+    def __init__(self, raw_task: dict):
+        self._raw_task = raw_task
+        self._title: str | None = None
+        self._created_date: str | None = None
+        self._due_date: str | None = None
+        self._focus_time: float | None = None
+        self._tags: Tuple[str, ...] | None = None
+
+    def __repr__(self) -> str:
+        return f"LazyTask(ticktick_id={self.ticktick_id!r}, title={self.title!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyTask):
+            return self.to_task() == other.to_task()
+        if isinstance(other, Task):
+            return self.to_task() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @property
+    def raw_task(self) -> dict:
+        return self._raw_task
+
+    @property
+    def ticktick_id(self) -> str:
+        return self._raw_task[ID_KEY]
+
+    @property
+    def ticktick_etag(self) -> str:
+        return self._raw_task[ETAG_KEY]
+
+    @property
+    def status(self) -> int:
+        return self._raw_task[STATUS_KEY]
+
+    @property
+    def deleted(self) -> int:
+        return self._raw_task.get(DELETED_KEY, 0)
+
+    @property
+    def project_id(self) -> str:
+        return self._raw_task[PROJECT_ID_KEY]
+
+    @property
+    def timezone(self) -> str:
+        return self._raw_task[TIMEZONE_KEY]
+
+    @property
+    def column_id(self) -> str:
+        return self._raw_task.get(COLUMN_ID_KEY, "")
+
+    @property
+    def parent_id(self) -> str:
+        return self._raw_task.get(PARENT_ID_KEY, "")
+
+    @property
+    def title(self) -> str:
+        if self._title is None:
+            self._title = self._raw_task[TITLE_KEY].strip()
+        return self._title
+
+    @property
+    def tags(self) -> Tuple[str, ...]:
+        if self._tags is None:
+            self._tags = tuple(self._raw_task.get(TAGS_KEY, ()))
+        return self._tags
+
+    @property
+    def created_date(self) -> str:
+        if self._created_date is None:
+            self._created_date = get_task_date(self._raw_task.get(TIMEZONE_KEY, ""),
+                                               self._raw_task.get(CREATED_TIME_KEY, None))
+        return self._created_date
+
+    @property
+    def due_date(self) -> str:
+        if self._due_date is None:
+            self._due_date = get_task_date(self.timezone, self._raw_task.get(START_DATE_KEY, None))
+        return self._due_date
+
+    @property
+    def focus_time(self) -> float:
+        if self._focus_time is None:
+            self._focus_time = get_focus_time(self._raw_task)
+        return self._focus_time
+
+    def to_task(self) -> Task:
+        """Materializes the view into a Task."""
+        return Task(ticktick_id=self.ticktick_id,
+                    ticktick_etag=self.ticktick_etag,
+                    created_date=self.created_date,
+                    status=self.status,
+                    title=self.title,
+                    focus_time=self.focus_time,
+                    deleted=self.deleted,
+                    tags=self.tags,
+                    project_id=self.project_id,
+                    timezone=self.timezone,
+                    due_date=self.due_date,
+                    column_id=self.column_id,
+                    parent_id=self.parent_id)
+
+
+AnyTask: TypeAlias = Task | LazyTask
+
+
+def parse_lazy_ticktick_tasks(raw_tasks: list[dict] | dict, valid_ticktick_lists_ids: list | None = None) \
+        -> list[LazyTask]:
+    """Wraps raw tasks from Ticktick into LazyTask views, no field is decoded until it is read.
+
+    Args:
+        raw_tasks: Raw tasks from Ticktick.
+        valid_ticktick_lists_ids: Ticktick lists ids to filter tasks by. If it is set to None, all tasks are wrapped.
+
+    Returns:
+        Lazy tasks.
+    """
+    if not isinstance(raw_tasks, list):
+        raw_tasks = [raw_tasks]
+
+    if not valid_ticktick_lists_ids:
+        return [LazyTask(raw_task) for raw_task in raw_tasks]
+
+    valid_ticktick_lists = set(valid_ticktick_lists_ids)
+    return [LazyTask(raw_task) for raw_task in raw_tasks if raw_task[PROJECT_ID_KEY] in valid_ticktick_lists]
@@ -0,0 +1,191 @@
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import ContextManager, Protocol
+from urllib.parse import urlparse
+
+REQUEST_SECONDS = "tickthon_request_seconds"
+REQUEST_BYTES = "tickthon_request_bytes_total"
+RESPONSE_BYTES = "tickthon_response_bytes_total"
+JSON_DECODE_SECONDS = "tickthon_json_decode_seconds"
+PARSE_SECONDS = "tickthon_parse_seconds"
+TASKS_PARSED = "tickthon_tasks_parsed_total"
+TASKS_PARSED_PER_SECOND = "tickthon_tasks_parsed_per_second"
+SYNC_STAGE_SECONDS = "tickthon_sync_stage_seconds"
+CACHE_REQUESTS = "tickthon_cache_requests_total"
+REQUEST_RETRIES = "tickthon_request_retries_total"
+REQUEST_QUEUE_WAIT_SECONDS = "tickthon_request_queue_wait_seconds"
+
+_URL_PARAMETER_PATTERN = re.compile(r"/(?:[0-9a-f]{20,}|\d+)(?=/|$)")
+
+
+class MetricsSink(Protocol):
+    """Receiver of the metrics recorded by the clients.
+
+    Metrics are only recorded when a sink is set, a client without sink does not measure anything.
+    """
+
+    def increment(self, name: str, value: float = 1.0, labels: dict[str, str] | None = None):
+        """Adds a value to a counter."""
+
+    def observe(self, name: str, value: float, labels: dict[str, str] | None = None):
+        """Records an observation, like a duration, of a summary."""
+
+    def set_gauge(self, name: str, value: float, labels: dict[str, str] | None = None):
+        """Sets the current value of a gauge."""
+
+
+class _Timer:
+    """Context manager that observes the seconds its block took."""
+    __slots__ = ("metrics_sink", "name", "labels", "started_at")
+
+    def __init__(self, metrics_sink: MetricsSink, name: str, labels: dict[str, str] | None):
+        self.metrics_sink = metrics_sink
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.metrics_sink.observe(self.name, time.perf_counter() - self.started_at, self.labels)
+
+
+_DISABLED_TIMER = nullcontext()
+
+
+def timed(metrics_sink: MetricsSink | None, name: str, labels: dict[str, str] | None = None) -> ContextManager:
+    """Returns a context manager that observes the duration of its block, it does nothing if there is no sink."""
+    if metrics_sink is None:
+        return _DISABLED_TIMER
+    return _Timer(metrics_sink, name, labels)
+
+
+def get_endpoint(url: str) -> str:
+    """Returns the path of an URL with its ids and numbers replaced, so it can be used as a low cardinality label."""
+    return _URL_PARAMETER_PATTERN.sub("/{param}", urlparse(url).path)
+
+
+class LoggingMetricsSink:
+    """Metrics sink that logs every recorded metric."""
+
+    def __init__(self, logger: logging.Logger | None = None, level: int = logging.DEBUG):
+        """Initializes the sink.
+
+        Args:
+            logger: Logger of the metrics. If it is None, the tickthon.metrics logger is used.
+            level: Logging level of the metrics.
+        """
+        self.logger = logger if logger is not None else logging.getLogger(__name__)
+        self.level = level
+
+    def increment(self, name: str, value: float = 1.0, labels: dict[str, str] | None = None):
+        self._log("+", name, value, labels)
+
+    def observe(self, name: str, value: float, labels: dict[str, str] | None = None):
+        self._log("", name, value, labels)
+
+    def set_gauge(self, name: str, value: float, labels: dict[str, str] | None = None):
+        self._log("=", name, value, labels)
+
+    def _log(self, operator: str, name: str, value: float, labels: dict[str, str] | None):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s%s %s%g", name, _format_labels(labels), operator, value)
+
+
+class PrometheusFileSink:
+    """Metrics sink that aggregates the metrics and writes them to a file in the Prometheus text format.
+
+    Counters and gauges are written as they are, observations as summaries with a _sum and a _count. The file is
+    rewritten atomically, at most every `write_interval` seconds while metrics are recorded, and when `write` is
+    called. It can be exported with the textfile collector of the Prometheus node exporter.
+    """
+
+    def __init__(self, file_path: str | Path, write_interval: float = 10.0):
+        """Initializes the sink, the file is written on the first write.
+
+        Args:
+            file_path: Path of the metrics file.
+            write_interval: Minimum seconds between two automatic writes of the file.
+        """
+        self.file_path = Path(file_path)
+        self.write_interval = write_interval
+        self.counters: dict[str, dict[tuple, float]] = {}
+        self.summaries: dict[str, dict[tuple, list[float]]] = {}
+        self.gauges: dict[str, dict[tuple, float]] = {}
+        self._lock = threading.Lock()
+        self._written_at = time.monotonic()
+
+    def increment(self, name: str, value: float = 1.0, labels: dict[str, str] | None = None):
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            label_items = _get_label_items(labels)
+            series[label_items] = series.get(label_items, 0.0) + value
+        self._write_if_due()
+
+    def observe(self, name: str, value: float, labels: dict[str, str] | None = None):
+        with self._lock:
+            summary = self.summaries.setdefault(name, {}).setdefault(_get_label_items(labels), [0.0, 0])
+            summary[0] += value
+            summary[1] += 1
+        self._write_if_due()
+
+    def set_gauge(self, name: str, value: float, labels: dict[str, str] | None = None):
+        with self._lock:
+            self.gauges.setdefault(name, {})[_get_label_items(labels)] = value
+        self._write_if_due()
+
+    def to_text(self) -> str:
+        """Returns the metrics in the Prometheus text format."""
+        lines = []
+        with self._lock:
+            for name, counter in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{name}{_format_labels(dict(labels))} {_format_value(value)}"
+                             for labels, value in counter.items())
+            for name, gauge in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{name}{_format_labels(dict(labels))} {_format_value(value)}"
+                             for labels, value in gauge.items())
+            for name, summary in sorted(self.summaries.items()):
+                lines.append(f"# TYPE {name} summary")
+                for labels, (total, count) in summary.items():
+                    lines.append(f"{name}_sum{_format_labels(dict(labels))} {_format_value(total)}")
+                    lines.append(f"{name}_count{_format_labels(dict(labels))} {_format_value(count)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        """Writes the metrics file."""
+        self._written_at = time.monotonic()
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.file_path.with_name(f".{self.file_path.name}.{threading.get_ident()}.tmp")
+        temporary_path.write_text(self.to_text())
+        os.replace(temporary_path, self.file_path)
+
+    def _write_if_due(self):
+        if time.monotonic() - self._written_at >= self.write_interval:
+            self.write()
+
+
+def _format_value(value: float) -> str:
+    """Formats a sample value with all its digits, so large counters are not rounded."""
+    return repr(float(value))
+
+
+def _get_label_items(labels: dict[str, str] | None) -> tuple:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(labels: dict[str, str] | None) -> str:
+    if not labels:
+        return ""
+    formatted_labels = ",".join(f'{key}="{_escape_label_value(str(value))}"' for key, value in sorted(labels.items()))
+    return "{" + formatted_labels + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
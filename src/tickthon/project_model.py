@@ -0,0 +1,95 @@
+from attrs import define
+
+from .data.ticktick_group_parameters import TicktickGroupParameters as tgp
+from .data.ticktick_list_parameters import TicktickListParameters as tlp
+from .data.ticktick_tag_parameters import TicktickTagParameters as ttgp
+
+
+@define
+class Project:
+    """ Represents a Ticktick project (list).
+
+    Attributes:
+        ticktick_id: The ID of the project. For example: 6f8a2b3c4d5e1f09a7b6c8d9e0f2
+        name: The name of the project.
+        group_id: The ID of the folder (project group) of the project, empty if it is not in a folder.
+        sort_order: Position of the project in the sidebar.
+        closed: True if the project is archived.
+        kind: Kind of the project, "TASK" or "NOTE".
+        color: Color of the project in hex format, empty if it has no color.
+        view_mode: How the project is displayed, "list", "kanban" or "timeline".
+        ticktick_etag: The unique identifier of the version of the project.
+    """
+    ticktick_id: str
+    name: str
+    group_id: str = ""
+    sort_order: int = 0
+    closed: bool = False
+    kind: str = "TASK"
+    color: str = ""
+    view_mode: str = "list"
+    ticktick_etag: str = ""
+
+
+@define
+class ProjectGroup:
+    """ Represents a Ticktick folder of projects.
+
+    Attributes:
+        ticktick_id: The ID of the group.
+        name: The name of the group.
+        sort_order: Position of the group in the sidebar.
+        ticktick_etag: The unique identifier of the version of the group.
+    """
+    ticktick_id: str
+    name: str
+    sort_order: int = 0
+    ticktick_etag: str = ""
+
+
+@define
+class Tag:
+    """ Represents a Ticktick tag.
+
+    Attributes:
+        name: The name of the tag, in lowercase, as it is set in the tasks.
+        label: The name of the tag as it is displayed.
+        parent: The name of the parent tag, empty if it is not nested.
+        color: Color of the tag in hex format, empty if it has no color.
+        sort_order: Position of the tag in the sidebar.
+    """
+    name: str
+    label: str = ""
+    parent: str = ""
+    color: str = ""
+    sort_order: int = 0
+
+
+def dict_to_project(raw_project: dict) -> Project:
+    """Converts a raw project of the projectProfiles of the sync state into a Project."""
+    return Project(ticktick_id=raw_project[tlp.ID],
+                   name=raw_project.get(tlp.NAME) or "",
+                   group_id=raw_project.get(tlp.GROUP_ID) or "",
+                   sort_order=raw_project.get(tlp.SORT_ORDER) or 0,
+                   closed=bool(raw_project.get(tlp.CLOSED)),
+                   kind=raw_project.get(tlp.KIND) or "TASK",
+                   color=raw_project.get(tlp.COLOR) or "",
+                   view_mode=raw_project.get(tlp.VIEW_MODE) or "list",
+                   ticktick_etag=raw_project.get(tlp.ETAG) or "")
+
+
+def dict_to_project_group(raw_group: dict) -> ProjectGroup:
+    """Converts a raw group of the projectGroups of the sync state into a ProjectGroup."""
+    return ProjectGroup(ticktick_id=raw_group[tgp.ID],
+                        name=raw_group.get(tgp.NAME) or "",
+                        sort_order=raw_group.get(tgp.SORT_ORDER) or 0,
+                        ticktick_etag=raw_group.get(tgp.ETAG) or "")
+
+
+def dict_to_tag(raw_tag: dict) -> Tag:
+    """Converts a raw tag of the tags of the sync state into a Tag."""
+    return Tag(name=raw_tag[ttgp.NAME],
+               label=raw_tag.get(ttgp.LABEL) or raw_tag[ttgp.NAME],
+               parent=raw_tag.get(ttgp.PARENT) or "",
+               color=raw_tag.get(ttgp.COLOR) or "",
+               sort_order=raw_tag.get(ttgp.SORT_ORDER) or 0)
@@ -0,0 +1,121 @@
+from .data.ticktick_group_parameters import TicktickGroupParameters as tgp
+from .data.ticktick_list_parameters import TicktickListParameters as tlp
+from .data.ticktick_sync_parameters import TicktickSyncParameters as tsp
+from .data.ticktick_tag_parameters import TicktickTagParameters as ttgp
+from .project_model import Project, ProjectGroup, Tag, dict_to_project, dict_to_project_group, dict_to_tag
+
+_SECTION_KEYS = {tsp.PROJECT_PROFILES: tlp.ID, tsp.PROJECT_GROUPS: tgp.ID, tsp.TAGS: ttgp.NAME}
+
+
+class ProjectRegistry:
+    """Projects (lists), project groups (folders) and tags of the account, parsed from the sync state.
+
+    The registry is updated with the projectProfiles, projectGroups and tags of the same /batch/check responses that
+    sync the tasks. Projects are indexed by id, name and group, groups by id and name, and tags by name, so every
+    lookup is a dictionary hit. The revision counter increases whenever a raw entry changes.
+    """
+
+    def __init__(self) -> None:
+        self.revision = 0
+        self._raw_entries: dict[str, dict[str, dict]] = {section: {} for section in _SECTION_KEYS}
+        self._build_indexes()
+
+    @property
+    def raw_state(self) -> dict[str, list[dict]]:
+        """Raw projectProfiles, projectGroups and tags in the registry, in the format of the sync state."""
+        return {section: list(raw_entries.values()) for section, raw_entries in self._raw_entries.items()}
+
+    @property
+    def projects(self) -> list[Project]:
+        """Projects of the account, archived projects included."""
+        return list(self._projects.values())
+
+    @property
+    def groups(self) -> list[ProjectGroup]:
+        """Project groups (folders) of the account."""
+        return list(self._groups.values())
+
+    @property
+    def tags(self) -> list[Tag]:
+        """Tags of the account."""
+        return list(self._tags.values())
+
+    def get_project(self, project_id: str) -> Project | None:
+        """Returns the project with the given id, None if there is no such project."""
+        return self._projects.get(project_id)
+
+    def get_project_by_name(self, name: str) -> Project | None:
+        """Returns the project with the given name, None if there is no such project.
+
+        If several projects have the same name, the first one in the sidebar order is returned.
+        """
+        return self._projects_by_name.get(name)
+
+    def get_projects_by_group(self, group_id: str) -> list[Project]:
+        """Returns the projects of a group, the projects outside any group if the group id is empty."""
+        return list(self._projects_by_group.get(group_id, {}).values())
+
+    def get_group(self, group_id: str) -> ProjectGroup | None:
+        """Returns the group with the given id, None if there is no such group."""
+        return self._groups.get(group_id)
+
+    def get_group_by_name(self, name: str) -> ProjectGroup | None:
+        """Returns the group with the given name, None if there is no such group."""
+        return self._groups_by_name.get(name)
+
+    def get_tag(self, name: str) -> Tag | None:
+        """Returns the tag with the given name, it is case insensitive. None if there is no such tag."""
+        return self._tags.get(name.lower())
+
+    def update(self, sync_state: dict) -> bool:
+        """Updates the registry with the projects, groups and tags of a sync state.
+
+        Every section of the sync state is the complete list of that section, in full and incremental syncs alike, so
+        it replaces the entries of that section and deleted projects, groups and tags are removed. Sections that are
+        missing or null are not changed.
+
+        Args:
+            sync_state: Response of the /batch/check endpoint, or the raw_state of a registry.
+
+        Returns:
+            True if any entry changed.
+        """
+        has_changed = False
+        for section, key in _SECTION_KEYS.items():
+            raw_entries = sync_state.get(section)
+            if raw_entries is None:
+                continue
+
+            section_entries = {raw_entry[key]: raw_entry for raw_entry in raw_entries}
+            if section_entries != self._raw_entries[section]:
+                self._raw_entries[section] = section_entries
+                has_changed = True
+
+        if has_changed:
+            self.revision += 1
+            self._build_indexes()
+        return has_changed
+
+    def _build_indexes(self) -> None:
+        """Parses the raw entries and rebuilds the indexes, registries are small so they are rebuilt as a whole."""
+        projects = sorted((dict_to_project(raw_project)
+                           for raw_project in self._raw_entries[tsp.PROJECT_PROFILES].values()),
+                          key=lambda project: project.sort_order)
+        self._projects: dict[str, Project] = {project.ticktick_id: project for project in projects}
+        self._projects_by_name: dict[str, Project] = {}
+        self._projects_by_group: dict[str, dict[str, Project]] = {}
+        for project in projects:
+            self._projects_by_name.setdefault(project.name, project)
+            self._projects_by_group.setdefault(project.group_id, {})[project.ticktick_id] = project
+
+        groups = sorted((dict_to_project_group(raw_group)
+                         for raw_group in self._raw_entries[tsp.PROJECT_GROUPS].values()),
+                        key=lambda group: group.sort_order)
+        self._groups: dict[str, ProjectGroup] = {group.ticktick_id: group for group in groups}
+        self._groups_by_name: dict[str, ProjectGroup] = {}
+        for group in groups:
+            self._groups_by_name.setdefault(group.name, group)
+
+        tags = sorted((dict_to_tag(raw_tag) for raw_tag in self._raw_entries[tsp.TAGS].values()),
+                      key=lambda tag: tag.sort_order)
+        self._tags: dict[str, Tag] = {tag.name.lower(): tag for tag in tags}
@@ -0,0 +1,27 @@
+from attrs import define, field
+
+from .lazy_task import AnyTask
+
+
+@define
+class SyncDiff:
+    """ Changes of the parsed active tasks made by a sync.
+
+    Tasks are compared by ticktick_id and ticktick_etag, a task whose raw task did not change keeps the same object
+    between syncs.
+
+    Attributes:
+        added: Tasks that were not in the active tasks before the sync.
+        updated: New version of the tasks that changed in the sync.
+        removed: Last version of the tasks that left the active tasks, because they were completed, abandoned, deleted
+                 or moved to a list that is not parsed.
+        checkpoint: Sync checkpoint after the sync.
+    """
+    added: list[AnyTask] = field(factory=list)
+    updated: list[AnyTask] = field(factory=list)
+    removed: list[AnyTask] = field(factory=list)
+    checkpoint: int = 0
+
+    def __bool__(self) -> bool:
+        """True if the sync changed any task."""
+        return bool(self.added or self.updated or self.removed)
@@ -0,0 +1,132 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterator, Protocol
+
+from attrs import evolve, field, frozen
+
+from .data.task_types import TaskType
+from .lazy_task import AnyTask
+from ._task_utils import PROJECT_ID_KEY, TAGS_KEY
+
+if TYPE_CHECKING:
+    from .ticktick_client import TicktickClient
+
+
+class TaskIndex(Protocol):
+    """Indexed active tasks a query selects from, the TaskStore of the client or a TaskSnapshot."""
+
+    @property
+    def tasks(self) -> list[AnyTask]:
+        """All the parsed active tasks."""
+
+    def get_tasks_by_projects(self, project_ids: list[str]) -> list[AnyTask]:
+        """Returns the tasks that belong to any of the given projects (lists)."""
+
+    def get_tasks_by_tag(self, tag: str) -> list[AnyTask]:
+        """Returns the tasks that have the given tag."""
+
+    def get_tasks_due_between(self, start_date: str, end_date: str) -> list[AnyTask]:
+        """Returns the tasks due between two dates in format YYYY-MM-DD, both included."""
+
+
+@frozen
+class TaskQuery:
+    """ Composable query of Ticktick tasks, built with `TicktickClient.query()`.
+
+    Every method returns a new query with one more condition, the conditions are combined with AND. The query is run
+    by `execute()` or by iterating over it:
+
+        tasks = client.query().in_lists(inbox_id).with_tags("work").due_between("2024-01-01", "2024-01-31").execute()
+
+    Active tasks are selected from the smallest index that matches the query, instead of filtering all the active
+    tasks. Completed tasks are requested page by page for the closed date window only, and their raw tasks are
+    filtered by list and tags before being parsed. Queries that can not match any parsed task do not request anything.
+
+    Attributes:
+        list_ids: Ids of the lists the tasks belong to any of, None for any list.
+        tags: Tags the tasks have all of.
+        due_start: First due date of the tasks in format YYYY-MM-DD, None if the due date is not filtered.
+        due_end: Last due date of the tasks in format YYYY-MM-DD, None if the due date is not filtered.
+        task_type: Type of the tasks, active, completed or all.
+        closed_from: Start of the window the completed tasks were completed in, None for the default window.
+        closed_to: End of the window the completed tasks were completed in, None for now.
+    """
+    client: "TicktickClient | None" = field(default=None, eq=False, repr=False)
+    list_ids: tuple[str, ...] | None = None
+    tags: tuple[str, ...] = ()
+    due_start: str | None = None
+    due_end: str | None = None
+    task_type: TaskType = TaskType.ACTIVE
+    closed_from: datetime | None = None
+    closed_to: datetime | None = None
+
+    def in_lists(self, *list_ids: str) -> "TaskQuery":
+        """Returns the query restricted to the tasks of any of the given lists."""
+        return evolve(self, list_ids=tuple(dict.fromkeys(list_ids)))
+
+    def with_tags(self, *tags: str) -> "TaskQuery":
+        """Returns the query restricted to the tasks that have all the given tags."""
+        return evolve(self, tags=tuple(dict.fromkeys(self.tags + tags)))
+
+    def due_between(self, start_date: str, end_date: str) -> "TaskQuery":
+        """Returns the query restricted to the tasks due between two dates in format YYYY-MM-DD, both included."""
+        return evolve(self, due_start=start_date, due_end=end_date)
+
+    def status(self, task_type: TaskType) -> "TaskQuery":
+        """Returns the query of the active, completed or all tasks."""
+        return evolve(self, task_type=task_type)
+
+    def closed_between(self, from_date: datetime, to_date: datetime) -> "TaskQuery":
+        """Returns the query restricted to the completed tasks completed between two dates.
+
+        Args:
+            from_date: Start of the window, naive dates are considered UTC.
+            to_date: End of the window, naive dates are considered UTC.
+        """
+        return evolve(self, closed_from=from_date, closed_to=to_date)
+
+    def execute(self) -> list[AnyTask]:
+        """Runs the query.
+
+        Returns:
+            The active tasks that match the query, followed by the completed ones.
+        """
+        if self.client is None:
+            raise ValueError("The query is not bound to a client, create it with TicktickClient.query()")
+        return self.client.get_tasks(self)
+
+    def __iter__(self) -> Iterator[AnyTask]:
+        return iter(self.execute())
+
+    def can_match(self, valid_list_ids: list[str]) -> bool:
+        """Checks if any task of the given lists, the only lists whose tasks are parsed, can match the query."""
+        if self.list_ids is not None and not set(self.list_ids).intersection(valid_list_ids):
+            return False
+        return self.due_start is None or self.due_end is None or self.due_start <= self.due_end
+
+    def select_active_tasks(self, task_index: TaskIndex) -> list[AnyTask]:
+        """Selects the active tasks that match the query, starting from the smallest index that matches it."""
+        candidate_selections = []
+        if self.list_ids is not None:
+            candidate_selections.append(task_index.get_tasks_by_projects(list(self.list_ids)))
+        candidate_selections.extend(task_index.get_tasks_by_tag(tag) for tag in self.tags)
+        if self.due_start is not None and self.due_end is not None and not candidate_selections:
+            candidate_selections.append(task_index.get_tasks_due_between(self.due_start, self.due_end))
+
+        candidates = min(candidate_selections, key=len) if candidate_selections else task_index.tasks
+        return [task for task in candidates if self.matches(task)]
+
+    def matches(self, task: AnyTask) -> bool:
+        """Checks if a parsed task matches the list, tag and due date conditions of the query."""
+        if self.list_ids is not None and task.project_id not in self.list_ids:
+            return False
+        if self.tags and not set(self.tags).issubset(task.tags):
+            return False
+        if self.due_start is not None and self.due_end is not None:
+            return bool(task.due_date) and self.due_start <= task.due_date[:10] <= self.due_end
+        return True
+
+    def matches_raw(self, raw_task: dict) -> bool:
+        """Checks if a raw task matches the list and tag conditions of the query, so it is worth parsing."""
+        if self.list_ids is not None and raw_task.get(PROJECT_ID_KEY) not in self.list_ids:
+            return False
+        return not self.tags or set(self.tags).issubset(raw_task.get(TAGS_KEY) or ())
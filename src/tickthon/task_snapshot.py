@@ -0,0 +1,63 @@
+import time
+from types import MappingProxyType
+from typing import Mapping
+
+from attrs import evolve, field, frozen
+
+from .lazy_task import AnyTask
+
+
+@frozen
+class TaskSnapshot:
+    """ Immutable view of the active tasks after a sync.
+
+    A new snapshot is built after every sync that changes the active tasks and swapped in as a whole, so it can be
+    read from any thread without locks while the client keeps syncing.
+
+    Attributes:
+        all_active_tasks: All the parsed active tasks, weight measurements included.
+        active_tasks: Active tasks that are not weight measurements.
+        weight_measurements: Tasks of the weight measurements list.
+        tasks_by_project: Parsed active tasks by project (list) id.
+        tasks_by_tag: Parsed active tasks by tag.
+        checkpoint: Sync checkpoint of the snapshot.
+        synced_at: Monotonic time of the last sync that confirmed the snapshot, None if it was loaded from the sync
+                   cache and no sync confirmed it yet.
+    """
+    all_active_tasks: tuple[AnyTask, ...] = ()
+    active_tasks: tuple[AnyTask, ...] = ()
+    weight_measurements: tuple[AnyTask, ...] = ()
+    tasks_by_project: Mapping[str, tuple[AnyTask, ...]] = field(factory=lambda: MappingProxyType({}))
+    tasks_by_tag: Mapping[str, tuple[AnyTask, ...]] = field(factory=lambda: MappingProxyType({}))
+    checkpoint: int = 0
+    synced_at: float | None = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the last sync that confirmed the snapshot, infinite if no sync confirmed it."""
+        if self.synced_at is None:
+            return float("inf")
+        return time.monotonic() - self.synced_at
+
+    @property
+    def tasks(self) -> list[AnyTask]:
+        """All the parsed active tasks, weight measurements included."""
+        return list(self.all_active_tasks)
+
+    def get_tasks_by_projects(self, project_ids: list[str]) -> list[AnyTask]:
+        """Returns the active tasks that belong to any of the given projects (lists)."""
+        return [task for project_id in dict.fromkeys(project_ids) for task in self.tasks_by_project.get(project_id, ())]
+
+    def get_tasks_by_tag(self, tag: str) -> list[AnyTask]:
+        """Returns the active tasks that have the given tag."""
+        return list(self.tasks_by_tag.get(tag, ()))
+
+    def get_tasks_due_between(self, start_date: str, end_date: str) -> list[AnyTask]:
+        """Returns the active tasks due between two dates in format YYYY-MM-DD, both included, sorted by due day."""
+        due_tasks = [task for task in self.all_active_tasks
+                     if task.due_date and start_date <= task.due_date[:10] <= end_date]
+        return sorted(due_tasks, key=lambda task: task.due_date[:10])
+
+    def confirmed(self, checkpoint: int) -> "TaskSnapshot":
+        """Returns the same snapshot confirmed by a sync that did not change the active tasks."""
+        return evolve(self, checkpoint=checkpoint, synced_at=time.monotonic())
@@ -0,0 +1,79 @@
+from array import array
+from sys import intern
+from typing import Iterable, Iterator, Tuple
+
+from .lazy_task import AnyTask
+from .task_model import Task
+from ._task_utils import intern_tags
+
+
+class TaskTable:
+    """ Columnar, memory-compact collection of tasks.
+
+    Every Task attribute is stored in its own column: numeric attributes in typed arrays and string attributes in
+    lists of interned strings, so repeated values such as project ids, timezones and tags are stored once. Rows are
+    converted back into Task objects on demand.
+    """
+
+    def __init__(self, tasks: Iterable[AnyTask] = ()):
+        self.ticktick_ids: list[str] = []
+        self.ticktick_etags: list[str] = []
+        self.titles: list[str] = []
+        self.created_dates: list[str] = []
+        self.due_dates: list[str] = []
+        self.project_ids: list[str] = []
+        self.timezones: list[str] = []
+        self.column_ids: list[str] = []
+        self.parent_ids: list[str] = []
+        self.tags: list[Tuple[str, ...]] = []
+        self.statuses = array("b")
+        self.deleted = array("b")
+        self.focus_times = array("d")
+
+        self.extend(tasks)
+
+    def __len__(self) -> int:
+        return len(self.ticktick_ids)
+
+    def __getitem__(self, index: int) -> Task:
+        return Task(ticktick_id=self.ticktick_ids[index],
+                    ticktick_etag=self.ticktick_etags[index],
+                    created_date=self.created_dates[index],
+                    status=self.statuses[index],
+                    title=self.titles[index],
+                    focus_time=self.focus_times[index],
+                    deleted=self.deleted[index],
+                    tags=self.tags[index],
+                    project_id=self.project_ids[index],
+                    timezone=self.timezones[index],
+                    due_date=self.due_dates[index],
+                    column_id=self.column_ids[index],
+                    parent_id=self.parent_ids[index])
+
+    def __iter__(self) -> Iterator[Task]:
+        return (self[index] for index in range(len(self)))
+
+    def append(self, task: AnyTask):
+        """Appends a task as a new row of the table."""
+        self.ticktick_ids.append(intern(task.ticktick_id))
+        self.ticktick_etags.append(task.ticktick_etag)
+        self.titles.append(task.title)
+        self.created_dates.append(task.created_date)
+        self.due_dates.append(task.due_date)
+        self.project_ids.append(intern(task.project_id or ""))
+        self.timezones.append(intern(task.timezone or ""))
+        self.column_ids.append(intern(task.column_id or ""))
+        self.parent_ids.append(intern(task.parent_id or ""))
+        self.tags.append(intern_tags(task.tags))
+        self.statuses.append(task.status)
+        self.deleted.append(task.deleted)
+        self.focus_times.append(task.focus_time)
+
+    def extend(self, tasks: Iterable[AnyTask]):
+        """Appends several tasks as new rows of the table."""
+        for task in tasks:
+            self.append(task)
+
+    def to_tasks(self) -> list[Task]:
+        """Converts all the rows of the table into Task objects."""
+        return list(self)
@@ -0,0 +1,253 @@
+import logging
+import secrets
+import threading
+from typing import Callable, Collection
+
+from attrs import define
+
+from ._ticktick_api import TicktickAPI
+from .data.ticktick_list_parameters import TicktickListParameters as tlp
+from .data.ticktick_payloads import TicktickPayloads
+from .lazy_task import AnyTask
+
+
+@define
+class TaskWriteResult:
+    """ Result of a task mutation sent by a TaskWriteBatcher.
+
+    Attributes:
+        ticktick_id: The ID of the mutated task, for created tasks it is the id generated by the batcher.
+        etag: The etag of the task after the mutation, empty if the mutation has no etag or was not sent yet.
+        error: The error returned by Ticktick for the task, or the exception raised by the request that was meant to
+               send the mutation. None if there was no error.
+        sent: True once the mutation has been sent to Ticktick.
+    """
+    ticktick_id: str
+    etag: str = ""
+    error: object = None
+    sent: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True if the mutation was sent and Ticktick did not return an error for it."""
+        return self.sent and self.error is None
+
+
+class TaskWriteBatcher:
+    """Queues task mutations and sends them to Ticktick in as few batch requests as possible.
+
+    Creations, updates and deletions are sent in a single /batch/task request and moves in a single
+    /batch/taskProject request. Updates of the same task are merged into one, and updates of a task that is deleted are
+    dropped since the task is gone. The queue is flushed when the batcher is
+    used as a context manager and exits, when it reaches `max_size` mutations, `max_delay` seconds after the first
+    queued mutation or when `flush` is called.
+
+    Every flushed mutation has its result in `results`. If a request fails, the results of the mutations it did not
+    send keep `sent=False` and get the exception as their error, so failures of flushes triggered by the timer are
+    not lost.
+    """
+
+    def __init__(self, ticktick_api: TicktickAPI, crud_task_url: str, move_task_url: str,
+                 max_size: int | None = None, max_delay: float | None = None,
+                 get_raw_task: Callable[[str], dict | None] | None = None):
+        """Initializes an empty batcher.
+
+        Args:
+            ticktick_api: Ticktick API client.
+            crud_task_url: URL of the batch task endpoint.
+            move_task_url: URL of the batch move task endpoint.
+            max_size: Number of queued mutations that triggers a flush. If it is None, size does not trigger flushes.
+            max_delay: Seconds after the first queued mutation that trigger a flush. If it is None, time does not
+                       trigger flushes.
+            get_raw_task: Function that returns the raw task of an id, None if it is unknown. Tag replacements of
+                          known tasks send the whole raw task, like `TicktickClient.replace_task_tags`.
+        """
+        self.ticktick_api = ticktick_api
+        self.crud_task_url = crud_task_url
+        self.move_task_url = move_task_url
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.get_raw_task = get_raw_task
+        self.results: list[TaskWriteResult] = []
+
+        self._lock = threading.RLock()
+        self._timer: threading.Timer | None = None
+        self._added: dict[str, tuple[dict, TaskWriteResult]] = {}
+        self._updated: dict[str, tuple[dict, list[TaskWriteResult]]] = {}
+        self._deleted: dict[str, tuple[dict, list[TaskWriteResult]]] = {}
+        self._moved: list[tuple[dict, TaskWriteResult]] = []
+
+    def __enter__(self) -> "TaskWriteBatcher":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        else:
+            self._cancel_timer()
+
+    def __len__(self) -> int:
+        return len(self._added) + len(self._updated) + len(self._deleted) + len(self._moved)
+
+    def create_task(self, task: AnyTask, column_id: str | None = None) -> TaskWriteResult:
+        """Queues the creation of a task, the task gets a generated id.
+
+        Args:
+            task: Task to create.
+            column_id: Column id to create the task in. If it is set to None, the task is created in the default column.
+
+        Returns:
+            The result of the creation, filled when the queue is flushed.
+        """
+        task_id = secrets.token_hex(12)
+        result = TaskWriteResult(task_id)
+        with self._lock:
+            self._added[task_id] = (TicktickPayloads.create_task_item(task, column_id, task_id), result)
+        return self._queued(result)
+
+    def complete_task(self, task: AnyTask) -> TaskWriteResult:
+        """Queues the completion of a task.
+
+        Returns:
+            The result of the completion, filled when the queue is flushed.
+        """
+        return self._queue_update(TicktickPayloads.complete_task_item(task))
+
+    def replace_task_tags(self, task: AnyTask, tags: Collection[str]) -> TaskWriteResult:
+        """Queues the replacement of the tags of a task.
+
+        The update is the raw task with the new tags, as in `TicktickClient.replace_task_tags`. If the raw task is
+        unknown, only the id, project and tags of the task are sent.
+
+        Returns:
+            The result of the update, filled when the queue is flushed.
+        """
+        raw_task = self.get_raw_task(task.ticktick_id) if self.get_raw_task is not None else None
+        if raw_task is None:
+            return self._queue_update(TicktickPayloads.update_task_tags_item(task, list(tags)))
+        return self._queue_update({tlp.ID: task.ticktick_id, tlp.TAGS: list(tags)}, raw_task)
+
+    def delete_task(self, task: AnyTask) -> TaskWriteResult:
+        """Queues the deletion of a task, the queued updates of the task are dropped.
+
+        Returns:
+            The result of the deletion, filled when the queue is flushed. The results of the dropped updates are
+            filled with it.
+        """
+        result = TaskWriteResult(task.ticktick_id)
+        with self._lock:
+            _, update_results = self._updated.pop(task.ticktick_id, ({}, []))
+            _, delete_results = self._deleted.get(task.ticktick_id, ({}, []))
+            self._deleted[task.ticktick_id] = (TicktickPayloads.delete_task_item(task),
+                                               delete_results + update_results + [result])
+        return self._queued(result)
+
+    def move_task_to_project(self, task: AnyTask, project_id: str) -> TaskWriteResult:
+        """Queues the move of a task to another project (list).
+
+        Returns:
+            The result of the move, filled when the queue is flushed.
+        """
+        result = TaskWriteResult(task.ticktick_id)
+        with self._lock:
+            self._moved.append((TicktickPayloads.move_task_to_project_item(task, project_id), result))
+        return self._queued(result)
+
+    def flush(self) -> list[TaskWriteResult]:
+        """Sends the queued mutations to Ticktick.
+
+        Returns:
+            The results of the flushed mutations.
+
+        Raises:
+            Exception: The error of a request that failed, it is also set on the results of the unsent mutations.
+        """
+        with self._lock:
+            self._cancel_timer()
+            added, updated, deleted, moved = self._added, self._updated, self._deleted, self._moved
+            self._added, self._updated, self._deleted, self._moved = {}, {}, {}, []
+
+            results = ([result for _, result in added.values()]
+                       + [result for _, results in updated.values() for result in results]
+                       + [result for _, results in deleted.values() for result in results]
+                       + [result for _, result in moved])
+            self.results.extend(results)
+            try:
+                self._send_task_batch(added, updated, deleted)
+                self._send_moves(moved)
+            except Exception as error:
+                for result in results:
+                    if not result.sent:
+                        result.error = error
+                raise
+            return results
+
+    def _queue_update(self, update_item: dict, raw_task: dict | None = None) -> TaskWriteResult:
+        """Queues an update, merged with the queued update of the same task.
+
+        Args:
+            update_item: Fields to update.
+            raw_task: Raw task the update is based on, the fields of the queued update take precedence over it.
+        """
+        task_id = update_item["id"]
+        result = TaskWriteResult(task_id)
+        with self._lock:
+            if task_id in self._deleted:
+                self._deleted[task_id][1].append(result)
+                return result
+
+            queued_item, queued_results = self._updated.get(task_id, ({}, []))
+            self._updated[task_id] = ({**(raw_task or {}), **queued_item, **update_item}, queued_results + [result])
+        return self._queued(result)
+
+    def _queued(self, result: TaskWriteResult) -> TaskWriteResult:
+        """Starts the flush timer or flushes the queue if it is full."""
+        with self._lock:
+            if self.max_size is not None and len(self) >= self.max_size:
+                self.flush()
+            elif self.max_delay is not None and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        return result
+
+    def _flush_on_timer(self):
+        """Flushes the queue from the timer thread, an error is already set on the results so it is only logged."""
+        try:
+            self.flush()
+        except Exception:
+            logging.exception("Timed flush of the task write batcher failed")
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _send_task_batch(self, added: dict[str, tuple[dict, TaskWriteResult]],
+                         updated: dict[str, tuple[dict, list[TaskWriteResult]]],
+                         deleted: dict[str, tuple[dict, list[TaskWriteResult]]]):
+        if not (added or updated or deleted):
+            return
+
+        payload = TicktickPayloads.batch_tasks(add=[item for item, _ in added.values()],
+                                               update=[item for item, _ in updated.values()],
+                                               delete=[item for item, _ in deleted.values()])
+        response = self.ticktick_api.post_json(self.crud_task_url, payload)
+        id2etag = response.get("id2etag") or {}
+        id2error = response.get("id2error") or {}
+
+        results = ([result for _, result in added.values()]
+                   + [result for _, results in updated.values() for result in results]
+                   + [result for _, results in deleted.values() for result in results])
+        for result in results:
+            result.etag = id2etag.get(result.ticktick_id, "")
+            result.error = id2error.get(result.ticktick_id)
+            result.sent = True
+
+    def _send_moves(self, moved: list[tuple[dict, TaskWriteResult]]):
+        if not moved:
+            return
+
+        self.ticktick_api.post(self.move_task_url, [item for item, _ in moved])
+        for _, result in moved:
+            result.sent = True
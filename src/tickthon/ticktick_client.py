@@ -1,14 +1,40 @@
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Iterator
 
 from tickthon.data.task_types import TaskType
 
 
+from ._request_scheduler import RequestScheduler
+from ._response_cache import ResponseCache
 from ._ticktick_api import TicktickAPI
 from .data.ticktick_payloads import TicktickPayloads
 from .data.ticktick_ids import TicktickListIds
 from .data.ticktick_list_parameters import TicktickListParameters as tlp
+from .data.ticktick_sync_parameters import TicktickSyncParameters as tsp
+from .data.ticktick_habit_parameters import TicktickHabitCheckinParameters as thcp
+from .focus_analytics import FocusSessions
+from .habit_checkin_store import HabitCheckinStore, to_stamp
+from .habit_model import Habit, HabitCheckin, dict_to_habit, dict_to_habit_checkin
+from .lazy_task import AnyTask, parse_lazy_ticktick_tasks
+from .metrics import CACHE_REQUESTS, PARSE_SECONDS, SYNC_STAGE_SECONDS, TASKS_PARSED, TASKS_PARSED_PER_SECOND, \
+    MetricsSink, timed
 from .task_model import Task
+from .project_registry import ProjectRegistry
+from .task_query import TaskQuery
+from .task_snapshot import TaskSnapshot
+from .sync_diff import SyncDiff
+from .task_write_batcher import TaskWriteBatcher, TaskWriteResult
+from .weight_series import WeightSeries
+from ._sync_cache import SyncCache
+from ._background_sync import BackgroundSync
+from ._focus_time import FocusTimeCache, get_durations_by_day, iter_days
+from ._task_history import iter_closed_raw_tasks, iter_trash_raw_tasks
+from ._task_store import TaskStore
 from ._task_utils import _is_task_a_weight_measurement, _is_task_active, dict_to_task, parse_ticktick_tasks
 
 current_date = datetime.now(timezone.utc)
@@ -19,16 +45,26 @@ date_tomorrow = (current_date + timedelta(days=1)).strftime("%Y-%m-%d")
 class TicktickClient:
     """Ticktick client."""
     BASE_URL = TicktickAPI.BASE_URL
-    GET_STATE_URL = BASE_URL + "/batch/check/0"
+    SYNC_STATE_URL = BASE_URL + "/batch/check"
+    GET_STATE_URL = SYNC_STATE_URL + "/0"
     CRUD_TASK_URL = BASE_URL + "/batch/task"
     MOVE_TASK_URL = BASE_URL + "/batch/taskProject"
     TASK_URL = BASE_URL + "/task"
+    HABITS_URL = BASE_URL + "/habits"
     HABIT_CHECKINS_URL = BASE_URL + "/habitCheckins/query"
+    HABIT_CHECKINS_BATCH_SIZE = 50
+    HABIT_CHECKINS_LOOKBACK_DAYS = 7
+    HABIT_HISTORY_DAYS = 365
     COMPLETED_TASKS_URL = BASE_URL + f"/project/all/closed?from={date_two_weeks_ago}%2005:00:00&to={date_tomorrow}" \
                                      f"%2004:59:00&status=Completed&limit=500"
     ABANDONED_TASKS_URL = BASE_URL + f"/project/all/closed?from={date_two_weeks_ago}%2005:00:00&to={date_tomorrow}" \
                                      f"%2004:59:00&status=Abandoned&limit=500"
     DELETED_TASKS_URL = BASE_URL + "/project/all/trash/pagination?start=0&limit=500"
+    CLOSED_TASKS_URL = BASE_URL + "/project/all/closed"
+    TRASH_TASKS_URL = BASE_URL + "/project/all/trash/pagination"
+    HISTORY_PAGE_SIZE = 500
+    COMPLETED_TASKS_WINDOW = timedelta(days=14)
+    FOCUS_TIME_MAX_WORKERS = 8
     GENERAL_FOCUS_TIME_URL = BASE_URL + "/pomodoros/statistics/heatmap"
     ACTIVE_FOCUS_TIME_URL = BASE_URL + "/pomodoros/statistics/dist"
 
@@ -37,36 +73,263 @@ class TicktickClient:
                  password: str,
                  ticktick_list_ids: TicktickListIds,
                  api_token: str | None = None,
-                 cookies: dict[str, str] | None = None):
-        self.ticktick_api = TicktickAPI(username, password, api_token, cookies)
+                 cookies: dict[str, str] | None = None,
+                 incremental_sync: bool = False,
+                 lazy_parsing: bool = False,
+                 focus_time_cache_path: str | Path | None = None,
+                 sync_cache_path: str | Path | None = None,
+                 defer_initial_sync: bool = False,
+                 response_cache: ResponseCache | None = None,
+                 request_scheduler: RequestScheduler | None = None,
+                 on_token_refresh: Callable[[str, dict[str, str]], None] | None = None,
+                 metrics_sink: MetricsSink | None = None,
+                 background_sync_interval: float | None = None):
+        """Initializes the client and syncs the active tasks.
+
+        Args:
+            username: Ticktick username.
+            password: Ticktick password.
+            ticktick_list_ids: Ticktick lists ids whose tasks are parsed.
+            api_token: Ticktick api token, it is not validated, the client logs in again when it is rejected.
+            cookies: Ticktick cookies.
+            incremental_sync: If True, after the first full sync only the changes since the last sync checkpoint are
+                              requested to Ticktick and merged into the synced tasks.
+            lazy_parsing: If True, tasks are returned as LazyTask views that decode their fields on first access,
+                          instead of being fully parsed into Task objects.
+            focus_time_cache_path: Path of a JSON file where the focus time statistics of closed days are cached, so
+                                   the focus time ranges never request them again. If it is None, nothing is cached.
+            sync_cache_path: Path of a SQLite file where the last sync of the active tasks is saved. The saved tasks
+                             are loaded at initialization and the following syncs are incremental. If it is None,
+                             nothing is saved.
+            defer_initial_sync: If True, the active tasks are not synced at initialization but on the first read.
+            response_cache: Cache of the validators of the API responses, used to skip decoding the sync state when it
+                            did not change. If it is None, a default ResponseCache is used.
+            request_scheduler: Scheduler that rate limits and retries the API requests. If it is None, a default
+                               RequestScheduler is used.
+            on_token_refresh: Function called with the new token and cookies after the client logs in again, so they
+                              can be persisted.
+            metrics_sink: Sink of the request, JSON decoding, parsing, sync and cache metrics. If it is None, nothing
+                          is measured.
+            background_sync_interval: If it is set, the active tasks are synced in a background thread every given
+                                      seconds, and the getters of the active tasks read the last snapshot instead of
+                                      syncing. If it is None, the getters sync on every call.
+        """
+        self.ticktick_api = TicktickAPI(username, password, api_token, cookies, response_cache, request_scheduler,
+                                        on_token_refresh, metrics_sink)
         self.ticktick_data: dict = {}
         self.ticktick_list_ids: TicktickListIds = ticktick_list_ids
+        self.incremental_sync = incremental_sync or sync_cache_path is not None
+        self.lazy_parsing = lazy_parsing
+        self._checkpoint = 0
+        self._task_store = TaskStore(lazy_parsing)
+        self.project_registry = ProjectRegistry()
+        self.weight_series = WeightSeries()
+        self._weight_series = WeightSeries()
+        self.habits: list[Habit] = []
+        self.habit_checkins = HabitCheckinStore()
+        self._habit_lock = threading.Lock()
+        self._sync_lock = threading.RLock()
+        self._subscribers: list[Callable[[SyncDiff], None]] = []
+        self._snapshot: TaskSnapshot | None = None
+        self._background_sync: BackgroundSync | None = None
+        self._focus_time_cache = FocusTimeCache(focus_time_cache_path) if focus_time_cache_path else None
+        self._sync_cache = SyncCache(sync_cache_path) if sync_cache_path else None
         self._cached_raw_active_tasks: list[dict] = []
-        self.all_active_tasks: list[Task] = []
-        self.active_tasks: list[Task] = []
-        self.completed_tasks: list[Task] = []
-        self.deleted_tasks: list[Task] = []
-        self.abandoned_tasks: list[Task] = []
-        self.weight_measurements: list[Task] = []
+        self.all_active_tasks: list[AnyTask] = []
+        self.active_tasks: list[AnyTask] = []
+        self.completed_tasks: list[AnyTask] = []
+        self.deleted_tasks: list[AnyTask] = []
+        self.abandoned_tasks: list[AnyTask] = []
+        self.weight_measurements: list[AnyTask] = []
+
+        if self._sync_cache is not None:
+            self._load_sync_cache(self._sync_cache)
+            self.habit_checkins.after_stamps, raw_checkins = self._sync_cache.load_habit_checkins()
+            self.habit_checkins.update(raw_checkins)
+
+        if not defer_initial_sync:
+            self._get_all_tasks()
 
-        self._get_all_tasks()
+        if background_sync_interval is not None:
+            self.start_background_sync(background_sync_interval)
+
+    def _load_sync_cache(self, sync_cache: SyncCache):
+        """Loads the active tasks and the checkpoint of the last saved sync."""
+        checkpoint, raw_active_tasks = sync_cache.load()
+        if not checkpoint:
+            return
+
+        self._checkpoint = checkpoint
+        self.project_registry.update(sync_cache.load_registry())
+        self._update_weight_series(self._task_store.replace_all(raw_active_tasks, self.ticktick_list_ids.get_ids()))
+        self._task_store.pop_raw_changes()  # the loaded tasks are already in the cache
+        self._rebuild_active_tasks(synced_at=None)
+
+    def _get_ticktick_data(self, checkpoint: int = 0) -> bool:
+        """Gets raw data from Ticktick.
+
+        Args:
+            checkpoint: Sync checkpoint of a previous response, only the changes after it are returned. If it is set to
+                        0, the whole state of the account is returned.
+
+        Returns:
+            True if the data changed since the last request, False if it did not and it was not decoded again.
+        """
+        response = self.ticktick_api.get_if_changed(f"{self.SYNC_STATE_URL}/{checkpoint}")
+        if response is None:
+            return False
+
+        self.ticktick_data = self.ticktick_api.decode_json(response)
+        return True
+
+    def _parse_tasks(self, raw_tasks: list[dict]) -> list[AnyTask]:
+        """Parses raw tasks of the valid lists, into LazyTask views if lazy parsing is enabled."""
+        started_at = time.perf_counter()
+        tasks: list[AnyTask]
+        if self.lazy_parsing:
+            tasks = list(parse_lazy_ticktick_tasks(raw_tasks, self.ticktick_list_ids.get_ids()))
+        else:
+            tasks = list(parse_ticktick_tasks(raw_tasks, self.ticktick_list_ids.get_ids()))
+
+        self._record_parse("history", len(raw_tasks), started_at)
+        return tasks
+
+    def _record_parse(self, source: str, task_count: int, started_at: float):
+        """Records the time spent parsing raw tasks and the parsed tasks per second."""
+        metrics_sink = self.ticktick_api.metrics_sink
+        if metrics_sink is None:
+            return
+
+        seconds = time.perf_counter() - started_at
+        labels = {"source": source, "mode": "lazy" if self.lazy_parsing else "eager"}
+        metrics_sink.observe(PARSE_SECONDS, seconds, labels)
+        metrics_sink.increment(TASKS_PARSED, task_count, labels)
+        if seconds > 0:
+            metrics_sink.set_gauge(TASKS_PARSED_PER_SECOND, task_count / seconds, labels)
+
+    def _sync_task_store(self) -> SyncDiff:
+        """Syncs the task store with Ticktick.
+
+        Returns:
+            The changes of the active tasks since the last sync.
+        """
+        checkpoint = self._checkpoint if self.incremental_sync else 0
+        has_data_changed = self._get_ticktick_data(checkpoint)
+        if not has_data_changed and (checkpoint or self._cached_raw_active_tasks):
+            return SyncDiff(checkpoint=self._checkpoint)
+
+        self._checkpoint = self.ticktick_data.get(tsp.CHECKPOINT, 0)
+        self.project_registry.update(self.ticktick_data)
+        sync_task_bean = self.ticktick_data[tsp.SYNC_TASK_BEAN]
 
-    def _get_ticktick_data(self):
-        """Gets raw data from Ticktick."""
-        self.ticktick_data = self.ticktick_api.get(self.GET_STATE_URL).json()
+        started_at = time.perf_counter()
+        if checkpoint:
+            sync_diff = self._task_store.apply_changes(sync_task_bean, self.ticktick_list_ids.get_ids())
+        else:
+            sync_diff = self._task_store.replace_all(sync_task_bean[tsp.UPDATE], self.ticktick_list_ids.get_ids())
+        self._record_parse("sync", len(sync_diff.added) + len(sync_diff.updated), started_at)
+
+        sync_diff.checkpoint = self._checkpoint
+        return sync_diff
 
     def _get_all_tasks(self):
         """Gets all tasks from Ticktick."""
-        self._get_ticktick_data()
+        self.sync()
+
+    def sync(self) -> SyncDiff:
+        """Syncs the active tasks with Ticktick.
+
+        Only the tasks that changed are parsed again, the subscribers are notified when any task changed.
+
+        Returns:
+            The tasks added, updated and removed since the last sync.
+        """
+        with self._sync_lock:
+            return self._refresh_active_tasks()
 
-        raw_active_tasks = self.ticktick_data["syncTaskBean"]["update"]
-        if raw_active_tasks == self._cached_raw_active_tasks:
+    def subscribe(self, callback: Callable[[SyncDiff], None]) -> Callable[[], None]:
+        """Subscribes a function to the changes of the active tasks.
+
+        Args:
+            callback: Function called with the SyncDiff of every sync that changes the active tasks, including the
+                      syncs made by the getters. Exceptions raised by the callback are logged and ignored.
+
+        Returns:
+            A function that unsubscribes the callback.
+        """
+        with self._sync_lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._sync_lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def _notify_subscribers(self, sync_diff: SyncDiff):
+        for callback in list(self._subscribers):
+            try:
+                callback(sync_diff)
+            except Exception:
+                logging.exception(f"Subscriber {callback} failed to process a sync")
+
+    def _refresh_active_tasks(self) -> SyncDiff:
+        """Syncs the task store and rebuilds the active tasks lists if the active tasks changed."""
+        metrics_sink = self.ticktick_api.metrics_sink
+        store_revision = self._task_store.revision
+        registry_revision = self.project_registry.revision
+        with timed(metrics_sink, SYNC_STAGE_SECONDS, {"stage": "sync"}):
+            sync_diff = self._sync_task_store()
+        has_raw_changed = self._task_store.revision != store_revision
+        changed_raw_tasks, removed_task_ids = self._task_store.pop_raw_changes()
+
+        if self._sync_cache is not None:
+            with timed(metrics_sink, SYNC_STAGE_SECONDS, {"stage": "sync_cache"}):
+                if has_raw_changed:
+                    self._sync_cache.save(self._checkpoint, changed_raw_tasks, removed_task_ids)
+                else:
+                    self._sync_cache.save_checkpoint(self._checkpoint)
+                if self.project_registry.revision != registry_revision:
+                    self._sync_cache.save_registry(self.project_registry.raw_state)
+
+        if sync_diff or has_raw_changed or self._snapshot is None:
+            with timed(metrics_sink, SYNC_STAGE_SECONDS, {"stage": "filter"}):
+                self._rebuild_active_tasks(synced_at=time.monotonic())
+        else:
+            self._snapshot = self._snapshot.confirmed(self._checkpoint)
+
+        if sync_diff:
+            self._update_weight_series(sync_diff)
+            self._notify_subscribers(sync_diff)
+        return sync_diff
+
+    def _update_weight_series(self, sync_diff: SyncDiff):
+        """Updates the weight series with the weight measurements that changed in a sync."""
+        if self.ticktick_list_ids.WEIGHT_MEASUREMENTS is None:
             return
 
-        self._cached_raw_active_tasks = raw_active_tasks
-        self.all_active_tasks = parse_ticktick_tasks(raw_active_tasks, self.ticktick_list_ids.get_ids())
+        measurements = []
+        removed_ids = [task.ticktick_id for task in sync_diff.removed]
+        for task in sync_diff.added + sync_diff.updated:
+            if _is_task_a_weight_measurement(task, self.ticktick_list_ids):
+                measurements.append(task)
+            else:
+                removed_ids.append(task.ticktick_id)
+        if self._weight_series.update(measurements, removed_ids):
+            self.weight_series = self._weight_series.copy()
+
+    def _rebuild_active_tasks(self, synced_at: float | None = None):
+        """Rebuilds the active tasks lists and the snapshot from the task store.
+
+        Args:
+            synced_at: Monotonic time of the sync the tasks come from, None if they were not synced.
+        """
+        self._cached_raw_active_tasks = self._task_store.raw_tasks
+        self.all_active_tasks = self._task_store.tasks
 
         self.active_tasks = []
+        self.weight_measurements = []
         for task in self.all_active_tasks:
             if _is_task_a_weight_measurement(task, self.ticktick_list_ids):
                 self.weight_measurements.append(task)
@@ -75,7 +338,79 @@ class TicktickClient:
             else:
                 logging.warning(f"Task {task} does not have a valid status")
 
-    def move_task_to_project(self, task: Task, project_id: str):
+        tasks_by_project, tasks_by_tag = self._task_store.get_frozen_indexes()
+        self._snapshot = TaskSnapshot(all_active_tasks=tuple(self.all_active_tasks),
+                                      active_tasks=tuple(self.active_tasks),
+                                      weight_measurements=tuple(self.weight_measurements),
+                                      tasks_by_project=tasks_by_project,
+                                      tasks_by_tag=tasks_by_tag,
+                                      checkpoint=self._checkpoint,
+                                      synced_at=synced_at)
+
+    @property
+    def snapshot(self) -> TaskSnapshot | None:
+        """Immutable view of the active tasks of the last sync, None if the tasks were never synced.
+
+        It can be read from any thread without blocking, also while a sync is in progress.
+        """
+        return self._snapshot
+
+    @property
+    def staleness(self) -> float:
+        """Seconds since the last sync that confirmed the active tasks, infinite if they were never synced."""
+        return self._snapshot.age if self._snapshot is not None else float("inf")
+
+    @property
+    def background_sync_error(self) -> Exception | None:
+        """Error of the last background sync, None if it succeeded or the background sync was never started."""
+        return self._background_sync.last_error if self._background_sync is not None else None
+
+    def start_background_sync(self, interval: float = 60.0):
+        """Starts syncing the active tasks in a background thread.
+
+        While the background sync runs, get_active_tasks, get_tasks_by_list and get_tasks_by_tag read the last
+        snapshot instead of syncing, use `staleness` to know how old it is. The first sync starts immediately.
+
+        Args:
+            interval: Seconds between the end of a sync and the start of the next one.
+        """
+        if self._background_sync is not None:
+            self._background_sync.stop()
+        self._background_sync = BackgroundSync(self.sync, interval)
+        self._background_sync.start()
+
+    def stop_background_sync(self, timeout: float | None = None):
+        """Stops the background sync, waiting for the sync in progress to finish.
+
+        Args:
+            timeout: Maximum seconds to wait for the sync in progress. If it is None, it waits until it finishes.
+        """
+        if self._background_sync is not None:
+            self._background_sync.stop(timeout)
+            self._background_sync = None
+
+    def close(self):
+        """Stops the background sync, the client can still be used and syncs on every read."""
+        self.stop_background_sync()
+
+    def __enter__(self) -> "TicktickClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _sync_if_needed(self):
+        """Syncs the active tasks, unless the background sync keeps them up to date."""
+        if self._get_background_snapshot() is None:
+            self._get_all_tasks()
+
+    def _get_background_snapshot(self) -> TaskSnapshot | None:
+        """Returns the snapshot if the background sync keeps it up to date, None if the getters have to sync."""
+        if self._background_sync is None or not self._background_sync.is_running:
+            return None
+        return self._snapshot
+
+    def move_task_to_project(self, task: AnyTask, project_id: str):
         """Moves a task from one project (list) to another in Ticktick.
 
         Args:
@@ -85,7 +420,7 @@ class TicktickClient:
         payload = TicktickPayloads.move_task_to_project(task, project_id)
         self.ticktick_api.post(self.MOVE_TASK_URL, data=payload)
 
-    def replace_task_tags(self, task: Task, tags: tuple[str, ...]) -> bool:
+    def replace_task_tags(self, task: AnyTask, tags: tuple[str, ...]) -> bool:
         """Replaces the tags of a task in Ticktick.
 
         Args:
@@ -95,28 +430,40 @@ class TicktickClient:
         Returns:
             True if the tags were replaced successfully, False otherwise.
         """
-        self._get_all_tasks()
-        tasks_raw_data = [rt for rt in self._cached_raw_active_tasks if rt[tlp.ID] == task.ticktick_id]
+        with self._sync_lock:
+            self._get_all_tasks()
+            task_raw_data = self._task_store.get_raw_task(task.ticktick_id)
 
-        if not tasks_raw_data:
+        if task_raw_data is None:
             return False
 
-        task_raw_data = tasks_raw_data[0]
-        task_raw_data[tlp.TAGS] = tags
-        payload = {"update": [task_raw_data]}
+        payload = {"update": [{**task_raw_data, tlp.TAGS: tags}]}
         self.ticktick_api.post(self.CRUD_TASK_URL, data=payload)
         return True
 
-    def get_active_tasks(self) -> list[Task]:
+    def get_active_tasks(self) -> list[AnyTask]:
         """Gets all active tasks from Ticktick.
 
         Returns:
             Active tasks.
         """
+        snapshot = self._get_background_snapshot()
+        if snapshot is not None:
+            return list(snapshot.active_tasks)
+
         self._get_all_tasks()
         return self.active_tasks
 
-    def get_completed_tasks(self) -> list[Task]:
+    def get_weight_series(self) -> WeightSeries:
+        """Gets the time series of the weight measurements, updated with the changes of every sync.
+
+        Returns:
+            Weight series of the last sync. It is not changed by later syncs, which publish a new series.
+        """
+        self._sync_if_needed()
+        return self.weight_series
+
+    def get_completed_tasks(self) -> list[AnyTask]:
         """Gets all completed tasks from Ticktick.
 
         Returns:
@@ -124,36 +471,70 @@ class TicktickClient:
         """
         logging.info("Getting completed tasks")
 
-        self._get_ticktick_data()
-        raw_completed_tasks = self.ticktick_api.get(self.COMPLETED_TASKS_URL).json()
-        self.completed_tasks = parse_ticktick_tasks(raw_completed_tasks, self.ticktick_list_ids.get_ids())
+        raw_completed_tasks = self.ticktick_api.get_json(self.COMPLETED_TASKS_URL)
+        self.completed_tasks = self._parse_tasks(raw_completed_tasks)
 
         return self.completed_tasks
 
-    def get_deleted_tasks(self) -> list[Task]:
+    def get_deleted_tasks(self) -> list[AnyTask]:
         """Gets all deleted tasks from Ticktick.
 
         Returns:
             Deleted tasks.
         """
-        self._get_ticktick_data()
-        raw_deleted_tasks = self.ticktick_api.get(self.DELETED_TASKS_URL).json()["tasks"]
-        self.deleted_tasks = parse_ticktick_tasks(raw_deleted_tasks, self.ticktick_list_ids.get_ids())
+        raw_deleted_tasks = self.ticktick_api.get_json(self.DELETED_TASKS_URL)["tasks"]
+        self.deleted_tasks = self._parse_tasks(raw_deleted_tasks)
 
         return self.deleted_tasks
 
-    def get_abandoned_tasks(self) -> list[Task]:
+    def get_abandoned_tasks(self) -> list[AnyTask]:
         """Gets all abandoned tasks from Ticktick.
 
         Returns:
             Abandoned tasks.
         """
-        self._get_ticktick_data()
-        raw_abandoned_tasks = self.ticktick_api.get(self.ABANDONED_TASKS_URL).json()
-        self.abandoned_tasks = parse_ticktick_tasks(raw_abandoned_tasks, self.ticktick_list_ids.get_ids())
+        raw_abandoned_tasks = self.ticktick_api.get_json(self.ABANDONED_TASKS_URL)
+        self.abandoned_tasks = self._parse_tasks(raw_abandoned_tasks)
 
         return self.abandoned_tasks
 
+    def iter_completed_tasks(self, from_date: datetime, to_date: datetime) -> Iterator[AnyTask]:
+        """Iterates over all the tasks completed between two dates, requesting them page by page.
+
+        Args:
+            from_date: Start of the period, naive dates are considered UTC.
+            to_date: End of the period, naive dates are considered UTC.
+
+        Yields:
+            Completed tasks, from the most recently completed to the oldest.
+        """
+        for raw_tasks in iter_closed_raw_tasks(self.ticktick_api, self.CLOSED_TASKS_URL, "Completed",
+                                               from_date, to_date, self.HISTORY_PAGE_SIZE):
+            yield from self._parse_tasks(raw_tasks)
+
+    def iter_abandoned_tasks(self, from_date: datetime, to_date: datetime) -> Iterator[AnyTask]:
+        """Iterates over all the tasks abandoned between two dates, requesting them page by page.
+
+        Args:
+            from_date: Start of the period, naive dates are considered UTC.
+            to_date: End of the period, naive dates are considered UTC.
+
+        Yields:
+            Abandoned tasks, from the most recently abandoned to the oldest.
+        """
+        for raw_tasks in iter_closed_raw_tasks(self.ticktick_api, self.CLOSED_TASKS_URL, "Abandoned",
+                                               from_date, to_date, self.HISTORY_PAGE_SIZE):
+            yield from self._parse_tasks(raw_tasks)
+
+    def iter_deleted_tasks(self) -> Iterator[AnyTask]:
+        """Iterates over all the tasks in the trash, requesting them page by page.
+
+        Yields:
+            Deleted tasks.
+        """
+        for raw_tasks in iter_trash_raw_tasks(self.ticktick_api, self.TRASH_TASKS_URL, self.HISTORY_PAGE_SIZE):
+            yield from self._parse_tasks(raw_tasks)
+
     def get_task(self, task_id: str) -> Task:
         """Gets task information from Ticktick using the API.
 
@@ -163,10 +544,10 @@ class TicktickClient:
         Returns:
             Task or dictionary with the task information.
         """
-        task = self.ticktick_api.get(f"{self.TASK_URL}/{task_id}").json()
+        task = self.ticktick_api.get_json(f"{self.TASK_URL}/{task_id}")
         return dict_to_task(task)
 
-    def complete_task(self, task: Task):
+    def complete_task(self, task: AnyTask):
         """Completes a task in Ticktick using the API."""
         payload = TicktickPayloads.complete_task(task)
         self.ticktick_api.post(self.CRUD_TASK_URL, data=payload)
@@ -182,9 +563,29 @@ class TicktickClient:
             Ticktick id of the created task.
         """
         payload = TicktickPayloads.create_task(task, column_id)
-        response = self.ticktick_api.post(self.CRUD_TASK_URL, payload).json()
+        response = self.ticktick_api.post_json(self.CRUD_TASK_URL, payload)
         return list(response["id2etag"].keys())[0]
 
+    def batch(self, max_size: int | None = None, max_delay: float | None = None) -> TaskWriteBatcher:
+        """Creates a batcher that sends task mutations to Ticktick in as few requests as possible.
+
+        Example:
+            with client.batch() as batch:
+                for task in tasks:
+                    batch.complete_task(task)
+
+        Args:
+            max_size: Number of queued mutations that triggers a flush. If it is None, size does not trigger flushes.
+            max_delay: Seconds after the first queued mutation that trigger a flush. If it is None, time does not
+                       trigger flushes.
+
+        Returns:
+            The write batcher, its queue is flushed when it is used as a context manager and exits. Tag replacements
+            send the raw task of the last sync with the new tags.
+        """
+        return TaskWriteBatcher(self.ticktick_api, self.CRUD_TASK_URL, self.MOVE_TASK_URL, max_size, max_delay,
+                                self._task_store.get_raw_task)
+
     def get_overall_focus_time(self, date: str) -> float:
         """Gets the overall focus time of a day from Ticktick.
 
@@ -195,7 +596,7 @@ class TicktickClient:
             General focus time.
         """
         clean_date = date.replace("-", "")
-        raw_time = self.ticktick_api.get(f"{self.GENERAL_FOCUS_TIME_URL}/{clean_date}/{clean_date}").json()
+        raw_time = self.ticktick_api.get_json(f"{self.GENERAL_FOCUS_TIME_URL}/{clean_date}/{clean_date}")
 
         return round(raw_time[0]["duration"] / 60, 2)
 
@@ -208,9 +609,7 @@ class TicktickClient:
         Returns:
             Active focus time.
         """
-        clean_date = date.replace("-", "")
-        raw_time = self.ticktick_api.get(f"{self.ACTIVE_FOCUS_TIME_URL}/{clean_date}/{clean_date}").json()
-        tag_time = raw_time.get("tagDurations", {})
+        tag_time = self._get_focus_tag_durations(date)
 
         active_focus_time = 0
         for tag in active_focus_tags:
@@ -218,7 +617,111 @@ class TicktickClient:
 
         return round(active_focus_time / 60, 2)
 
-    def get_tasks_by_list(self, list_ids: list[str], task_type: TaskType = TaskType.ACTIVE) -> list[Task]:
+    def _get_focus_tag_durations(self, date: str) -> dict:
+        """Gets the focus minutes by tag of a day from Ticktick."""
+        clean_date = date.replace("-", "")
+        raw_time = self.ticktick_api.get_json(f"{self.ACTIVE_FOCUS_TIME_URL}/{clean_date}/{clean_date}")
+        return raw_time.get("tagDurations", {})
+
+    def _get_cached_focus_statistics(self, statistic: str, days: list[str]) -> dict:
+        """Returns the focus statistics of the days that are in the focus time cache."""
+        if self._focus_time_cache is None:
+            return {}
+
+        cached_statistics = {day: self._focus_time_cache.get(statistic, day) for day in days}
+        cached_statistics = {day: value for day, value in cached_statistics.items() if value is not None}
+
+        metrics_sink = self.ticktick_api.metrics_sink
+        if metrics_sink is not None:
+            metrics_sink.increment(CACHE_REQUESTS, len(cached_statistics), {"cache": "focus_time", "result": "hit"})
+            metrics_sink.increment(CACHE_REQUESTS, len(days) - len(cached_statistics),
+                                   {"cache": "focus_time", "result": "miss"})
+        return cached_statistics
+
+    def _cache_focus_statistics(self, statistic: str, statistics_by_day: dict):
+        if self._focus_time_cache is not None:
+            self._focus_time_cache.update(statistic, statistics_by_day)
+
+    def get_overall_focus_time_range(self, start_date: str, end_date: str) -> dict[str, float]:
+        """Gets the overall focus time of every day of a period from Ticktick in a single request.
+
+        Args:
+            start_date: First day of the period in the format YYYY-MM-DD.
+            end_date: Last day of the period in the format YYYY-MM-DD.
+
+        Returns:
+            General focus time by day.
+        """
+        days = list(iter_days(start_date, end_date))
+        durations = self._get_cached_focus_statistics("overall", days)
+
+        missing_days = [day for day in days if day not in durations]
+        if missing_days:
+            first_day, last_day = missing_days[0].replace("-", ""), missing_days[-1].replace("-", "")
+            raw_heatmap = self.ticktick_api.get_json(f"{self.GENERAL_FOCUS_TIME_URL}/{first_day}/{last_day}")
+            missing_durations = get_durations_by_day(raw_heatmap, list(iter_days(missing_days[0], missing_days[-1])))
+            self._cache_focus_statistics("overall", missing_durations)
+            durations.update(missing_durations)
+
+        return {day: round(durations[day] / 60, 2) for day in days}
+
+    def get_active_focus_time_range(self, start_date: str, end_date: str,
+                                    active_focus_tags: list[str]) -> dict[str, float]:
+        """Gets the active focus time of every day of a period from Ticktick.
+
+        Ticktick only returns the tag durations of a whole period, so the days are requested concurrently.
+
+        Args:
+            start_date: First day of the period in the format YYYY-MM-DD.
+            end_date: Last day of the period in the format YYYY-MM-DD.
+            active_focus_tags: Tags whose focus time is active focus time.
+
+        Returns:
+            Active focus time by day.
+        """
+        days = list(iter_days(start_date, end_date))
+        tag_durations = self._get_cached_focus_statistics("tag_durations", days)
+
+        missing_days = [day for day in days if day not in tag_durations]
+        if missing_days:
+            with ThreadPoolExecutor(max_workers=self.FOCUS_TIME_MAX_WORKERS) as executor:
+                missing_tag_durations = dict(zip(missing_days,
+                                                 executor.map(self._get_focus_tag_durations, missing_days)))
+            self._cache_focus_statistics("tag_durations", missing_tag_durations)
+            tag_durations.update(missing_tag_durations)
+
+        return {day: round(sum(tag_durations[day].get(tag, 0) for tag in active_focus_tags) / 60, 2) for day in days}
+
+    def get_focus_sessions(self, from_date: datetime, to_date: datetime,
+                           utc_offset: timedelta = timedelta(0)) -> FocusSessions:
+        """Gets the focus sessions of the active and closed tasks that started between two dates.
+
+        Only the tasks closed after the start of the period are requested, as tasks closed before it can not have
+        sessions in it. The sessions are extracted from the raw tasks, without parsing them. It requires NumPy.
+
+        Args:
+            from_date: Start of the period, naive dates are considered UTC.
+            to_date: End of the period, naive dates are considered UTC.
+            utc_offset: Offset from UTC of the days the sessions are grouped by.
+
+        Returns:
+            The focus sessions of the period.
+        """
+        with self._sync_lock:
+            self._sync_if_needed()
+            raw_active_tasks = self._task_store.raw_tasks
+
+        def iter_raw_tasks() -> Iterator[dict]:
+            yield from raw_active_tasks
+            closed_until = datetime.now(timezone.utc)
+            for status in ("Completed", "Abandoned"):
+                for raw_tasks in iter_closed_raw_tasks(self.ticktick_api, self.CLOSED_TASKS_URL, status, from_date,
+                                                       closed_until, self.HISTORY_PAGE_SIZE):
+                    yield from raw_tasks
+
+        return FocusSessions.from_raw_tasks(iter_raw_tasks(), utc_offset).between(from_date, to_date)
+
+    def get_tasks_by_list(self, list_ids: list[str], task_type: TaskType = TaskType.ACTIVE) -> list[AnyTask]:
         """Gets all tasks from Ticktick by list ids.
 
         Args:
@@ -228,14 +731,200 @@ class TicktickClient:
         Returns:
             The list of Tasks that match the criteria.
         """
-        matching_tasks = []
+        return self.query().in_lists(*list_ids).status(task_type).execute()
+
+    def get_tasks_by_list_names(self, list_names: list[str], task_type: TaskType = TaskType.ACTIVE) -> list[AnyTask]:
+        """Gets all tasks from Ticktick by list names, resolved with the project registry.
+
+        Args:
+            list_names: Names of the lists to get the tasks from, names that do not match a list are ignored.
+            task_type: Type of tasks to get.
 
-        if task_type == TaskType.ACTIVE or task_type == TaskType.ALL:
+        Returns:
+            The list of Tasks that match the criteria.
+        """
+        if self._snapshot is None:
             self._get_all_tasks()
-            matching_tasks.extend(self.all_active_tasks)
 
-        if task_type == TaskType.COMPLETED or task_type == TaskType.ALL:
-            completed_tasks = self.get_completed_tasks()
-            matching_tasks.extend(completed_tasks)
+        list_ids = [project.ticktick_id for list_name in list_names
+                    if (project := self.project_registry.get_project_by_name(list_name)) is not None]
+        return self.get_tasks_by_list(list_ids, task_type)
+
+    def query(self) -> TaskQuery:
+        """Starts a query of the tasks, see TaskQuery.
+
+        Returns:
+            A query of all the active tasks, narrowed with its methods and run with `execute()`.
+        """
+        return TaskQuery(self)
+
+    def get_tasks(self, query: TaskQuery) -> list[AnyTask]:
+        """Gets the tasks that match a query.
+
+        Active tasks are selected from the indexes of the synced tasks, completed tasks are requested for the closed
+        window of the query, by default the last two weeks. Nothing is requested if the query can not match any task.
+
+        Args:
+            query: Query of the tasks.
+
+        Returns:
+            The active tasks that match the query, followed by the completed ones.
+        """
+        if not query.can_match(self.ticktick_list_ids.get_ids()):
+            return []
+
+        matching_tasks = []
+        if query.task_type == TaskType.ACTIVE or query.task_type == TaskType.ALL:
+            snapshot = self._get_background_snapshot()
+            if snapshot is not None:
+                matching_tasks.extend(query.select_active_tasks(snapshot))
+            else:
+                with self._sync_lock:
+                    self._get_all_tasks()
+                    matching_tasks.extend(query.select_active_tasks(self._task_store))
+
+        if query.task_type == TaskType.COMPLETED or query.task_type == TaskType.ALL:
+            to_date = query.closed_to or datetime.now(timezone.utc)
+            from_date = query.closed_from or to_date - self.COMPLETED_TASKS_WINDOW
+            for raw_tasks in iter_closed_raw_tasks(self.ticktick_api, self.CLOSED_TASKS_URL, "Completed",
+                                                   from_date, to_date, self.HISTORY_PAGE_SIZE):
+                completed_tasks = self._parse_tasks([raw_task for raw_task in raw_tasks if query.matches_raw(raw_task)])
+                matching_tasks.extend(task for task in completed_tasks if query.matches(task))
 
-        return [task for task in matching_tasks if task.project_id in list_ids]
+        return matching_tasks
+
+    def get_subtasks(self, task: AnyTask) -> list[AnyTask]:
+        """Gets the active subtasks of a task.
+
+        Args:
+            task: Parent task.
+
+        Returns:
+            The direct subtasks of the task.
+        """
+        with self._sync_lock:
+            self._sync_if_needed()
+            return self._task_store.get_subtasks(task.ticktick_id)
+
+    def get_subtree(self, task: AnyTask) -> list[AnyTask]:
+        """Gets all the active descendants of a task, walking the subtask hierarchy index.
+
+        Args:
+            task: Root task of the subtree.
+
+        Returns:
+            The descendants of the task depth first, every task is followed by its own subtasks.
+        """
+        with self._sync_lock:
+            self._sync_if_needed()
+            return list(self._task_store.iter_subtree(task.ticktick_id))
+
+    def get_ancestors(self, task: AnyTask) -> list[AnyTask]:
+        """Gets the active ancestors of a task.
+
+        Args:
+            task: Task to get the ancestors of.
+
+        Returns:
+            The parent of the task, the parent of its parent and so on up to the root task.
+        """
+        with self._sync_lock:
+            self._sync_if_needed()
+            return self._task_store.get_ancestors(task.ticktick_id)
+
+    def get_subtree_focus_time(self, task: AnyTask) -> float:
+        """Gets the focus time of a task and all its active descendants.
+
+        Args:
+            task: Root task of the subtree.
+
+        Returns:
+            Focus time in hours.
+        """
+        subtree_focus_time = task.focus_time + sum(subtask.focus_time for subtask in self.get_subtree(task))
+        return round(subtree_focus_time, 2)
+
+    def complete_subtree(self, task: AnyTask) -> list[TaskWriteResult]:
+        """Completes a task and all its active descendants in Ticktick, in one batched request.
+
+        Args:
+            task: Root task of the subtree.
+
+        Returns:
+            The results of the completion of the task followed by the ones of its descendants, in the order of
+            get_subtree.
+        """
+        batcher = self.batch()
+        results = [batcher.complete_task(subtree_task) for subtree_task in [task, *self.get_subtree(task)]]
+        batcher.flush()
+        return results
+
+    def get_habits(self) -> list[Habit]:
+        """Gets all habits from Ticktick, archived habits included.
+
+        Returns:
+            Habits.
+        """
+        raw_habits = self.ticktick_api.get_json(self.HABITS_URL)
+        self.habits = [dict_to_habit(raw_habit) for raw_habit in raw_habits]
+        return self.habits
+
+    def sync_habit_checkins(self, habit_ids: list[str] | None = None) -> list[HabitCheckin]:
+        """Syncs the check-ins of habits into `habit_checkins`.
+
+        The check-ins of many habits are requested together, only after the afterStamp of each habit. The afterStamp is
+        then moved to HABIT_CHECKINS_LOOKBACK_DAYS days before today, so late check-ins of recent days are synced
+        again, and it is saved in the sync cache with the check-ins. The first sync of a habit requests the last
+        HABIT_HISTORY_DAYS days.
+
+        Args:
+            habit_ids: Ids of the habits to sync. If it is None, all the habits are synced.
+
+        Returns:
+            The check-ins that were new or changed.
+        """
+        if habit_ids is None:
+            habit_ids = [habit.ticktick_id for habit in self.get_habits()]
+
+        today = datetime.now().date()
+        first_stamp = to_stamp(today - timedelta(days=self.HABIT_HISTORY_DAYS))
+        with self._habit_lock:
+            habit_ids_by_after_stamp: dict[int, list[str]] = {}
+            for habit_id in dict.fromkeys(habit_ids):
+                after_stamp = self.habit_checkins.after_stamps.get(habit_id, first_stamp)
+                habit_ids_by_after_stamp.setdefault(after_stamp, []).append(habit_id)
+
+            raw_checkins = []
+            for after_stamp, stamp_habit_ids in habit_ids_by_after_stamp.items():
+                for start in range(0, len(stamp_habit_ids), self.HABIT_CHECKINS_BATCH_SIZE):
+                    batch_habit_ids = stamp_habit_ids[start:start + self.HABIT_CHECKINS_BATCH_SIZE]
+                    payload = TicktickPayloads.get_habits_checkins(dict.fromkeys(batch_habit_ids), after_stamp)
+                    response = self.ticktick_api.post_json(self.HABIT_CHECKINS_URL, data=payload)
+                    for habit_checkins in (response.get(thcp.CHECKINS) or {}).values():
+                        raw_checkins.extend(habit_checkins)
+
+            changed_checkins = self.habit_checkins.update(raw_checkins)
+            next_after_stamp = to_stamp(today - timedelta(days=self.HABIT_CHECKINS_LOOKBACK_DAYS))
+            synced_after_stamps = {habit_id: next_after_stamp for habit_id in dict.fromkeys(habit_ids)}
+            self.habit_checkins.after_stamps.update(synced_after_stamps)
+            if self._sync_cache is not None:
+                self._sync_cache.save_habit_checkins(synced_after_stamps, changed_checkins)
+
+        return [dict_to_habit_checkin(raw_checkin) for raw_checkin in changed_checkins]
+
+    def get_tasks_by_tag(self, tag: str) -> list[AnyTask]:
+        """Gets the active tasks from Ticktick that have a tag.
+
+        Args:
+            tag: Tag of the tasks.
+
+        Returns:
+            The list of active Tasks with the tag.
+        """
+        snapshot = self._get_background_snapshot()
+        if snapshot is not None:
+            return snapshot.get_tasks_by_tag(tag)
+
+        with self._sync_lock:
+            self._get_all_tasks()
+            return self._task_store.get_tasks_by_tag(tag)
@@ -0,0 +1,194 @@
+import logging
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from itertools import accumulate
+from typing import Iterable
+
+from attrs import frozen
+
+from .lazy_task import AnyTask
+from ._task_utils import _parse_date
+
+WEIGHT_VALUE_PATTERN = re.compile(r"[-+]?\d+(?:[.,]\d+)?")
+SECONDS_PER_DAY = 86400
+
+
+@frozen
+class WeightMeasurement:
+    """ Weight measurement parsed from a task of the weight measurements list.
+
+    Attributes:
+        ticktick_id: The ID of the task of the measurement.
+        date: The date the task was created, in the timezone of the task.
+        value: The first number of the task title.
+    """
+    ticktick_id: str
+    date: datetime
+    value: float
+
+
+class WeightSeries:
+    """Time series of the weight measurements, sorted by date.
+
+    The date and value of every measurement are parsed once, when its task is added or updated, and stored in
+    array-backed columns sorted by timestamp, so a date range is found with two binary searches. Measurements are
+    unique by task id, a task that is synced again replaces its measurement.
+
+    A series is updated in place and is not thread safe. The client updates its own series and publishes a copy after
+    every sync that changes it, so the published series can be read without locks while the client keeps syncing.
+    """
+
+    def __init__(self) -> None:
+        self._timestamps = array("d")
+        self._values = array("d")
+        self._task_ids: list[str] = []
+        self._dates: list[datetime] = []
+        self._timestamps_by_id: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._timestamps_by_id
+
+    @property
+    def measurements(self) -> list[WeightMeasurement]:
+        """All the measurements, from the oldest to the newest."""
+        return self._get_measurements(0, len(self))
+
+    @property
+    def latest(self) -> WeightMeasurement | None:
+        """Newest measurement, None if there are no measurements."""
+        return self._get_measurements(len(self) - 1, len(self))[0] if self._values else None
+
+    def copy(self) -> "WeightSeries":
+        """Returns a copy of the series, that does not change when this series is updated."""
+        series = WeightSeries()
+        series._timestamps = array("d", self._timestamps)
+        series._values = array("d", self._values)
+        series._task_ids = list(self._task_ids)
+        series._dates = list(self._dates)
+        series._timestamps_by_id = dict(self._timestamps_by_id)
+        return series
+
+    def update(self, added_or_updated: Iterable[AnyTask], removed_ids: Iterable[str] = ()) -> int:
+        """Adds, replaces and removes measurements.
+
+        Args:
+            added_or_updated: Tasks of the weight measurements list that were added or updated. Tasks whose title has
+                              no number or that have no created date are skipped.
+            removed_ids: Ids of the tasks that are no longer weight measurements.
+
+        Returns:
+            The number of measurements that changed.
+        """
+        changed_count = 0
+        for task_id in removed_ids:
+            changed_count += self._remove(task_id)
+
+        for task in added_or_updated:
+            measurement = _parse_measurement(task)
+            changed_count += self._remove(task.ticktick_id)
+            if measurement is None:
+                logging.warning(f"Task {task.ticktick_id} of the weight measurements list has no weight or date")
+                continue
+
+            self._insert(measurement)
+            changed_count += 1
+        return changed_count
+
+    def between(self, start_date: datetime, end_date: datetime) -> list[WeightMeasurement]:
+        """Returns the measurements between two dates, both included.
+
+        Args:
+            start_date: Start of the range, naive dates are considered UTC.
+            end_date: End of the range, naive dates are considered UTC.
+        """
+        start, end = self._get_range(start_date, end_date)
+        return self._get_measurements(start, end)
+
+    def moving_average(self, window: int = 7) -> list[float]:
+        """Returns the trailing moving average of the values, one per measurement.
+
+        Args:
+            window: Number of measurements of the average, the first measurements average the ones available.
+        """
+        cumulative_values = [0.0, *accumulate(self._values)]
+        return [(cumulative_values[end] - cumulative_values[max(end - window, 0)]) / min(end, window)
+                for end in range(1, len(cumulative_values))]
+
+    def trend(self, start_date: datetime | None = None, end_date: datetime | None = None) -> float:
+        """Returns the slope of the least squares line of the values, in units per day.
+
+        Args:
+            start_date: Start of the range. If it is None, the range starts at the first measurement.
+            end_date: End of the range. If it is None, the range ends at the last measurement.
+
+        Returns:
+            The slope, 0 if the range has fewer than two measurements with different dates.
+        """
+        start, end = self._get_range(start_date, end_date)
+        count = end - start
+        if count < 2:
+            return 0.0
+
+        days = [(timestamp - self._timestamps[start]) / SECONDS_PER_DAY for timestamp in self._timestamps[start:end]]
+        values = self._values[start:end]
+        mean_day = sum(days) / count
+        mean_value = sum(values) / count
+        day_variance = sum((day - mean_day) ** 2 for day in days)
+        if not day_variance:
+            return 0.0
+        return sum((day - mean_day) * (value - mean_value) for day, value in zip(days, values)) / day_variance
+
+    def _get_range(self, start_date: datetime | None, end_date: datetime | None) -> tuple[int, int]:
+        """Returns the positions of the first measurement in a date range and after the last one."""
+        start = bisect_left(self._timestamps, _to_timestamp(start_date)) if start_date is not None else 0
+        end = bisect_right(self._timestamps, _to_timestamp(end_date)) if end_date is not None else len(self)
+        return start, max(start, end)
+
+    def _get_measurements(self, start: int, end: int) -> list[WeightMeasurement]:
+        return [WeightMeasurement(self._task_ids[position], self._dates[position], self._values[position])
+                for position in range(start, end)]
+
+    def _insert(self, measurement: WeightMeasurement):
+        timestamp = measurement.date.timestamp()
+        position = bisect_right(self._timestamps, timestamp)
+        self._timestamps.insert(position, timestamp)
+        self._values.insert(position, measurement.value)
+        self._task_ids.insert(position, measurement.ticktick_id)
+        self._dates.insert(position, measurement.date)
+        self._timestamps_by_id[measurement.ticktick_id] = timestamp
+
+    def _remove(self, task_id: str) -> int:
+        """Removes the measurement of a task, returns 1 if it was in the series and 0 otherwise."""
+        timestamp = self._timestamps_by_id.pop(task_id, None)
+        if timestamp is None:
+            return 0
+
+        position = bisect_left(self._timestamps, timestamp)
+        while self._task_ids[position] != task_id:
+            position += 1
+        del self._timestamps[position]
+        del self._values[position]
+        del self._task_ids[position]
+        del self._dates[position]
+        return 1
+
+
+def _parse_measurement(task: AnyTask) -> WeightMeasurement | None:
+    """Parses the weight of the task title and the date the task was created."""
+    value_match = WEIGHT_VALUE_PATTERN.search(task.title)
+    if value_match is None or not task.created_date:
+        return None
+
+    return WeightMeasurement(task.ticktick_id, _parse_date(task.created_date),
+                             float(value_match.group().replace(",", ".")))
+
+
+def _to_timestamp(date: datetime) -> float:
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
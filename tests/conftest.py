@@ -57,3 +57,21 @@ def set_empty_test_ticktick_ids(data_folder_path):
 def dict_task(data_folder_path):
     with open(data_folder_path / "dict_task.json", "r") as file:
         return json.load(file)
+
+
+@pytest.fixture
+def stub_ticktick_server(monkeypatch):
+    """Local Ticktick API server, the Ticktick URLs of the clients point to it while the test runs."""
+    from stub_server import TICKTICK_HOST, StubTicktickServer
+    from tickthon import TicktickClient
+    from tickthon._ticktick_api import TicktickAPI
+
+    with StubTicktickServer() as stub_server:
+        for client_class in (TicktickAPI, TicktickClient):
+            for attribute, value in vars(client_class).items():
+                if attribute.endswith("_URL") and isinstance(value, str):
+                    monkeypatch.setattr(client_class, attribute, value.replace(TICKTICK_HOST, stub_server.url))
+
+        stub_server.route("POST", "/api/v2/user/signon", {"token": "stub-token"})
+        stub_server.route("GET", "/api/v2/batch/check/0", {"checkPoint": 1, "syncTaskBean": {"update": []}})
+        yield stub_server
@@ -0,0 +1,74 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+TICKTICK_HOST = "https://api.ticktick.com"
+
+
+class StubTicktickServer:
+    """Local HTTP server that answers Ticktick API requests with canned JSON bodies.
+
+    Routes are registered per method and path, a route body can be a callable that receives the request and returns
+    the body, or a tuple with the status code, the body and optionally the response headers. Bodies that are bytes are
+    sent as they are, so large payloads can be encoded once.
+    """
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], object] = {}
+        self.requests: list[dict] = []
+        self.delay = 0.0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._build_handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "StubTicktickServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def route(self, method: str, path: str, body: object):
+        self.routes[(method, path)] = body
+
+    def _build_handler(self):
+        stub_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self._answer("GET")
+
+            def do_POST(self):
+                self._answer("POST")
+
+            def _answer(self, method: str):
+                content_length = int(self.headers.get("Content-Length") or 0)
+                raw_body = self.rfile.read(content_length) if content_length else b""
+                request = {"method": method, "path": self.path, "headers": dict(self.headers),
+                           "json": json.loads(raw_body) if raw_body else None}
+                stub_server.requests.append(request)
+                time.sleep(stub_server.delay)
+
+                route_body = stub_server.routes.get((method, urlparse(self.path).path), (404, {}))
+                if callable(route_body):
+                    route_body = route_body(request)
+                status, body, headers = (route_body + ({},))[:3] if isinstance(route_body, tuple) \
+                    else (200, route_body, {})
+
+                content = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                for header, value in headers.items():
+                    self.send_header(header, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        return Handler
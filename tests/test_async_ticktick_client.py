@@ -0,0 +1,82 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from tickthon import AsyncTicktickClient
+
+
+@pytest.fixture
+def async_ticktick_client(stub_ticktick_server, ticktick_info, dict_task):
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0",
+                               {"checkPoint": 1, "syncTaskBean": {"update": [{**dict_task, "projectId": "inbox114478622"}]}})
+    stub_ticktick_server.route("GET", "/api/v2/project/all/closed",
+                               [{**dict_task, "id": "completed-task", "projectId": "inbox114478622", "status": 2}])
+    stub_ticktick_server.route("GET", "/api/v2/pomodoros/statistics/heatmap/20230803/20230803", [{"duration": 90}])
+
+    client = asyncio.run(AsyncTicktickClient.create("user", "password", ticktick_info["ticktick_ids"]))
+    yield client
+    asyncio.run(client.close())
+
+
+def test_async_client_gets_tasks(async_ticktick_client):
+    active_tasks = asyncio.run(async_ticktick_client.get_active_tasks())
+
+    assert [task.title for task in active_tasks] == ["Automation tasks"]
+
+
+def test_async_client_runs_requests_concurrently(async_ticktick_client, stub_ticktick_server):
+    async def get_dashboard():
+        return await asyncio.gather(async_ticktick_client.get_active_tasks(),
+                                    async_ticktick_client.get_completed_tasks(),
+                                    async_ticktick_client.get_overall_focus_time("2023-08-03"))
+
+    stub_ticktick_server.delay = 0.3
+    start = time.perf_counter()
+    active_tasks, completed_tasks, focus_time = asyncio.run(get_dashboard())
+    elapsed_time = time.perf_counter() - start
+
+    assert len(active_tasks) == 1
+    assert [task.ticktick_id for task in completed_tasks] == ["completed-task"]
+    assert focus_time == 1.5
+    assert elapsed_time < 0.8
+
+
+def test_async_client_iterates_history(async_ticktick_client):
+    async def get_completed_ids():
+        completed_tasks = async_ticktick_client.iter_completed_tasks(datetime(2023, 8, 1), datetime(2023, 8, 31))
+        return [task.ticktick_id async for task in completed_tasks]
+
+    assert asyncio.run(get_completed_ids()) == ["completed-task"]
+
+
+def test_async_client_gets_habits(async_ticktick_client, stub_ticktick_server):
+    stub_ticktick_server.route("GET", "/api/v2/habits", [])
+
+    assert asyncio.run(async_ticktick_client.get_habits()) == []
+
+
+def test_async_client_walks_the_hierarchy(async_ticktick_client):
+    async def get_subtree():
+        active_tasks = await async_ticktick_client.get_active_tasks()
+        return await async_ticktick_client.get_subtree(active_tasks[0])
+
+    assert asyncio.run(get_subtree()) == []
+
+
+def test_async_client_batches_writes(async_ticktick_client, stub_ticktick_server):
+    stub_ticktick_server.route("POST", "/api/v2/batch/task", {"id2etag": {}, "id2error": {}})
+
+    async def complete_active_tasks():
+        active_tasks = await async_ticktick_client.get_active_tasks()
+        async with async_ticktick_client.batch() as batch:
+            return [batch.complete_task(task) for task in active_tasks]
+
+    async def batch_by_size():
+        async with async_ticktick_client.batch(max_size=10):
+            pass
+
+    assert [result.sent for result in asyncio.run(complete_active_tasks())] == [True]
+    with pytest.raises(ValueError):
+        asyncio.run(batch_by_size())
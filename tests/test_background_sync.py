@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from tickthon import TaskSnapshot, TicktickClient
+
+
+@pytest.fixture
+def stub_polled_server(stub_ticktick_server, dict_task):
+    inbox_task = {**dict_task, "projectId": "inbox114478622"}
+    sync_states = iter([[inbox_task]])
+
+    def sync_state(request):
+        raw_tasks = next(sync_states, [inbox_task, {**inbox_task, "id": "new-task"}])
+        return {"checkPoint": 1, "syncTaskBean": {"update": raw_tasks}}
+
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0", sync_state)
+    return stub_ticktick_server
+
+
+def test_snapshot_is_immutable(stub_polled_server, ticktick_info):
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"])
+    snapshot = client.snapshot
+
+    client.sync()
+
+    assert isinstance(snapshot, TaskSnapshot)
+    assert [task.ticktick_id for task in snapshot.active_tasks] == ["60c8d7b1e9b80e0595353bc6"]
+    assert len(client.snapshot.active_tasks) == 2
+    with pytest.raises(TypeError):
+        snapshot.tasks_by_project["inbox114478622"] = ()  # type: ignore[index]
+
+
+def test_background_sync_updates_the_snapshot(stub_polled_server, ticktick_info):
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"])
+    background_synced = threading.Event()
+    client.subscribe(lambda sync_diff: background_synced.set())
+
+    with client:
+        client.start_background_sync(interval=60)
+        assert background_synced.wait(5)
+        sync_requests = len(stub_polled_server.requests)
+
+        active_tasks = client.get_active_tasks()
+        inbox_tasks = client.get_tasks_by_list(["inbox114478622"])
+
+        assert len(stub_polled_server.requests) == sync_requests
+        assert [task.ticktick_id for task in active_tasks] == ["60c8d7b1e9b80e0595353bc6", "new-task"]
+        assert len(inbox_tasks) == 2
+        assert client.staleness < 5
+        assert client.background_sync_error is None
+
+    assert not any(thread.name == "tickthon-background-sync" for thread in threading.enumerate())
+
+
+def test_staleness_is_infinite_before_the_first_sync(stub_polled_server, ticktick_info):
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], defer_initial_sync=True)
+
+    assert client.snapshot is None
+    assert client.staleness == float("inf")
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from tickthon import FocusSessions, TicktickClient  # noqa: E402
+
+
+def session_id(started_at: datetime) -> str:
+    return f"{int(started_at.timestamp()):08x}0000000000000000"
+
+
+def make_raw_task(task_id, project_id, tags, sessions):
+    return {"id": task_id, "projectId": project_id, "tags": tags,
+            "focusSummaries": [{"focuses": [[session_id(started_at), 0, seconds] for started_at, seconds in sessions]}]}
+
+
+MONDAY = datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def raw_tasks():
+    return [make_raw_task("write", "work", ["deep", "work"], [(MONDAY, 3600), (MONDAY + timedelta(days=1), 1800)]),
+            make_raw_task("read", "home", [], [(MONDAY + timedelta(days=7), 7200)]),
+            make_raw_task("write", "work", ["deep", "work"], [(MONDAY, 3600)]),
+            {"id": "no-focus", "projectId": "home"}]
+
+
+def test_focus_sessions_group_bys(raw_tasks):
+    focus_sessions = FocusSessions.from_raw_tasks(raw_tasks)
+
+    assert len(focus_sessions) == 3
+    assert focus_sessions.total_hours == 3.5
+    assert focus_sessions.focus_by_day() == {"2024-01-01": 1.0, "2024-01-02": 0.5, "2024-01-08": 2.0}
+    assert focus_sessions.focus_by_week() == {"2024-01-01": 1.5, "2024-01-08": 2.0}
+    assert focus_sessions.focus_by_task() == {"write": 1.5, "read": 2.0}
+    assert focus_sessions.focus_by_project() == {"work": 1.5, "home": 2.0}
+    assert focus_sessions.focus_by_tag() == {"deep": 1.5, "work": 1.5}
+    assert {type(day) for day in focus_sessions.focus_by_day()} == {str}
+
+
+def test_focus_sessions_count_every_share_of_a_split_session():
+    raw_tasks = [make_raw_task("write", "work", ["work"], [(MONDAY, 1800)]),
+                 make_raw_task("review", "work", ["work"], [(MONDAY, 1800)])]
+
+    focus_sessions = FocusSessions.from_raw_tasks(raw_tasks)
+
+    assert focus_sessions.focus_by_task() == {"write": 0.5, "review": 0.5}
+    assert focus_sessions.focus_by_project() == {"work": 1.0}
+    assert focus_sessions.focus_by_tag() == {"work": 1.0}
+
+
+def test_focus_sessions_between_and_rolling_average(raw_tasks):
+    focus_sessions = FocusSessions.from_raw_tasks(raw_tasks).between(MONDAY + timedelta(hours=1),
+                                                                     datetime(2024, 1, 9))
+
+    assert focus_sessions.focus_by_tag() == {"deep": 0.5, "work": 0.5}
+    rolling_average = focus_sessions.rolling_average(window_days=2)
+    assert rolling_average["2024-01-02"] == 0.25
+    assert rolling_average["2024-01-03"] == 0.25
+    assert rolling_average["2024-01-05"] == 0.0
+    assert rolling_average["2024-01-08"] == 1.0
+
+
+def test_focus_sessions_days_use_the_utc_offset():
+    raw_tasks = [make_raw_task("late", "work", [], [(datetime(2024, 1, 2, 3, tzinfo=timezone.utc), 3600)])]
+
+    focus_sessions = FocusSessions.from_raw_tasks(raw_tasks, utc_offset=timedelta(hours=-5))
+
+    assert focus_sessions.focus_by_day() == {"2024-01-01": 1.0}
+
+
+def test_client_gets_focus_sessions(stub_ticktick_server, ticktick_info, raw_tasks):
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0",
+                               {"checkPoint": 1, "syncTaskBean": {"update": raw_tasks[:1]}})
+    stub_ticktick_server.route("GET", "/api/v2/project/all/closed", raw_tasks[1:2])
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], defer_initial_sync=True)
+
+    focus_sessions = client.get_focus_sessions(datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+    assert focus_sessions.focus_by_task() == {"write": 1.5, "read": 2.0}
+    closed_requests = [request["path"] for request in stub_ticktick_server.requests if "/closed" in request["path"]]
+    assert len(closed_requests) == 2
+    assert all("from=2024-01-01" in path for path in closed_requests)
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from tickthon import TicktickClient
+from tickthon._focus_time import FocusTimeCache, get_durations_by_day, iter_days
+
+
+def test_iter_days():
+    assert list(iter_days("2023-02-27", "2023-03-01")) == ["2023-02-27", "2023-02-28", "2023-03-01"]
+
+
+def test_get_durations_by_day():
+    raw_heatmap = [{"day": "20230802", "duration": 30}, {"day": "20230801", "duration": 60}]
+
+    durations = get_durations_by_day(raw_heatmap, ["2023-08-01", "2023-08-02", "2023-08-03"])
+
+    assert durations == {"2023-08-01": 60.0, "2023-08-02": 30.0, "2023-08-03": 0.0}
+
+
+def test_focus_time_cache_only_stores_closed_days(tmp_path):
+    cache_path = tmp_path / "focus_time.json"
+    focus_time_cache = FocusTimeCache(cache_path)
+
+    focus_time_cache.update("overall", {"2023-08-01": 60.0, "2999-01-01": 30.0})
+
+    assert json.loads(cache_path.read_text()) == {"overall": {"2023-08-01": 60.0}}
+    assert FocusTimeCache(cache_path).get("overall", "2023-08-01") == 60.0
+    assert FocusTimeCache(cache_path).get("overall", "2999-01-01") is None
+
+
+@pytest.fixture
+def focus_time_client(stub_ticktick_server, ticktick_info, tmp_path):
+    stub_ticktick_server.route("GET", "/api/v2/pomodoros/statistics/heatmap/20230801/20230803",
+                               [{"day": "20230801", "duration": 60}, {"day": "20230802", "duration": 90},
+                                {"day": "20230803", "duration": 0}])
+    for day, tag_duration in (("20230801", 30), ("20230802", 45), ("20230803", 0)):
+        stub_ticktick_server.route("GET", f"/api/v2/pomodoros/statistics/dist/{day}/{day}",
+                                   {"tagDurations": {"work": tag_duration, "rest": 15}})
+
+    return TicktickClient("user", "password", ticktick_info["ticktick_ids"],
+                          focus_time_cache_path=tmp_path / "focus_time.json")
+
+
+def test_get_overall_focus_time_range(focus_time_client, stub_ticktick_server):
+    focus_time = focus_time_client.get_overall_focus_time_range("2023-08-01", "2023-08-03")
+    heatmap_requests = [request for request in stub_ticktick_server.requests if "heatmap" in request["path"]]
+
+    assert focus_time == {"2023-08-01": 1.0, "2023-08-02": 1.5, "2023-08-03": 0.0}
+    assert len(heatmap_requests) == 1
+
+    assert focus_time_client.get_overall_focus_time_range("2023-08-01", "2023-08-03") == focus_time
+    assert len([request for request in stub_ticktick_server.requests if "heatmap" in request["path"]]) == 1
+
+
+def test_get_active_focus_time_range(focus_time_client, stub_ticktick_server):
+    focus_time = focus_time_client.get_active_focus_time_range("2023-08-01", "2023-08-03", ["work"])
+    dist_requests = [request for request in stub_ticktick_server.requests if "dist" in request["path"]]
+
+    assert focus_time == {"2023-08-01": 0.5, "2023-08-02": 0.75, "2023-08-03": 0.0}
+    assert len(dist_requests) == 3
+
+    focus_time_client.get_active_focus_time_range("2023-08-01", "2023-08-03", ["work", "rest"])
+    assert len([request for request in stub_ticktick_server.requests if "dist" in request["path"]]) == 3
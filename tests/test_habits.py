@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from tickthon import HabitCheckinStore, TicktickClient
+
+
+def make_checkin(habit_id, stamp, status=2):
+    return {"id": f"{habit_id}-{stamp}", "habitId": habit_id, "checkinStamp": stamp, "status": status, "value": 1,
+            "goal": 1}
+
+
+@pytest.fixture
+def habit_checkins():
+    store = HabitCheckinStore()
+    store.update([make_checkin("read", stamp) for stamp in (20240101, 20240102, 20240103, 20240105, 20240106)])
+    return store
+
+
+def test_habit_streaks(habit_checkins):
+    assert habit_checkins.get_streak("read", "2024-01-06") == 2
+    assert habit_checkins.get_streak("read", "2024-01-07") == 2
+    assert habit_checkins.get_streak("read", "2024-01-04") == 3
+    assert habit_checkins.get_streak("read", "2024-01-09") == 0
+    assert habit_checkins.get_longest_streak("read") == 3
+    assert habit_checkins.get_streak("unknown", "2024-01-06") == 0
+
+
+def test_habit_completion_rate(habit_checkins):
+    assert habit_checkins.get_completion_rate("read", "2024-01-01", "2024-01-10") == 0.5
+    assert habit_checkins.get_completion_rate("read", "2024-01-10", "2024-01-01") == 0.0
+
+
+def test_habit_checkins_are_replaced_by_day(habit_checkins):
+    changed_checkins = habit_checkins.update([make_checkin("read", 20240102, status=1),
+                                              make_checkin("read", 20240103)])
+
+    assert changed_checkins == [make_checkin("read", 20240102, status=1)]
+    assert not habit_checkins.is_completed("read", "2024-01-02")
+    assert habit_checkins.is_completed("read", "2024-01-03")
+    assert [checkin.date for checkin in habit_checkins.get_checkins("read", "2024-01-02", "2024-01-05")] == \
+        ["2024-01-02", "2024-01-03", "2024-01-05"]
+    assert habit_checkins.get_longest_streak("read") == 2
+
+
+@pytest.fixture
+def stub_habits_server(stub_ticktick_server):
+    habits = [{"id": f"habit-{number}", "name": f"Habit {number}", "type": "Boolean", "goal": 1}
+              for number in range(3)]
+
+    def habit_checkins(request):
+        after_stamp = request["json"]["afterStamp"]
+        return {"checkins": {habit_id: [make_checkin(habit_id, after_stamp)]
+                             for habit_id in request["json"]["habitIds"]}}
+
+    stub_ticktick_server.route("GET", "/api/v2/habits", habits)
+    stub_ticktick_server.route("POST", "/api/v2/habitCheckins/query", habit_checkins)
+    return stub_ticktick_server
+
+
+def test_sync_habit_checkins(stub_habits_server, ticktick_info, tmp_path, monkeypatch):
+    monkeypatch.setattr(TicktickClient, "HABIT_CHECKINS_BATCH_SIZE", 2)
+    sync_cache_path = tmp_path / "sync.sqlite"
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], sync_cache_path=sync_cache_path,
+                            defer_initial_sync=True)
+
+    changed_checkins = client.sync_habit_checkins()
+
+    checkin_requests = [request["json"] for request in stub_habits_server.requests
+                        if request["path"] == "/api/v2/habitCheckins/query"]
+    first_stamp = int(f"{datetime.now().date() - timedelta(days=client.HABIT_HISTORY_DAYS):%Y%m%d}")
+    assert [request["habitIds"] for request in checkin_requests] == [["habit-0", "habit-1"], ["habit-2"]]
+    assert {request["afterStamp"] for request in checkin_requests} == {first_stamp}
+    assert [checkin.habit_id for checkin in changed_checkins] == ["habit-0", "habit-1", "habit-2"]
+    assert [habit.name for habit in client.habits] == ["Habit 0", "Habit 1", "Habit 2"]
+
+    stub_habits_server.requests.clear()
+    cached_client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], api_token="token",
+                                   sync_cache_path=sync_cache_path, defer_initial_sync=True)
+    cached_client.sync_habit_checkins(["habit-0"])
+
+    next_stamp = int(f"{datetime.now().date() - timedelta(days=client.HABIT_CHECKINS_LOOKBACK_DAYS):%Y%m%d}")
+    assert [request["json"]["afterStamp"] for request in stub_habits_server.requests] == [next_stamp]
+    assert len(cached_client.habit_checkins.raw_checkins) == 4
@@ -0,0 +1,36 @@
+import importlib.util
+
+import pytest
+
+from tickthon import _json
+
+
+@pytest.fixture
+def restore_json_backend():
+    backend = _json.JSON_BACKEND
+    yield
+    _json.set_backend(backend)
+
+
+@pytest.mark.parametrize("backend", _json.JSON_BACKENDS)
+def test_json_backends_round_trip(backend, dict_task, restore_json_backend):
+    if backend != "json" and importlib.util.find_spec(backend) is None:
+        pytest.skip(f"{backend} is not installed")
+
+    assert _json.set_backend(backend) == backend
+    encoded_task = _json.dumps({**dict_task, "title": "Tâche ✓"})
+
+    assert isinstance(encoded_task, bytes)
+    assert _json.loads(encoded_task) == {**dict_task, "title": "Tâche ✓"}
+    assert _json.loads(encoded_task.decode()) == {**dict_task, "title": "Tâche ✓"}
+
+
+def test_set_backend_falls_back_to_installed_backend(restore_json_backend):
+    expected_backend = "msgspec" if importlib.util.find_spec("msgspec") is not None else "json"
+
+    assert _json.set_backend("msgspec", "json") == expected_backend
+
+
+def test_set_backend_rejects_unknown_backend(restore_json_backend):
+    with pytest.raises(ValueError):
+        _json.set_backend("simdjson")
@@ -0,0 +1,40 @@
+import attrs
+
+from tickthon import LazyTask, dict_to_task
+from tickthon._task_store import TaskStore
+from tickthon.lazy_task import parse_lazy_ticktick_tasks
+
+
+def test_lazy_task_matches_dict_to_task(dict_task):
+    lazy_task = LazyTask(dict_task)
+
+    assert attrs.asdict(lazy_task.to_task()) == attrs.asdict(dict_to_task(dict_task))
+    assert lazy_task == dict_to_task(dict_task)
+
+
+def test_lazy_task_memoizes_decoded_fields(dict_task):
+    lazy_task = LazyTask(dict_task)
+
+    assert lazy_task._due_date is None
+    assert lazy_task.due_date == "2023-08-03T14:15:00-05:00"
+    assert lazy_task._due_date == "2023-08-03T14:15:00-05:00"
+    assert lazy_task._created_date is None
+
+
+def test_parse_lazy_ticktick_tasks_filters_lists(dict_task):
+    raw_tasks = [dict_task, {**dict_task, "id": "other-task", "projectId": "other-list"}]
+
+    lazy_tasks = parse_lazy_ticktick_tasks(raw_tasks, ["other-list"])
+
+    assert [task.ticktick_id for task in lazy_tasks] == ["other-task"]
+
+
+def test_lazy_task_store_does_not_decode_dates(dict_task):
+    store = TaskStore(lazy_parsing=True)
+
+    store.replace_all([dict_task], [])
+
+    lazy_task = store.get_task(dict_task["id"])
+    assert isinstance(lazy_task, LazyTask)
+    assert lazy_task._due_date is None
+    assert store.get_tasks_due_between("2023-08-03", "2023-08-03") == [lazy_task]
@@ -0,0 +1,74 @@
+import logging
+
+from tickthon import LoggingMetricsSink, PrometheusFileSink, TicktickClient
+from tickthon.metrics import CACHE_REQUESTS, JSON_DECODE_SECONDS, REQUEST_SECONDS, SYNC_STAGE_SECONDS, TASKS_PARSED, \
+    get_endpoint, timed
+
+
+def test_get_endpoint_replaces_ids_and_numbers():
+    assert get_endpoint("https://api.ticktick.com/api/v2/batch/check/1700000000") == "/api/v2/batch/check/{param}"
+    assert get_endpoint("https://api.ticktick.com/api/v2/task/65f10b61131d8a5bf9e68825?x=1") == "/api/v2/task/{param}"
+    assert get_endpoint("https://api.ticktick.com/api/v2/project/all/closed") == "/api/v2/project/all/closed"
+
+
+def test_timed_does_nothing_without_sink():
+    with timed(None, "metric"):
+        pass
+
+
+def test_prometheus_file_sink_writes_text_format(tmp_path):
+    metrics_sink = PrometheusFileSink(tmp_path / "tickthon.prom")
+    metrics_sink.increment("requests_total", labels={"endpoint": "/a"})
+    metrics_sink.increment("requests_total", 2, labels={"endpoint": "/a"})
+    metrics_sink.observe("request_seconds", 0.5)
+    metrics_sink.observe("request_seconds", 1.5)
+    metrics_sink.set_gauge("tasks_per_second", 100, labels={"mode": 'la"zy'})
+
+    metrics_sink.write()
+
+    assert (tmp_path / "tickthon.prom").read_text().splitlines() == [
+        "# TYPE requests_total counter",
+        'requests_total{endpoint="/a"} 3.0',
+        "# TYPE tasks_per_second gauge",
+        'tasks_per_second{mode="la\\"zy"} 100.0',
+        "# TYPE request_seconds summary",
+        "request_seconds_sum 2.0",
+        "request_seconds_count 2.0",
+    ]
+
+
+def test_prometheus_file_sink_keeps_every_digit_of_large_counters(tmp_path):
+    metrics_sink = PrometheusFileSink(tmp_path / "tickthon.prom")
+    metrics_sink.increment("response_bytes_total", 123456789)
+    metrics_sink.observe("request_seconds", 1234567.125)
+
+    assert metrics_sink.to_text().splitlines()[1:] == ["response_bytes_total 123456789.0",
+                                                       "# TYPE request_seconds summary",
+                                                       "request_seconds_sum 1234567.125",
+                                                       "request_seconds_count 1.0"]
+
+
+def test_logging_metrics_sink(caplog):
+    metrics_sink = LoggingMetricsSink(level=logging.INFO)
+
+    with caplog.at_level(logging.INFO, logger="tickthon.metrics"):
+        metrics_sink.increment("requests_total", labels={"endpoint": "/a"})
+
+    assert caplog.messages == ['requests_total{endpoint="/a"} +1']
+
+
+def test_client_records_metrics(stub_ticktick_server, ticktick_info, dict_task, tmp_path):
+    inbox_task = {**dict_task, "projectId": "inbox114478622"}
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0", {"checkPoint": 10, "syncTaskBean": {"update": [inbox_task]}})
+    metrics_sink = PrometheusFileSink(tmp_path / "tickthon.prom")
+
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], metrics_sink=metrics_sink)
+    client._get_all_tasks()
+
+    sync_endpoint = {"endpoint": "/api/v2/batch/check/{param}"}
+    assert metrics_sink.summaries[REQUEST_SECONDS][(("endpoint", "/api/v2/batch/check/{param}"), ("method", "GET"),
+                                                     ("status", "200"))][1] == 2
+    assert metrics_sink.summaries[JSON_DECODE_SECONDS][tuple(sync_endpoint.items())][1] == 1
+    assert metrics_sink.counters[TASKS_PARSED][(("mode", "eager"), ("source", "sync"))] == 1
+    assert metrics_sink.counters[CACHE_REQUESTS][(("cache", "response"), ("result", "hit"))] == 1
+    assert (("stage", "filter"),) in metrics_sink.summaries[SYNC_STAGE_SECONDS]
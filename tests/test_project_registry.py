@@ -0,0 +1,91 @@
+import pytest
+
+from tickthon import Project, ProjectRegistry, TicktickClient
+from tickthon._sync_cache import SyncCache
+
+INBOX_ID = "inbox114478622"
+WEEK_BACKLOG_ID = "61c62f198f08c92d0584f678"
+
+
+@pytest.fixture
+def sync_state():
+    return {"projectProfiles": [{"id": WEEK_BACKLOG_ID, "name": "Week", "groupId": "planning", "sortOrder": 2},
+                                {"id": INBOX_ID, "name": "Inbox", "sortOrder": 1, "closed": None},
+                                {"id": "archived", "name": "Old", "groupId": "planning", "closed": True}],
+            "projectGroups": [{"id": "planning", "name": "Planning", "sortOrder": 1}],
+            "tags": [{"name": "work", "label": "Work", "sortOrder": 1}, {"name": "deep", "parent": "work"}]}
+
+
+def test_registry_indexes_the_sync_state(sync_state):
+    registry = ProjectRegistry()
+
+    assert registry.update(sync_state)
+
+    assert [project.name for project in registry.projects] == ["Old", "Inbox", "Week"]
+    assert registry.get_project_by_name("Inbox") == Project(INBOX_ID, "Inbox", sort_order=1)
+    assert [project.ticktick_id for project in registry.get_projects_by_group("planning")] == \
+        ["archived", WEEK_BACKLOG_ID]
+    assert registry.get_project("archived").closed
+    assert registry.get_group_by_name("Planning").ticktick_id == "planning"
+    assert registry.get_tag("Work").label == "Work"
+    assert registry.get_tag("deep").parent == "work"
+    assert registry.get_project_by_name("Missing") is None
+
+
+def test_registry_replaces_the_returned_sections(sync_state):
+    registry = ProjectRegistry()
+    registry.update(sync_state)
+    revision = registry.revision
+
+    assert not registry.update({"projectProfiles": None, "tags": sync_state["tags"]})
+    assert registry.update({"projectProfiles": [{"id": INBOX_ID, "name": "Renamed inbox"}]})
+
+    assert registry.revision == revision + 1
+    assert registry.get_project_by_name("Inbox") is None
+    assert [project.ticktick_id for project in registry.projects] == [INBOX_ID]
+    assert registry.get_project_by_name("Renamed inbox").ticktick_id == INBOX_ID
+    assert len(registry.groups) == 1
+    assert len(registry.tags) == 2
+
+
+def test_client_resolves_list_names(stub_ticktick_server, ticktick_info, dict_task, sync_state, tmp_path):
+    inbox_task = {**dict_task, "projectId": INBOX_ID}
+    week_task = {**dict_task, "id": "week-task", "projectId": WEEK_BACKLOG_ID}
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0",
+                               {"checkPoint": 1, "syncTaskBean": {"update": [inbox_task, week_task]}, **sync_state})
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/1", {"checkPoint": 1, "syncTaskBean": {"update": []}})
+    sync_cache_path = tmp_path / "sync.sqlite"
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], sync_cache_path=sync_cache_path,
+                            defer_initial_sync=True)
+
+    week_tasks = client.get_tasks_by_list_names(["Week", "Missing"])
+
+    assert [task.ticktick_id for task in week_tasks] == ["week-task"]
+    assert client.project_registry.get_project(INBOX_ID).name == "Inbox"
+    assert SyncCache(sync_cache_path).load_registry() == client.project_registry.raw_state
+
+    cached_client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], api_token="token",
+                                   sync_cache_path=sync_cache_path, defer_initial_sync=True)
+    assert cached_client.project_registry.get_project_by_name("Week").group_id == "planning"
+
+
+def test_client_drops_projects_deleted_between_incremental_syncs(stub_ticktick_server, ticktick_info, sync_state,
+                                                                 tmp_path):
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0",
+                               {"checkPoint": 1, "syncTaskBean": {"update": []}, **sync_state})
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/1",
+                               {"checkPoint": 2, "syncTaskBean": {"update": []}, **sync_state})
+    sync_cache_path = tmp_path / "sync.sqlite"
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], sync_cache_path=sync_cache_path)
+    client.get_active_tasks()
+    assert client.project_registry.get_project_by_name("Week").ticktick_id == WEEK_BACKLOG_ID
+
+    remaining_projects = [project for project in sync_state["projectProfiles"] if project["id"] != WEEK_BACKLOG_ID]
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/2",
+                               {"checkPoint": 3, "syncTaskBean": {"update": []},
+                                **sync_state, "projectProfiles": remaining_projects})
+    client.get_active_tasks()
+
+    assert client.project_registry.get_project_by_name("Week") is None
+    assert client.project_registry.get_project(INBOX_ID).name == "Inbox"
+    assert SyncCache(sync_cache_path).load_registry()["projectProfiles"] == remaining_projects
@@ -0,0 +1,135 @@
+import time
+
+import pytest
+from requests import HTTPError, Response, exceptions
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from tickthon import PrometheusFileSink, RequestScheduler
+from tickthon._request_scheduler import TokenBucket
+from tickthon._ticktick_api import TicktickAPI
+from tickthon.metrics import REQUEST_QUEUE_WAIT_SECONDS, REQUEST_RETRIES
+
+
+def make_response(status_code: int, headers: dict | None = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+def test_scheduler_retries_throttled_requests():
+    responses = iter([make_response(429, {"Retry-After": "0"}), make_response(503), make_response(200)])
+    request_scheduler = RequestScheduler(backoff_base=0.01)
+
+    response = request_scheduler.send("GET", lambda: next(responses))
+
+    assert response.status_code == 200
+    assert request_scheduler.metrics.retries == 2
+    assert request_scheduler.metrics.requests == 3
+
+
+def test_scheduler_does_not_retry_server_errors_of_writes():
+    request_scheduler = RequestScheduler(backoff_base=0.01)
+
+    response = request_scheduler.send("POST", lambda: make_response(500))
+
+    assert response.status_code == 500
+    assert request_scheduler.metrics.retries == 0
+
+
+def fail_then_succeed(error: Exception):
+    outcomes = iter([error, make_response(200)])
+
+    def send_request() -> Response:
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    return send_request
+
+
+def test_scheduler_does_not_retry_writes_that_may_have_been_sent():
+    request_scheduler = RequestScheduler(backoff_base=0.01)
+
+    with pytest.raises(exceptions.ReadTimeout):
+        request_scheduler.send("POST", fail_then_succeed(exceptions.ReadTimeout()))
+    with pytest.raises(exceptions.ConnectionError):
+        request_scheduler.send("POST", fail_then_succeed(exceptions.ConnectionError("Connection reset by peer")))
+    assert request_scheduler.metrics.retries == 0
+
+
+def test_scheduler_retries_writes_that_failed_to_connect():
+    request_scheduler = RequestScheduler(backoff_base=0.01)
+    refused_error = exceptions.ConnectionError(MaxRetryError(None, "/", NewConnectionError(None, "refused")))
+
+    assert request_scheduler.send("POST", fail_then_succeed(exceptions.ConnectTimeout())).status_code == 200
+    assert request_scheduler.send("POST", fail_then_succeed(refused_error)).status_code == 200
+    assert request_scheduler.metrics.retries == 2
+
+
+def test_scheduler_retries_reads_that_timed_out():
+    request_scheduler = RequestScheduler(backoff_base=0.01)
+
+    assert request_scheduler.send("GET", fail_then_succeed(exceptions.ReadTimeout())).status_code == 200
+    assert request_scheduler.metrics.retries == 1
+
+
+def test_scheduler_gives_up_after_max_retries():
+    request_scheduler = RequestScheduler(max_retries=2, backoff_base=0.01)
+
+    response = request_scheduler.send("GET", lambda: make_response(502))
+
+    assert response.status_code == 502
+    assert request_scheduler.metrics.requests == 3
+
+
+def test_retry_after_header():
+    request_scheduler = RequestScheduler(backoff_max=5)
+
+    assert request_scheduler._get_retry_after(make_response(429, {"Retry-After": "2"})) == 2
+    assert request_scheduler._get_retry_after(make_response(429, {"Retry-After": "120"})) == 120
+    assert request_scheduler._get_retry_after(make_response(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+    assert request_scheduler._get_retry_after(make_response(429)) is None
+
+
+def test_scheduler_returns_responses_throttled_for_longer_than_max_retry_after():
+    request_scheduler = RequestScheduler(max_retry_after=60)
+
+    response = request_scheduler.send("GET", lambda: make_response(429, {"Retry-After": "120"}))
+
+    assert response.status_code == 429
+    assert request_scheduler.metrics.retries == 0
+
+
+def test_token_bucket_limits_rate():
+    token_bucket = TokenBucket(rate=20, capacity=1)
+
+    start = time.monotonic()
+    for _ in range(5):
+        token_bucket.acquire()
+
+    assert time.monotonic() - start >= 0.18
+
+
+def test_api_retries_against_server(stub_ticktick_server):
+    responses = iter([(429, {}, {"Retry-After": "0"}), (200, [{"id": "habit"}])])
+    stub_ticktick_server.route("GET", "/api/v2/habits", lambda request: next(responses))
+    stub_ticktick_server.route("GET", "/api/v2/missing", (404, {}))
+    ticktick_api = TicktickAPI("user", "password", request_scheduler=RequestScheduler(backoff_base=0.01))
+
+    assert ticktick_api.get(ticktick_api.BASE_URL + "/habits").json() == [{"id": "habit"}]
+    with pytest.raises(HTTPError):
+        ticktick_api.get(ticktick_api.BASE_URL + "/missing")
+
+
+def test_api_records_scheduler_metrics(stub_ticktick_server, tmp_path):
+    responses = iter([(429, {}, {"Retry-After": "0"}), (200, [])])
+    stub_ticktick_server.route("GET", "/api/v2/habits", lambda request: next(responses))
+    metrics_sink = PrometheusFileSink(tmp_path / "tickthon.prom")
+    ticktick_api = TicktickAPI("user", "password", request_scheduler=RequestScheduler(backoff_base=0.01),
+                               metrics_sink=metrics_sink)
+
+    ticktick_api.get(ticktick_api.BASE_URL + "/habits")
+
+    assert metrics_sink.counters[REQUEST_RETRIES] == {(("method", "GET"), ("reason", "429")): 1}
+    assert metrics_sink.summaries[REQUEST_QUEUE_WAIT_SECONDS][()][1] == 3
@@ -0,0 +1,58 @@
+from requests import Response
+
+from tickthon import ResponseCache, TicktickClient
+
+
+def make_response(content: bytes, status_code: int = 200, headers: dict | None = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    return response
+
+
+def test_response_cache_detects_unchanged_content():
+    response_cache = ResponseCache()
+
+    assert not response_cache.is_unchanged("url", make_response(b'{"a": 1}'))
+    assert response_cache.is_unchanged("url", make_response(b'{"a": 1}'))
+    assert not response_cache.is_unchanged("url", make_response(b'{"a": 2}'))
+    assert (response_cache.hits, response_cache.misses) == (1, 2)
+
+
+def test_response_cache_uses_validators():
+    response_cache = ResponseCache()
+    response_cache.is_unchanged("url", make_response(b"{}", headers={"ETag": '"v1"', "Last-Modified": "yesterday"}))
+
+    assert response_cache.get_conditional_headers("url") == {"If-None-Match": '"v1"', "If-Modified-Since": "yesterday"}
+    assert response_cache.is_unchanged("url", make_response(b"", status_code=304))
+
+
+def test_response_cache_evicts_least_recently_used():
+    response_cache = ResponseCache(max_entries=2)
+    for url in ("first", "second"):
+        response_cache.is_unchanged(url, make_response(b"{}"))
+
+    response_cache.get("first")
+    response_cache.is_unchanged("third", make_response(b"{}"))
+
+    assert response_cache.get("second") is None
+    assert response_cache.get("first") is not None
+    assert len(response_cache) == 2
+
+
+def test_response_cache_expires_entries():
+    response_cache = ResponseCache(ttl=0)
+    response_cache.is_unchanged("url", make_response(b"{}"))
+
+    assert response_cache.get("url") is None
+
+
+def test_client_skips_unchanged_sync(stub_ticktick_server, ticktick_info, dict_task):
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0",
+                               {"checkPoint": 1, "syncTaskBean": {"update": [{**dict_task, "projectId": "inbox114478622"}]}})
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"])
+    active_tasks = client.active_tasks
+
+    assert client.get_active_tasks() is active_tasks
+    assert client.ticktick_api.response_cache.hits == 1
@@ -0,0 +1,57 @@
+import pytest
+
+from tickthon import TicktickClient
+from tickthon._sync_cache import SyncCache
+
+
+def test_sync_cache_round_trip(tmp_path, dict_task):
+    sync_cache = SyncCache(tmp_path / "sync.sqlite")
+    raw_tasks = [dict_task, {**dict_task, "id": "other-task"}]
+
+    sync_cache.save(42, raw_tasks)
+    sync_cache.save_checkpoint(43)
+
+    assert SyncCache(tmp_path / "sync.sqlite").load() == (43, raw_tasks)
+
+
+def test_sync_cache_saves_only_changes(tmp_path, dict_task):
+    sync_cache = SyncCache(tmp_path / "sync.sqlite")
+    sync_cache.save(42, [dict_task, {**dict_task, "id": "removed-task"}, {**dict_task, "id": "other-task"}])
+
+    updated_task = {**dict_task, "title": "Updated title"}
+    sync_cache.save(43, [updated_task, {**dict_task, "id": "new-task"}], ["removed-task"])
+
+    assert sync_cache.load() == (43, [updated_task, {**dict_task, "id": "other-task"}, {**dict_task, "id": "new-task"}])
+
+
+def test_empty_sync_cache(tmp_path):
+    assert SyncCache(tmp_path / "sync.sqlite").load() == (0, [])
+
+
+@pytest.fixture
+def stub_sync_server(stub_ticktick_server, dict_task):
+    inbox_task = {**dict_task, "projectId": "inbox114478622"}
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0", {"checkPoint": 10, "syncTaskBean": {"update": [inbox_task]}})
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/10",
+                               {"checkPoint": 11, "syncTaskBean": {"update": [{**inbox_task, "id": "new-task"}]}})
+    return stub_ticktick_server
+
+
+def test_client_starts_from_sync_cache(stub_sync_server, ticktick_info, tmp_path):
+    sync_cache_path = tmp_path / "sync.sqlite"
+    TicktickClient("user", "password", ticktick_info["ticktick_ids"], sync_cache_path=sync_cache_path)
+    stub_sync_server.requests.clear()
+
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], api_token="token",
+                            cookies={"t": "cookie"}, sync_cache_path=sync_cache_path, defer_initial_sync=True)
+
+    assert [task.title for task in client.active_tasks] == ["Automation tasks"]
+    assert not [request for request in stub_sync_server.requests if request["path"] == "/api/v2/batch/check/10"]
+
+    active_tasks = client.get_active_tasks()
+
+    assert [task.ticktick_id for task in active_tasks] == [client.active_tasks[0].ticktick_id, "new-task"]
+    assert [request for request in stub_sync_server.requests if request["path"] == "/api/v2/batch/check/10"]
+    checkpoint, raw_tasks = SyncCache(sync_cache_path).load()
+    assert checkpoint == 11
+    assert [raw_task["id"] for raw_task in raw_tasks] == [task.ticktick_id for task in active_tasks]
@@ -0,0 +1,46 @@
+import pytest
+
+from tickthon import SyncDiff, TicktickClient
+
+
+@pytest.fixture
+def stub_sync_server(stub_ticktick_server, dict_task):
+    inbox_task = {**dict_task, "projectId": "inbox114478622"}
+    sync_states = iter([[inbox_task],
+                        [{**inbox_task, "etag": "new-etag", "title": "Renamed"}, {**inbox_task, "id": "new-task"}],
+                        [{**inbox_task, "id": "new-task"}]])
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0",
+                               lambda request: {"checkPoint": 1, "syncTaskBean": {"update": next(sync_states)}})
+    return stub_ticktick_server
+
+
+def test_sync_returns_changes(stub_sync_server, ticktick_info):
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], defer_initial_sync=True)
+
+    first_sync = client.sync()
+    second_sync = client.sync()
+    third_sync = client.sync()
+
+    assert [task.title for task in first_sync.added] == ["Automation tasks"]
+    assert [task.ticktick_id for task in second_sync.added] == ["new-task"]
+    assert [task.title for task in second_sync.updated] == ["Renamed"]
+    assert [task.title for task in third_sync.removed] == ["Renamed"]
+    assert [task.ticktick_id for task in client.active_tasks] == ["new-task"]
+
+
+def test_subscribers_are_notified_of_changes(stub_sync_server, ticktick_info):
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], defer_initial_sync=True)
+    sync_diffs: list[SyncDiff] = []
+
+    def failing_callback(sync_diff):
+        raise ValueError("Broken subscriber")
+
+    client.subscribe(failing_callback)
+    unsubscribe = client.subscribe(sync_diffs.append)
+    client.get_active_tasks()
+    client.sync()
+    unsubscribe()
+    client.sync()
+
+    assert [len(sync_diff.added) for sync_diff in sync_diffs] == [1, 1]
+    assert sync_diffs[0].checkpoint == 1
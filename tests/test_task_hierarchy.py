@@ -0,0 +1,51 @@
+import pytest
+
+from tickthon import TicktickClient
+
+INBOX_ID = "inbox114478622"
+
+
+@pytest.fixture
+def stub_hierarchy_server(stub_ticktick_server, dict_task):
+    focus_summaries = [{"focuses": [["687131e6f6019101b3683227", 1, 1800]]}]
+    raw_tasks = [{**dict_task, "id": "root", "parentId": "", "projectId": INBOX_ID, "focusSummaries": []},
+                 {**dict_task, "id": "child", "parentId": "root", "projectId": INBOX_ID,
+                  "focusSummaries": focus_summaries},
+                 {**dict_task, "id": "grandchild", "parentId": "child", "projectId": INBOX_ID,
+                  "focusSummaries": focus_summaries}]
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0", {"checkPoint": 1, "syncTaskBean": {"update": raw_tasks}})
+    stub_ticktick_server.route("POST", "/api/v2/batch/task",
+                               lambda request: {"id2etag": {item["id"]: "new-etag" for item in request["json"]["update"]},
+                                                "id2error": {}})
+    return stub_ticktick_server
+
+
+@pytest.fixture
+def client(stub_hierarchy_server, ticktick_info):
+    return TicktickClient("user", "password", ticktick_info["ticktick_ids"])
+
+
+def get_active_task(client, task_id):
+    return next(task for task in client.all_active_tasks if task.ticktick_id == task_id)
+
+
+def test_client_navigates_the_hierarchy(client):
+    root = get_active_task(client, "root")
+    grandchild = get_active_task(client, "grandchild")
+
+    assert [task.ticktick_id for task in client.get_subtasks(root)] == ["child"]
+    assert [task.ticktick_id for task in client.get_subtree(root)] == ["child", "grandchild"]
+    assert [task.ticktick_id for task in client.get_ancestors(grandchild)] == ["child", "root"]
+    assert client.get_subtree_focus_time(root) == 1.0
+
+
+def test_complete_subtree_sends_one_batch(client, stub_hierarchy_server):
+    root = get_active_task(client, "root")
+
+    results = client.complete_subtree(root)
+
+    batch_requests = [request for request in stub_hierarchy_server.requests if request["path"] == "/api/v2/batch/task"]
+    assert len(batch_requests) == 1
+    assert [item["id"] for item in batch_requests[0]["json"]["update"]] == ["root", "child", "grandchild"]
+    assert all(item["status"] == 2 for item in batch_requests[0]["json"]["update"])
+    assert [result.ticktick_id for result in results if result.ok] == ["root", "child", "grandchild"]
@@ -0,0 +1,111 @@
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
+
+from tickthon._task_history import iter_closed_raw_tasks, iter_trash_raw_tasks
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class FakeAPI:
+    """Base of the fake APIs, which serve the responses of their `get` method."""
+
+    def get_json(self, url):
+        return self.get(url).json()
+
+
+class FakeClosedTasksAPI(FakeAPI):
+    """Serves closed tasks like Ticktick, newest first, filtered by the "from" and "to" query parameters and with at
+    most `max_limit` tasks per response."""
+
+    def __init__(self, closed_tasks, max_limit=None):
+        self.closed_tasks = sorted(closed_tasks, key=lambda task: task["completedTime"], reverse=True)
+        self.max_limit = max_limit
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        query = parse_qs(urlparse(url).query)
+        from_date, to_date = (datetime.strptime(query[key][0], "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%dT%H:%M:%S")
+                              for key in ("from", "to"))
+        limit = min(int(query["limit"][0]), self.max_limit or int(query["limit"][0]))
+        return FakeResponse([task for task in self.closed_tasks
+                             if from_date <= task["completedTime"][:19] <= to_date][:limit])
+
+
+class FakeTrashAPI(FakeAPI):
+    def __init__(self, deleted_tasks):
+        self.deleted_tasks = deleted_tasks
+
+    def get(self, url):
+        query = parse_qs(urlparse(url).query)
+        start, limit = int(query["start"][0]), int(query["limit"][0])
+        return FakeResponse({"tasks": self.deleted_tasks[start:start + limit], "next": start + limit})
+
+
+def closed_task(task_number, completed_time):
+    return {"id": f"task-{task_number}", "completedTime": f"{completed_time}.000+0000"}
+
+
+def test_iter_closed_raw_tasks_pages_through_window():
+    closed_tasks = [closed_task(i, f"2023-08-{1 + i // 2:02d}T10:00:00") for i in range(7)]
+    fake_api = FakeClosedTasksAPI(closed_tasks)
+
+    pages = list(iter_closed_raw_tasks(fake_api, "closed", "Completed", datetime(2023, 8, 1),
+                                       datetime(2023, 8, 31), page_size=3))
+
+    returned_ids = [task["id"] for page in pages for task in page]
+    assert sorted(returned_ids) == sorted(task["id"] for task in closed_tasks)
+    assert len(returned_ids) == len(set(returned_ids))
+    assert len(fake_api.urls) == len(pages) > 1
+
+
+def iter_closed_task_ids(fake_api, page_size):
+    pages = iter_closed_raw_tasks(fake_api, "closed", "Completed", datetime(2023, 8, 1), datetime(2023, 8, 31),
+                                  page_size=page_size)
+    return [task["id"] for page in pages for task in page]
+
+
+def test_iter_closed_raw_tasks_pages_through_a_second_with_more_tasks_than_a_page(caplog):
+    closed_tasks = ([closed_task(i, "2023-08-02T10:00:00") for i in range(7)]
+                    + [closed_task(7, "2023-08-01T10:00:00")])
+
+    returned_ids = iter_closed_task_ids(FakeClosedTasksAPI(closed_tasks), page_size=3)
+
+    assert sorted(returned_ids) == sorted(task["id"] for task in closed_tasks)
+    assert len(returned_ids) == len(set(returned_ids))
+    assert not caplog.records
+
+
+def test_iter_closed_raw_tasks_warns_when_the_endpoint_truncates_a_second(caplog):
+    closed_tasks = ([closed_task(i, "2023-08-02T10:00:00") for i in range(7)]
+                    + [closed_task(7, "2023-08-01T10:00:00")])
+
+    returned_ids = iter_closed_task_ids(FakeClosedTasksAPI(closed_tasks, max_limit=4), page_size=3)
+
+    assert "Only 4 tasks closed at 2023-08-02 10:00:00+00:00" in caplog.text
+    assert "task-7" in returned_ids
+
+
+def test_iter_closed_raw_tasks_single_page():
+    fake_api = FakeClosedTasksAPI([closed_task(1, "2023-08-01T10:00:00")])
+
+    pages = list(iter_closed_raw_tasks(fake_api, "closed", "Abandoned", datetime(2023, 8, 1),
+                                       datetime(2023, 8, 2), page_size=500))
+
+    assert pages == [[closed_task(1, "2023-08-01T10:00:00")]]
+    assert "status=Abandoned" in fake_api.urls[0]
+    assert "from=2023-08-01%2000%3A00%3A00" in fake_api.urls[0]
+
+
+def test_iter_trash_raw_tasks():
+    deleted_tasks = [{"id": f"task-{i}"} for i in range(5)]
+
+    pages = list(iter_trash_raw_tasks(FakeTrashAPI(deleted_tasks), "trash", page_size=2))
+
+    assert [task for page in pages for task in page] == deleted_tasks
@@ -1,6 +1,7 @@
 import math
 
 import attrs
+import pytest
 from tickthon import Task, dict_to_task
 from tickthon._task_utils import get_focus_time, get_task_date
 
@@ -70,3 +71,28 @@ def test_get_date():
     task_date = get_task_date(raw_timezone, raw_task_date)
 
     assert task_date == "2023-08-03T14:15:00-05:00"
+
+
+@pytest.mark.parametrize("raw_task_date, raw_timezone, expected_date", [
+    ("2021-07-21T21:33:17.796+0000", "America/Bogota", "2021-07-21T16:33:17.796000-05:00"),
+    ("2023-08-03T19:15:00+05:30", "UTC", "2023-08-03T13:45:00+00:00"),
+    ("2023-08-03T19:15:00Z", "America/Bogota", "2023-08-03T14:15:00-05:00"),
+])
+def test_get_date_formats(raw_task_date, raw_timezone, expected_date):
+    assert get_task_date(raw_timezone, raw_task_date) == expected_date
+
+
+def test_dict_to_task_with_minimal_raw_task():
+    raw_task = {"id": "60c8d7b1e9b80e0595353bc6", "etag": "muu17zqq", "status": 2, "title": " Minimal task ",
+                "projectId": "5f30772022d478db3ad1a9c2", "timeZone": "UTC", "columnId": None}
+
+    task = dict_to_task(raw_task)
+
+    assert attrs.asdict(task) == attrs.asdict(Task(ticktick_id="60c8d7b1e9b80e0595353bc6",
+                                                   ticktick_etag="muu17zqq",
+                                                   created_date="",
+                                                   status=2,
+                                                   title="Minimal task",
+                                                   project_id="5f30772022d478db3ad1a9c2",
+                                                   timezone="UTC",
+                                                   column_id=None))
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from tickthon import TaskQuery, TaskType, TicktickClient
+
+INBOX_ID = "inbox114478622"
+WEEK_BACKLOG_ID = "61c62f198f08c92d0584f678"
+
+
+@pytest.fixture
+def stub_query_server(stub_ticktick_server, dict_task):
+    active_tasks = [{**dict_task, "id": "inbox-work", "projectId": INBOX_ID, "tags": ["work", "deep"]},
+                    {**dict_task, "id": "inbox-home", "projectId": INBOX_ID, "tags": ["home"]},
+                    {**dict_task, "id": "week-work", "projectId": WEEK_BACKLOG_ID, "tags": ["work"],
+                     "startDate": "2023-09-10T15:00:00.000+0000"}]
+    completed_tasks = [{**dict_task, "id": "done-work", "projectId": INBOX_ID, "tags": ["work"], "status": 2,
+                        "completedTime": "2024-01-10T10:00:00.000+0000"},
+                       {**dict_task, "id": "done-home", "projectId": INBOX_ID, "tags": ["home"], "status": 2,
+                        "completedTime": "2024-01-09T10:00:00.000+0000"}]
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0",
+                               {"checkPoint": 1, "syncTaskBean": {"update": active_tasks}})
+    stub_ticktick_server.route("GET", "/api/v2/project/all/closed", completed_tasks)
+    return stub_ticktick_server
+
+
+@pytest.fixture
+def client(stub_query_server, ticktick_info):
+    return TicktickClient("user", "password", ticktick_info["ticktick_ids"], defer_initial_sync=True)
+
+
+def get_ids(tasks):
+    return [task.ticktick_id for task in tasks]
+
+
+def test_query_combines_conditions(client):
+    assert get_ids(client.query().in_lists(INBOX_ID).with_tags("work")) == ["inbox-work"]
+    assert get_ids(client.query().with_tags("work", "deep").execute()) == ["inbox-work"]
+    assert get_ids(client.query().with_tags("work").due_between("2023-09-01", "2023-09-30").execute()) == \
+        ["week-work"]
+    assert get_ids(client.query().due_between("2023-08-01", "2023-08-31").execute()) == ["inbox-work", "inbox-home"]
+
+
+def test_query_pushes_the_closed_window_into_the_url(client, stub_query_server):
+    query = client.query().in_lists(INBOX_ID).with_tags("work").status(TaskType.COMPLETED)
+    tasks = query.closed_between(datetime(2024, 1, 1), datetime(2024, 2, 1, tzinfo=timezone.utc)).execute()
+
+    closed_requests = [request for request in stub_query_server.requests if "/closed" in request["path"]]
+    assert get_ids(tasks) == ["done-work"]
+    assert len(closed_requests) == 1
+    assert parse_qs(urlparse(closed_requests[0]["path"]).query)["from"] == ["2024-01-01 00:00:00"]
+    assert not any("/batch/check" in request["path"] for request in stub_query_server.requests)
+
+
+def test_query_that_can_not_match_does_not_request(client, stub_query_server):
+    assert client.query().in_lists("not-parsed-list").status(TaskType.ALL).execute() == []
+    assert client.query().due_between("2024-02-01", "2024-01-01").execute() == []
+    assert not any("/api/v2/batch" in request["path"] or "/closed" in request["path"]
+                   for request in stub_query_server.requests)
+
+
+def test_unbound_query_can_not_be_executed():
+    with pytest.raises(ValueError):
+        TaskQuery().in_lists(INBOX_ID).execute()
@@ -0,0 +1,149 @@
+import pytest
+
+from tickthon._task_store import TaskStore
+
+
+@pytest.fixture
+def raw_tasks(dict_task):
+    return [{**dict_task, "id": f"task-{i}", "projectId": "list-a" if i % 2 else "list-b"} for i in range(4)]
+
+
+@pytest.fixture
+def task_store(raw_tasks):
+    store = TaskStore()
+    store.replace_all(raw_tasks, ["list-a", "list-b"])
+    return store
+
+
+def test_replace_all_only_parses_valid_lists(raw_tasks):
+    store = TaskStore()
+
+    store.replace_all(raw_tasks, ["list-a"])
+
+    assert len(store.raw_tasks) == 4
+    assert [task.ticktick_id for task in store.tasks] == ["task-1", "task-3"]
+
+
+def test_apply_changes_merges_updates(task_store, raw_tasks):
+    updated_task = {**raw_tasks[0], "title": "Updated title"}
+    new_task = {**raw_tasks[0], "id": "task-new"}
+
+    has_changed = task_store.apply_changes({"update": [updated_task, new_task], "delete": []}, ["list-a", "list-b"])
+
+    assert has_changed
+    assert task_store.get_raw_task("task-0")["title"] == "Updated title"
+    assert [task.ticktick_id for task in task_store.tasks] == ["task-0", "task-1", "task-2", "task-3", "task-new"]
+
+
+def test_apply_changes_removes_closed_and_deleted_tasks(task_store, raw_tasks):
+    completed_task = {**raw_tasks[0], "status": 2}
+
+    task_store.apply_changes({"update": [completed_task], "delete": [{"taskId": "task-1", "projectId": "list-a"}]},
+                             ["list-a", "list-b"])
+
+    assert task_store.get_raw_task("task-0") is None
+    assert task_store.get_raw_task("task-1") is None
+    assert [task.ticktick_id for task in task_store.tasks] == ["task-2", "task-3"]
+
+
+def test_apply_changes_without_changes(task_store):
+    assert not task_store.apply_changes({"update": [], "delete": [], "empty": True}, ["list-a", "list-b"])
+    assert len(task_store.tasks) == 4
+
+
+def test_indexes_follow_updates(task_store, raw_tasks):
+    moved_task = {**raw_tasks[0], "projectId": "list-a", "tags": ["moved"], "parentId": "task-3",
+                  "startDate": "2023-09-01T19:15:00.000+0000"}
+
+    task_store.apply_changes({"update": [moved_task]}, ["list-a", "list-b"])
+
+    assert [task.ticktick_id for task in task_store.get_tasks_by_projects(["list-b"])] == ["task-2"]
+    assert [task.ticktick_id for task in task_store.get_tasks_by_projects(["list-a"])] == ["task-1", "task-3",
+                                                                                          "task-0"]
+    assert [task.ticktick_id for task in task_store.get_tasks_by_tag("moved")] == ["task-0"]
+    assert len(task_store.get_tasks_by_tag("test")) == 3
+    assert [task.ticktick_id for task in task_store.get_subtasks("task-3")] == ["task-0"]
+
+
+def test_get_tasks_due_between(task_store, raw_tasks):
+    task_store.apply_changes({"update": [{**raw_tasks[1], "startDate": "2023-09-01T19:15:00.000+0000"},
+                                         {**raw_tasks[2], "startDate": None}]}, ["list-a", "list-b"])
+
+    assert [task.ticktick_id for task in task_store.get_tasks_due_between("2023-08-01", "2023-08-31")] == ["task-0",
+                                                                                                          "task-3"]
+    assert [task.ticktick_id for task in task_store.get_tasks_due_between("2023-09-01", "2023-09-01")] == ["task-1"]
+    assert task_store.get_tasks_due_between("2024-01-01", "2024-12-31") == []
+
+
+def test_replace_all_returns_diff_and_reuses_unchanged_tasks(task_store, raw_tasks):
+    unchanged_task = task_store.get_task("task-1")
+    new_raw_tasks = [{**raw_tasks[0], "etag": "new-etag", "title": "Updated title"}, raw_tasks[1],
+                     {**raw_tasks[2], "projectId": "other-list"}, {**raw_tasks[0], "id": "task-new"}]
+
+    sync_diff = task_store.replace_all(new_raw_tasks, ["list-a", "list-b"])
+
+    assert [task.ticktick_id for task in sync_diff.added] == ["task-new"]
+    assert [task.title for task in sync_diff.updated] == ["Updated title"]
+    assert sorted(task.ticktick_id for task in sync_diff.removed) == ["task-2", "task-3"]
+    assert task_store.get_task("task-1") is unchanged_task
+    assert [task.ticktick_id for task in task_store.tasks] == ["task-0", "task-1", "task-new"]
+
+
+def test_replace_all_without_changes(task_store, raw_tasks):
+    revision = task_store.revision
+
+    assert not task_store.replace_all([dict(raw_task) for raw_task in raw_tasks], ["list-a", "list-b"])
+    assert task_store.revision == revision
+
+
+def test_apply_changes_returns_diff(task_store, raw_tasks):
+    sync_diff = task_store.apply_changes({"update": [raw_tasks[0], {**raw_tasks[1], "status": 2},
+                                                     {**raw_tasks[2], "title": "Same etag, new title"}],
+                                          "delete": ["task-3"]}, ["list-a", "list-b"])
+
+    assert sync_diff.added == []
+    assert [task.title for task in sync_diff.updated] == ["Same etag, new title"]
+    assert [task.ticktick_id for task in sync_diff.removed] == ["task-1", "task-3"]
+
+
+def test_pop_raw_changes(task_store, raw_tasks):
+    assert len(task_store.pop_raw_changes()[0]) == 4
+
+    task_store.apply_changes({"update": [raw_tasks[0], {**raw_tasks[1], "status": 2},
+                                         {**raw_tasks[2], "title": "New title"}], "delete": []}, ["list-a"])
+    changed_raw_tasks, removed_task_ids = task_store.pop_raw_changes()
+
+    assert [raw_task["title"] for raw_task in changed_raw_tasks] == ["New title"]
+    assert removed_task_ids == ["task-1"]
+    assert task_store.pop_raw_changes() == ([], [])
+
+    task_store.replace_all(raw_tasks[2:], ["list-a"])
+
+    assert sorted(task_store.pop_raw_changes()[1]) == ["task-0"]
+
+
+@pytest.fixture
+def hierarchy_store(dict_task):
+    parent_ids = {"root": "", "child-a": "root", "child-b": "root", "grandchild": "child-a", "loop-a": "loop-b",
+                  "loop-b": "loop-a"}
+    store = TaskStore()
+    store.replace_all([{**dict_task, "id": task_id, "parentId": parent_id, "projectId": "list-a"}
+                       for task_id, parent_id in parent_ids.items()], ["list-a"])
+    return store
+
+
+def test_subtree_and_ancestors(hierarchy_store):
+    assert [task.ticktick_id for task in hierarchy_store.iter_subtree("root")] == ["child-a", "grandchild", "child-b"]
+    assert [task.ticktick_id for task in hierarchy_store.get_ancestors("grandchild")] == ["child-a", "root"]
+    assert [task.ticktick_id for task in hierarchy_store.iter_subtree("loop-a")] == ["loop-b"]
+    assert [task.ticktick_id for task in hierarchy_store.get_ancestors("loop-a")] == ["loop-b"]
+
+
+def test_hierarchy_follows_moves_and_completions(hierarchy_store, dict_task):
+    moved_task = {**dict_task, "id": "grandchild", "parentId": "child-b", "projectId": "list-a"}
+    completed_task = {**dict_task, "id": "child-a", "parentId": "root", "projectId": "list-a", "status": 2}
+
+    hierarchy_store.apply_changes({"update": [moved_task, completed_task]}, ["list-a"])
+
+    assert [task.ticktick_id for task in hierarchy_store.iter_subtree("root")] == ["child-b", "grandchild"]
+    assert [task.ticktick_id for task in hierarchy_store.get_ancestors("grandchild")] == ["child-b", "root"]
@@ -0,0 +1,19 @@
+from tickthon import TaskTable, dict_to_task
+
+
+def test_task_table_round_trip(dict_task):
+    tasks = [dict_to_task({**dict_task, "id": f"task-{i}", "status": i % 2}) for i in range(3)]
+
+    task_table = TaskTable(tasks)
+
+    assert len(task_table) == 3
+    assert task_table[1] == tasks[1]
+    assert task_table.to_tasks() == tasks
+
+
+def test_task_table_shares_repeated_values(dict_task):
+    task_table = TaskTable([dict_to_task({**dict_task, "id": f"task-{i}", "tags": ["test", "unit"]})
+                            for i in range(2)])
+
+    assert task_table.tags[0] is task_table.tags[1]
+    assert task_table.project_ids[0] is task_table.project_ids[1]
@@ -0,0 +1,138 @@
+import time
+
+import pytest
+from requests import HTTPError
+
+from tickthon import Task, TicktickClient
+
+
+@pytest.fixture
+def ticktick_client(stub_ticktick_server, ticktick_info):
+    def batch_task_response(request):
+        payload = request["json"]
+        task_ids = [item["id"] for item in payload["add"] + payload["update"]]
+        return {"id2etag": {task_id: f"etag-{task_id}" for task_id in task_ids if task_id != "failing-task"},
+                "id2error": {"failing-task": "NOT_EXISTED"}}
+
+    stub_ticktick_server.route("POST", "/api/v2/batch/task", batch_task_response)
+    stub_ticktick_server.route("POST", "/api/v2/batch/taskProject", {})
+    return TicktickClient("user", "password", ticktick_info["ticktick_ids"])
+
+
+def make_task(task_id):
+    return Task(title=f"Task {task_id}", ticktick_id=task_id, ticktick_etag="etag", created_date="2023-08-03",
+                project_id="inbox114478622")
+
+
+def batch_requests(stub_ticktick_server):
+    return [request for request in stub_ticktick_server.requests if request["path"].startswith("/api/v2/batch/task")]
+
+
+def test_batch_sends_mutations_in_one_request(ticktick_client, stub_ticktick_server):
+    with ticktick_client.batch() as batch:
+        completed_results = [batch.complete_task(make_task(f"task-{i}")) for i in range(50)]
+        created_result = batch.create_task(make_task("new-task"))
+        failing_result = batch.complete_task(make_task("failing-task"))
+        moved_result = batch.move_task_to_project(make_task("task-0"), "other-list")
+
+    requests = batch_requests(stub_ticktick_server)
+    assert len(requests) == 2
+    assert len(requests[0]["json"]["update"]) == 51
+    assert len(requests[0]["json"]["add"]) == 1
+    assert requests[1]["json"] == [{"fromProjectId": "inbox114478622", "toProjectId": "other-list",
+                                    "taskId": "task-0"}]
+
+    assert all(result.ok for result in completed_results)
+    assert completed_results[3].etag == "etag-task-3"
+    assert created_result.ok and created_result.etag == f"etag-{created_result.ticktick_id}"
+    assert not failing_result.ok and failing_result.error == "NOT_EXISTED"
+    assert moved_result.ok
+    assert len(batch.results) == 53
+
+
+def test_batch_merges_updates_of_the_same_task(ticktick_client, stub_ticktick_server):
+    with ticktick_client.batch() as batch:
+        batch.replace_task_tags(make_task("task-1"), ("tag",))
+        batch.complete_task(make_task("task-1"))
+
+    update = batch_requests(stub_ticktick_server)[0]["json"]["update"]
+    assert len(update) == 1
+    assert update[0]["status"] == 2
+    assert update[0]["tags"] == ["tag"]
+
+
+def test_batch_flushes_by_size(ticktick_client, stub_ticktick_server):
+    batch = ticktick_client.batch(max_size=10)
+
+    for i in range(25):
+        batch.complete_task(make_task(f"task-{i}"))
+
+    assert len(batch_requests(stub_ticktick_server)) == 2
+    assert len(batch) == 5
+
+
+def test_batch_flushes_by_time(ticktick_client, stub_ticktick_server):
+    batch = ticktick_client.batch(max_delay=0.1)
+
+    result = batch.complete_task(make_task("task-1"))
+    time.sleep(0.5)
+
+    assert result.ok
+    assert len(batch_requests(stub_ticktick_server)) == 1
+
+
+def test_batch_records_errors_of_failed_requests(ticktick_client, stub_ticktick_server):
+    stub_ticktick_server.route("POST", "/api/v2/batch/taskProject", (500, {}))
+    batch = ticktick_client.batch()
+    completed_result = batch.complete_task(make_task("task-1"))
+    moved_result = batch.move_task_to_project(make_task("task-2"), "other-list")
+
+    with pytest.raises(HTTPError):
+        batch.flush()
+
+    assert completed_result.ok
+    assert not moved_result.sent and isinstance(moved_result.error, HTTPError)
+    assert batch.results == [completed_result, moved_result]
+    assert len(batch) == 0
+
+
+def test_batch_records_errors_of_timed_flushes(ticktick_client, stub_ticktick_server):
+    stub_ticktick_server.route("POST", "/api/v2/batch/task", (500, {}))
+    batch = ticktick_client.batch(max_delay=0.1)
+
+    result = batch.complete_task(make_task("task-1"))
+    time.sleep(0.5)
+
+    assert not result.ok and isinstance(result.error, HTTPError)
+    assert batch.results == [result]
+
+
+def test_batch_replaces_tags_of_synced_tasks_with_the_whole_raw_task(ticktick_client, stub_ticktick_server,
+                                                                     dict_task):
+    raw_task = {**dict_task, "id": "task-1", "projectId": "inbox114478622"}
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0", {"checkPoint": 1, "syncTaskBean": {"update": [raw_task]}})
+    ticktick_client.sync()
+
+    with ticktick_client.batch() as batch:
+        batch.complete_task(make_task("task-1"))
+        batch.replace_task_tags(make_task("task-1"), ("tag",))
+        batch.replace_task_tags(make_task("unsynced-task"), ("tag",))
+
+    synced_update, unsynced_update = batch_requests(stub_ticktick_server)[0]["json"]["update"]
+    assert synced_update == {**raw_task, "tags": ["tag"], "status": 2, "completedTime": synced_update["completedTime"],
+                             "completedUserId": 114478622}
+    assert unsynced_update == {"id": "unsynced-task", "projectId": "inbox114478622", "tags": ["tag"],
+                               "completedUserId": 114478622}
+
+
+def test_batch_drops_updates_of_deleted_tasks(ticktick_client, stub_ticktick_server):
+    with ticktick_client.batch() as batch:
+        completed_result = batch.complete_task(make_task("task-1"))
+        deleted_result = batch.delete_task(make_task("task-1"))
+        tags_result = batch.replace_task_tags(make_task("task-1"), ("tag",))
+
+    payload = batch_requests(stub_ticktick_server)[0]["json"]
+    assert payload["update"] == []
+    assert payload["delete"] == [{"taskId": "task-1", "projectId": "inbox114478622"}]
+    assert completed_result.sent and deleted_result.sent and tags_result.sent
+    assert len(batch.results) == 3
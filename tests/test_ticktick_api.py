@@ -46,3 +46,46 @@ def test_post_request(ticktick_api):
 
     assert response.status_code == 200
     assert isinstance(response.json(), dict)
+
+
+def test_api_token_is_trusted_without_validation(stub_ticktick_server):
+    ticktick_api = TicktickAPI("user", "password", api_token="stored-token", cookies={"t": "stored-cookie"})
+
+    assert ticktick_api.auth_token == "stored-token"
+    assert stub_ticktick_server.requests == []
+
+
+def test_login_without_api_token(stub_ticktick_server):
+    ticktick_api = TicktickAPI("user", "password")
+
+    assert ticktick_api.auth_token == "stub-token"
+    assert [request["path"] for request in stub_ticktick_server.requests] == ["/api/v2/user/signon?wc=true&remember=true"]
+
+
+def test_expired_token_is_refreshed_and_request_replayed(stub_ticktick_server):
+    def habits(request):
+        if request["headers"]["Authorization"] == "Bearer expired-token":
+            return 401, {}
+        return [{"id": "habit"}]
+
+    stub_ticktick_server.route("GET", "/api/v2/habits", habits)
+    refreshed_credentials = []
+    ticktick_api = TicktickAPI("user", "password", api_token="expired-token",
+                               on_token_refresh=lambda token, cookies: refreshed_credentials.append(token))
+
+    response = ticktick_api.get(ticktick_api.BASE_URL + "/habits")
+
+    assert response.json() == [{"id": "habit"}]
+    assert refreshed_credentials == ["stub-token"]
+    assert [request["path"] for request in stub_ticktick_server.requests] == [
+        "/api/v2/habits", "/api/v2/user/signon?wc=true&remember=true", "/api/v2/habits"]
+
+
+def test_request_is_replayed_only_once(stub_ticktick_server):
+    stub_ticktick_server.route("GET", "/api/v2/habits", (401, {}))
+    ticktick_api = TicktickAPI("user", "password", api_token="expired-token")
+
+    with pytest.raises(HTTPError):
+        ticktick_api.get(ticktick_api.BASE_URL + "/habits")
+
+    assert len(stub_ticktick_server.requests) == 3
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from tickthon import Task, TicktickClient, WeightSeries
+
+WEIGHT_MEASUREMENTS_ID = "640c03cd8f08d5a6c4bb32e7"
+
+
+def make_measurement(task_id, day, title):
+    return Task(title=title, ticktick_id=task_id, ticktick_etag="etag", created_date=f"2024-01-{day:02d}T08:00:00+00:00",
+                project_id=WEIGHT_MEASUREMENTS_ID)
+
+
+@pytest.fixture
+def weight_series():
+    series = WeightSeries()
+    series.update([make_measurement("third", 3, "80.0 kg"), make_measurement("first", 1, "82"),
+                   make_measurement("second", 2, "81,0")])
+    return series
+
+
+def test_weight_series_is_sorted_and_unique(weight_series):
+    changed_count = weight_series.update([make_measurement("second", 5, "79.5"), make_measurement("bad", 4, "skipped")],
+                                         removed_ids=["first"])
+
+    assert changed_count == 3
+    assert [(measurement.ticktick_id, measurement.value) for measurement in weight_series.measurements] == \
+        [("third", 80.0), ("second", 79.5)]
+    assert weight_series.latest.date == datetime(2024, 1, 5, 8, tzinfo=timezone.utc)
+    assert "first" not in weight_series
+
+
+def test_weight_series_range_and_stats(weight_series):
+    assert [measurement.value for measurement in weight_series.between(datetime(2024, 1, 2), datetime(2024, 1, 3, 8))] \
+        == [81.0, 80.0]
+    assert weight_series.between(datetime(2024, 2, 1), datetime(2024, 1, 1)) == []
+    assert weight_series.moving_average(window=2) == [82.0, 81.5, 80.5]
+    assert weight_series.trend() == pytest.approx(-1.0)
+    assert weight_series.trend(end_date=datetime(2024, 1, 1, 12)) == 0.0
+
+
+def test_client_updates_the_weight_series(stub_ticktick_server, ticktick_info, dict_task):
+    measurement = {**dict_task, "id": "weight", "title": "75.5", "projectId": WEIGHT_MEASUREMENTS_ID,
+                   "createdTime": "2024-01-01T08:00:00.000+0000"}
+    sync_states = iter([[measurement], [{**measurement, "title": "75.0", "etag": "new"}], []])
+    stub_ticktick_server.route("GET", "/api/v2/batch/check/0",
+                               lambda request: {"checkPoint": 1, "syncTaskBean": {"update": next(sync_states)}})
+    client = TicktickClient("user", "password", ticktick_info["ticktick_ids"], defer_initial_sync=True)
+
+    first_series = client.get_weight_series()
+    assert [measurement.value for measurement in first_series.measurements] == [75.5]
+    assert [measurement.value for measurement in client.get_weight_series().measurements] == [75.0]
+    assert len(client.get_weight_series()) == 0
+    assert [measurement.value for measurement in first_series.measurements] == [75.5]